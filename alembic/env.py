@@ -10,13 +10,16 @@ from app.db.base import Base
 from app.core.config import settings
 # Import all models here to ensure they are registered with Base
 from app.models.user import User
-from app.models.finance import Account, JournalEntry, JournalEntryLine, APInvoice, ARInvoice, BankStatement
+from app.models.finance import Account, AccountPeriodBalance, JournalEntry, JournalEntryLine, APInvoice, ARInvoice, BankStatement
 from app.models.supply_chain import Supplier, InventoryProduct, PurchaseOrder, PurchaseOrderItem
 from app.models.hr import Department, Employee, Payroll
 from app.models.crm import Customer, Lead, Interaction
 from app.models.manufacturing import BillOfMaterials, BOMComponent, WorkOrder
 from app.models.pos import POSSession, POSOrder, POSOrderItem, Payment
 from app.models.woocommerce_settings import WooCommerceSettings
+from app.models.woocommerce_sync_state import WooCommerceSyncState
+from app.models.job import Job
+from app.models.social_message import SocialConversation, SocialMessage
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
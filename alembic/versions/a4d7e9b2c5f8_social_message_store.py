@@ -0,0 +1,66 @@
+"""Social message store for webhook conversations
+
+Revision ID: a4d7e9b2c5f8
+Revises: f2b8d3c6a1e9
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7e9b2c5f8'
+down_revision: Union[str, Sequence[str], None] = 'f2b8d3c6a1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('social_conversations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('platform', sa.String(length=20), nullable=False),
+    sa.Column('external_id', sa.String(length=100), nullable=False),
+    sa.Column('participant_name', sa.String(length=255), nullable=True),
+    sa.Column('last_message_text', sa.Text(), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('platform', 'external_id', name='uq_social_conversations_platform_external_id')
+    )
+    op.create_index(op.f('ix_social_conversations_id'), 'social_conversations', ['id'], unique=False)
+    op.create_index('ix_social_conversations_platform_last_message_at', 'social_conversations', ['platform', 'last_message_at'], unique=False)
+    op.create_index('ix_social_conversations_last_message_at', 'social_conversations', ['last_message_at'], unique=False)
+    op.create_table('social_messages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('conversation_id', sa.Integer(), nullable=False),
+    sa.Column('platform', sa.String(length=20), nullable=False),
+    sa.Column('external_id', sa.String(length=255), nullable=False),
+    sa.Column('direction', sa.String(length=10), nullable=False),
+    sa.Column('sender_id', sa.String(length=100), nullable=True),
+    sa.Column('message_type', sa.String(length=30), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=False),
+    sa.Column('raw', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['social_conversations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('platform', 'external_id', name='uq_social_messages_platform_external_id')
+    )
+    op.create_index(op.f('ix_social_messages_id'), 'social_messages', ['id'], unique=False)
+    op.create_index('ix_social_messages_conversation_sent_at', 'social_messages', ['conversation_id', 'sent_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_social_messages_conversation_sent_at', table_name='social_messages')
+    op.drop_index(op.f('ix_social_messages_id'), table_name='social_messages')
+    op.drop_table('social_messages')
+    op.drop_index('ix_social_conversations_last_message_at', table_name='social_conversations')
+    op.drop_index('ix_social_conversations_platform_last_message_at', table_name='social_conversations')
+    op.drop_index(op.f('ix_social_conversations_id'), table_name='social_conversations')
+    op.drop_table('social_conversations')
@@ -0,0 +1,50 @@
+"""POS order idempotency keys and catalog sync cursors
+
+Merges the user-table and finance branches into a single head.
+
+Revision ID: b7e4c2a91d3f
+Revises: a1b2c3d4e5f6, f552dd911e72
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4c2a91d3f'
+down_revision: Union[str, Sequence[str], None] = ('a1b2c3d4e5f6', 'f552dd911e72')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posorder', sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_posorder_idempotency_key'), 'posorder', ['idempotency_key'], unique=True)
+
+    # Products: stamp updated_at on insert too so it can act as a sync cursor
+    op.execute("UPDATE products SET updated_at = created_at WHERE updated_at IS NULL")
+    op.alter_column('products', 'updated_at',
+               existing_type=sa.DateTime(timezone=True),
+               server_default=sa.text('now()'),
+               existing_nullable=True)
+    op.create_index(op.f('ix_products_updated_at'), 'products', ['updated_at'], unique=False)
+
+    op.add_column('coupons', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.create_index(op.f('ix_coupons_updated_at'), 'coupons', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_coupons_updated_at'), table_name='coupons')
+    op.drop_column('coupons', 'updated_at')
+    op.drop_index(op.f('ix_products_updated_at'), table_name='products')
+    op.alter_column('products', 'updated_at',
+               existing_type=sa.DateTime(timezone=True),
+               server_default=None,
+               existing_nullable=True)
+    op.drop_index(op.f('ix_posorder_idempotency_key'), table_name='posorder')
+    op.drop_column('posorder', 'idempotency_key')
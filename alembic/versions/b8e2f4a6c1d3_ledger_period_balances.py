@@ -0,0 +1,50 @@
+"""Account period balance snapshots and journal indexes
+
+Revision ID: b8e2f4a6c1d3
+Revises: a4d7e9b2c5f8
+Create Date: 2026-10-18 15:00:00.000000
+
+Existing posted entries are not folded into the snapshots here; queue
+POST /finance/ledger/rebuild once after upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f4a6c1d3'
+down_revision: Union[str, Sequence[str], None] = 'a4d7e9b2c5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('account_period_balances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('debit', sa.Float(), nullable=False),
+    sa.Column('credit', sa.Float(), nullable=False),
+    sa.Column('closing_balance', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account_id', 'period', name='uq_account_period_balances_account_period')
+    )
+    op.create_index(op.f('ix_account_period_balances_id'), 'account_period_balances', ['id'], unique=False)
+    op.create_index('ix_account_period_balances_period', 'account_period_balances', ['period'], unique=False)
+    op.create_index('ix_journal_entries_status_date', 'journal_entries', ['status', 'date'], unique=False)
+    op.create_index('ix_journal_entry_lines_journal_entry_id', 'journal_entry_lines', ['journal_entry_id'], unique=False)
+    op.create_index('ix_journal_entry_lines_account_id', 'journal_entry_lines', ['account_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_journal_entry_lines_account_id', table_name='journal_entry_lines')
+    op.drop_index('ix_journal_entry_lines_journal_entry_id', table_name='journal_entry_lines')
+    op.drop_index('ix_journal_entries_status_date', table_name='journal_entries')
+    op.drop_index('ix_account_period_balances_period', table_name='account_period_balances')
+    op.drop_index(op.f('ix_account_period_balances_id'), table_name='account_period_balances')
+    op.drop_table('account_period_balances')
@@ -0,0 +1,33 @@
+"""FULLTEXT search indexes for products and WooCommerce products
+
+Revision ID: c3f8a1d5e7b2
+Revises: b7e4c2a91d3f
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d5e7b2'
+down_revision: Union[str, Sequence[str], None] = 'b7e4c2a91d3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.create_index('ft_products_name', 'products', ['name'], mysql_prefix='FULLTEXT')
+    op.create_index('ft_woocommerce_products_name', 'woocommerce_products', ['name'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    op.drop_index('ft_woocommerce_products_name', table_name='woocommerce_products')
+    op.drop_index('ft_products_name', table_name='products')
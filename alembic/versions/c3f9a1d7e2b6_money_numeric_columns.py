@@ -0,0 +1,58 @@
+"""Store money columns as fixed-point Numeric(18, 2)
+
+Revision ID: c3f9a1d7e2b6
+Revises: b8e2f4a6c1d3
+Create Date: 2026-10-18 16:00:00.000000
+
+Existing float values are cast and rounded to cents by the database.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a1d7e2b6'
+down_revision: Union[str, Sequence[str], None] = 'b8e2f4a6c1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, nullable)
+MONEY_COLUMNS = [
+    ('account', 'balance', True),
+    ('journal_entry_lines', 'debit', True),
+    ('journal_entry_lines', 'credit', True),
+    ('account_period_balances', 'debit', False),
+    ('account_period_balances', 'credit', False),
+    ('account_period_balances', 'closing_balance', False),
+    ('ap_invoices', 'total_amount', False),
+    ('ar_invoices', 'total_amount', False),
+    ('bank_statements', 'amount', False),
+    ('possession', 'opening_cash', True),
+    ('possession', 'closing_cash', True),
+    ('posorder', 'total_amount', True),
+    ('posorderitem', 'unit_price', False),
+    ('posorderitem', 'subtotal', False),
+    ('payment', 'amount', False),
+    ('purchaseorder', 'total_amount', True),
+    ('purchaseorderitem', 'unit_price', False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, nullable in MONEY_COLUMNS:
+        op.alter_column(table, column,
+                   existing_type=sa.Float(),
+                   type_=sa.Numeric(precision=18, scale=2),
+                   existing_nullable=nullable)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, nullable in reversed(MONEY_COLUMNS):
+        op.alter_column(table, column,
+                   existing_type=sa.Numeric(precision=18, scale=2),
+                   type_=sa.Float(),
+                   existing_nullable=nullable)
@@ -0,0 +1,34 @@
+"""Link reconciled bank statement lines to their journal line
+
+Revision ID: d5a2c8e4f1b7
+Revises: c3f9a1d7e2b6
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a2c8e4f1b7'
+down_revision: Union[str, Sequence[str], None] = 'c3f9a1d7e2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bank_statements', sa.Column('matched_journal_line_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_bank_statements_matched_journal_line_id', 'bank_statements', 'journal_entry_lines', ['matched_journal_line_id'], ['id'])
+    op.create_unique_constraint('uq_bank_statements_matched_journal_line_id', 'bank_statements', ['matched_journal_line_id'])
+    op.create_index('ix_bank_statements_account_reconciled_date', 'bank_statements', ['bank_account_id', 'reconciled', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bank_statements_account_reconciled_date', table_name='bank_statements')
+    op.drop_constraint('uq_bank_statements_matched_journal_line_id', 'bank_statements', type_='unique')
+    op.drop_constraint('fk_bank_statements_matched_journal_line_id', 'bank_statements', type_='foreignkey')
+    op.drop_column('bank_statements', 'matched_journal_line_id')
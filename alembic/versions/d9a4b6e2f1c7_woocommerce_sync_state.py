@@ -0,0 +1,40 @@
+"""WooCommerce sync watermarks
+
+Revision ID: d9a4b6e2f1c7
+Revises: c3f8a1d5e7b2
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4b6e2f1c7'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a1d5e7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('woocommerce_sync_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('settings_id', sa.Integer(), nullable=False),
+    sa.Column('target', sa.String(length=50), nullable=False),
+    sa.Column('modified_after', sa.DateTime(), nullable=True),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_reconciled_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['settings_id'], ['woocommerce_settings.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('settings_id', 'target', name='uq_woocommerce_sync_state_target')
+    )
+    op.create_index(op.f('ix_woocommerce_sync_state_id'), 'woocommerce_sync_state', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_woocommerce_sync_state_id'), table_name='woocommerce_sync_state')
+    op.drop_table('woocommerce_sync_state')
@@ -0,0 +1,32 @@
+"""One active job per type and params
+
+Revision ID: e7b3d9f2a6c4
+Revises: d5a2c8e4f1b7
+Create Date: 2026-10-19 10:00:00.000000
+
+Jobs queued or running at upgrade time get no key and are not deduplicated
+against; let them finish before relying on it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3d9f2a6c4'
+down_revision: Union[str, Sequence[str], None] = 'd5a2c8e4f1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('active_key', sa.String(length=64), nullable=True))
+    op.create_unique_constraint('uq_jobs_active_key', 'jobs', ['active_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_jobs_active_key', 'jobs', type_='unique')
+    op.drop_column('jobs', 'active_key')
@@ -0,0 +1,33 @@
+"""WooCommerce product content hash and compressed raw data
+
+Revision ID: f2b8d3c6a1e9
+Revises: e5c1f7a3b9d4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d3c6a1e9'
+down_revision: Union[str, Sequence[str], None] = 'e5c1f7a3b9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('woocommerce_products', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('woocommerce_products', sa.Column(
+        'raw_data_compressed', sa.LargeBinary().with_variant(mysql.MEDIUMBLOB(), 'mysql'), nullable=True
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('woocommerce_products', 'raw_data_compressed')
+    op.drop_column('woocommerce_products', 'content_hash')
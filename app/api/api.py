@@ -3,7 +3,7 @@ from fastapi.staticfiles import StaticFiles
 import shutil
 import uuid
 import os
-from app.api.v1 import login, hr, supply_chain, crm, finance, manufacturing, pos, products, coupons, loyalty, users, sync
+from app.api.v1 import login, hr, supply_chain, crm, finance, manufacturing, pos, products, coupons, loyalty, users, sync, metrics, jobs
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
@@ -18,6 +18,8 @@ api_router.include_router(crm.router, prefix="/crm", tags=["crm"])
 api_router.include_router(finance.router, prefix="/finance", tags=["finance"])
 api_router.include_router(manufacturing.router, prefix="/manufacturing", tags=["manufacturing"])
 api_router.include_router(pos.router, prefix="/pos", tags=["pos"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+api_router.include_router(jobs.router, tags=["jobs"])
 
 # Image Upload Endpoint
 @api_router.post("/upload/image")
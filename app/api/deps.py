@@ -1,6 +1,6 @@
-from typing import Generator
+from typing import Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
@@ -9,9 +9,10 @@ from sqlalchemy.orm import Session
 from app.core import security
 from app.core.config import settings
 from app.crud import crud_user
+from app.crud.pagination import PageParams, decode_cursor
 from app.models.user import User
 from app.schemas.token import TokenPayload
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -30,7 +31,7 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud_user.get_by_username(db, username=str(token_data.sub))
+    user = crud_user.get_principal(db, username=str(token_data.sub))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -51,3 +52,19 @@ def get_current_active_superuser(
             detail="The user doesn't have enough privileges"
         )
     return current_user
+
+def decode_page_cursor(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def get_page_params(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+) -> PageParams:
+    """Offset paging by default; a cursor switches to a keyset seek and ignores skip."""
+    return PageParams(skip=skip, limit=limit, after_id=decode_page_cursor(cursor))
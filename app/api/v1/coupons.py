@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.crud import listing_totals, pagination
 from app.models.coupon import Coupon
 from pydantic import BaseModel
 from datetime import date
@@ -29,69 +31,81 @@ class CouponUpdate(BaseModel):
 
 
 @router.get("/coupons")
-def get_coupons(
+async def get_coupons(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(deps.get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    estimate_total: bool = False,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Get list of coupons"""
-    total = db.query(Coupon).count()
-    coupons = db.query(Coupon).offset(skip).limit(limit).all()
+    after_id = deps.decode_page_cursor(cursor)
+    total, estimated = None, False
+    if include_total:
+        total, estimated = await listing_totals.get_total(
+            db, select(Coupon), table=Coupon.__tablename__, filters={}, estimate=estimate_total
+        )
+    page = pagination.paginate(select(Coupon), Coupon.id, skip=skip, limit=limit, after_id=after_id)
+    coupons = (await db.scalars(page)).all()
     
     return {
         "total": total,
-        "coupons": coupons
+        "total_estimated": estimated,
+        "coupons": coupons,
+        "next_cursor": pagination.next_cursor(coupons, limit)
     }
 
 
 @router.get("/coupons/{coupon_id}")
-def get_coupon(
+async def get_coupon(
     coupon_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Get single coupon by ID"""
-    coupon = db.query(Coupon).filter(Coupon.id == coupon_id).first()
+    coupon = await db.get(Coupon, coupon_id)
     if not coupon:
         raise HTTPException(status_code=404, detail="Coupon not found")
     return coupon
 
 
 @router.post("/coupons")
-def create_coupon(
+async def create_coupon(
     coupon: CouponCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Create a new coupon"""
     # Check if code already exists
-    existing = db.query(Coupon).filter(Coupon.code == coupon.code).first()
+    existing = await db.scalar(select(Coupon).where(Coupon.code == coupon.code))
     if existing:
         raise HTTPException(status_code=400, detail="Coupon code already exists")
     
     db_coupon = Coupon(**coupon.dict())
     db.add(db_coupon)
-    db.commit()
-    db.refresh(db_coupon)
+    await db.commit()
+    listing_totals.invalidate(Coupon.__tablename__)
+    await db.refresh(db_coupon)
     return db_coupon
 
 
 @router.put("/coupons/{coupon_id}")
-def update_coupon(
+async def update_coupon(
     coupon_id: int,
     coupon: CouponUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Update a coupon"""
-    db_coupon = db.query(Coupon).filter(Coupon.id == coupon_id).first()
+    db_coupon = await db.get(Coupon, coupon_id)
     if not db_coupon:
         raise HTTPException(status_code=404, detail="Coupon not found")
     
     # Check code uniqueness if updating
     if coupon.code and coupon.code != db_coupon.code:
-        existing = db.query(Coupon).filter(Coupon.code == coupon.code).first()
+        existing = await db.scalar(select(Coupon).where(Coupon.code == coupon.code))
         if existing:
             raise HTTPException(status_code=400, detail="Coupon code already exists")
     
@@ -99,36 +113,37 @@ def update_coupon(
     for field, value in update_data.items():
         setattr(db_coupon, field, value)
     
-    db.commit()
-    db.refresh(db_coupon)
+    await db.commit()
+    await db.refresh(db_coupon)
     return db_coupon
 
 
 @router.delete("/coupons/{coupon_id}")
-def delete_coupon(
+async def delete_coupon(
     coupon_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Delete a coupon"""
-    db_coupon = db.query(Coupon).filter(Coupon.id == coupon_id).first()
+    db_coupon = await db.get(Coupon, coupon_id)
     if not db_coupon:
         raise HTTPException(status_code=404, detail="Coupon not found")
     
-    db.delete(db_coupon)
-    db.commit()
+    await db.delete(db_coupon)
+    await db.commit()
+    listing_totals.invalidate(Coupon.__tablename__)
     return {"message": "Coupon deleted successfully"}
 
 
 @router.post("/coupons/validate")
-def validate_coupon(
+async def validate_coupon(
     code: str,
     purchase_amount: float,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Validate a coupon code"""
-    coupon = db.query(Coupon).filter(Coupon.code == code, Coupon.is_active == True).first()
+    coupon = await db.scalar(select(Coupon).where(Coupon.code == code, Coupon.is_active == True))
     
     if not coupon:
         raise HTTPException(status_code=404, detail="Invalid coupon code")
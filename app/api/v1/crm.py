@@ -1,7 +1,9 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.crud import pagination
+from app.crud.pagination import PageParams
 from app.schemas.crm import Customer, CustomerCreate, Lead, LeadCreate, Interaction, InteractionCreate
 from app.crud import crud_crm
 
@@ -18,12 +20,14 @@ def create_customer(
 
 @router.get("/customers", response_model=List[Customer])
 def read_customers(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_crm.get_customers(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_crm.get_customers(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 # Leads
 @router.post("/leads", response_model=Lead)
@@ -36,12 +40,14 @@ def create_lead(
 
 @router.get("/leads", response_model=List[Lead])
 def read_leads(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_crm.get_leads(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_crm.get_leads(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 # Interactions
 @router.post("/interactions", response_model=Interaction)
@@ -54,9 +60,11 @@ def create_interaction(
 
 @router.get("/interactions", response_model=List[Interaction])
 def read_interactions(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_crm.get_interactions(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_crm.get_interactions(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
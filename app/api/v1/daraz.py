@@ -1,14 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional, List
 from datetime import datetime, timedelta
+from app.integrations import client_registry
 from app.integrations.daraz_client import DarazAPIClient
 from app.api import deps
 
 router = APIRouter()
 
 def get_daraz_client():
-    """Dependency to get Daraz API client"""
-    return DarazAPIClient()
+    """Dependency to get the shared Daraz API client"""
+    return client_registry.daraz_client()
 
 # Product Endpoints
 @router.get("/products")
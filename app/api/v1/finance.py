@@ -1,8 +1,14 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.api import deps
-from app.schemas.finance import Account, AccountCreate, JournalEntry, JournalEntryCreate, APInvoice, APInvoiceCreate, ARInvoice, ARInvoiceCreate, BankStatement, BankStatementCreate
+from app.crud import crud_job, finance_reports, ledger, pagination, reconciliation
+from app.crud.pagination import PageParams
+from app.jobs.finance import REBUILD_LEDGER
+from app.schemas.job import Job
+from app.schemas.finance import Account, AccountCreate, JournalEntry, JournalEntryCreate, JournalEntryBatchCreate, JournalEntryBatchResponse, APInvoice, APInvoiceCreate, ARInvoice, ARInvoiceCreate, BankStatement, BankStatementCreate
 from app.crud import crud_finance
 
 router = APIRouter()
@@ -17,12 +23,87 @@ def create_account(
 
 @router.get("/accounts", response_model=List[Account])
 def read_accounts(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_finance.get_accounts(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_finance.get_accounts(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
+
+@router.get("/accounts/{account_id}/balance")
+def read_account_balance(
+    account_id: int,
+    as_of: Optional[datetime] = None,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Balance of an account (debit - credit of posted lines), now or as of a date"""
+    account = crud_finance.get_account(db, account_id=account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return {"account_id": account.id, "as_of": as_of, "balance": ledger.account_balance(db, account.id, as_of=as_of)}
+
+@router.get("/ledger/check")
+def check_ledger(
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Posted journal entries whose debits and credits do not balance to the cent"""
+    unbalanced = ledger.unbalanced_entries(db)
+    return {"balanced": not unbalanced, "unbalanced_entries": unbalanced}
+
+def _check_range(start: date, end: date) -> None:
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+@router.get("/reports/trial-balance")
+def read_trial_balance_report(
+    start: date,
+    end: date,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Opening balance, debits, credits and closing balance per account for a date range"""
+    _check_range(start, end)
+    return finance_reports.trial_balance(db, start=start, end=end)
+
+@router.get("/reports/income-statement")
+def read_income_statement(
+    start: date,
+    end: date,
+    bucket: Optional[str] = Query(None, pattern="^(month|quarter|year)$"),
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Revenue, expenses and net income for a date range, optionally per month/quarter/year"""
+    _check_range(start, end)
+    return finance_reports.income_statement(db, start=start, end=end, bucket=bucket)
+
+@router.get("/reports/balance-sheet")
+def read_balance_sheet(
+    as_of: date,
+    start: Optional[date] = None,
+    bucket: Optional[str] = Query(None, pattern="^(month|quarter|year)$"),
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Balance sheet as of a date; with ``start`` and ``bucket``, one per period end in between"""
+    if start:
+        _check_range(start, as_of)
+    return finance_reports.balance_sheet(db, as_of=as_of, start=start, bucket=bucket)
+
+@router.post("/ledger/rebuild", response_model=Job, status_code=202)
+def rebuild_ledger(
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_superuser)
+):
+    """Queue a recomputation of all balances and period snapshots from posted lines.
+
+    Needed once to backfill snapshots for entries posted before they existed.
+    """
+    return crud_job.enqueue_once(db, REBUILD_LEDGER, created_by=current_user.id)
 
 @router.post("/journal-entries", response_model=JournalEntry)
 def create_journal_entry(
@@ -30,16 +111,57 @@ def create_journal_entry(
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_finance.create_journal_entry(db=db, journal_entry=journal_entry)
+    try:
+        return crud_finance.create_journal_entry(db=db, journal_entry=journal_entry)
+    except ledger.LedgerError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/journal-entries/batch", response_model=JournalEntryBatchResponse)
+def create_journal_entries_batch(
+    batch: JournalEntryBatchCreate,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Import many journal entries in one transaction.
+
+    Every entry must balance to the cent and reference existing accounts.
+    Invalid entries reject the whole batch with a 400 listing them, unless
+    ``partial`` is set, in which case the rest are stored.
+    """
+    try:
+        results = crud_finance.create_journal_entries(db, batch.entries, partial=batch.partial)
+    except crud_finance.JournalBatchError as e:
+        raise HTTPException(status_code=400, detail=[{"index": index, "error": error} for index, error in sorted(e.errors.items())])
+    except ledger.LedgerError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    created = sum(result["status"] == "created" for result in results)
+    return {"created": created, "rejected": len(results) - created, "results": results}
+
+@router.post("/journal-entries/{entry_id}/post", response_model=JournalEntry)
+def post_journal_entry(
+    entry_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Post a DRAFT journal entry, applying it to account balances"""
+    entry = crud_finance.get_journal_entry(db, entry_id=entry_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Journal entry not found")
+    try:
+        return crud_finance.post_journal_entry(db, entry)
+    except ledger.LedgerError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/journal-entries", response_model=List[JournalEntry])
 def read_journal_entries(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_finance.get_journal_entries(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_finance.get_journal_entries(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 @router.post("/ap-invoices", response_model=APInvoice)
 def create_ap_invoice(
@@ -51,12 +173,14 @@ def create_ap_invoice(
 
 @router.get("/ap-invoices", response_model=List[APInvoice])
 def read_ap_invoices(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_finance.get_ap_invoices(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_finance.get_ap_invoices(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 @router.post("/ar-invoices", response_model=ARInvoice)
 def create_ar_invoice(
@@ -68,12 +192,14 @@ def create_ar_invoice(
 
 @router.get("/ar-invoices", response_model=List[ARInvoice])
 def read_ar_invoices(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_finance.get_ar_invoices(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_finance.get_ar_invoices(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 @router.post("/bank-statements", response_model=BankStatement)
 def create_bank_statement(
@@ -85,9 +211,29 @@ def create_bank_statement(
 
 @router.get("/bank-statements", response_model=List[BankStatement])
 def read_bank_statements(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_finance.get_bank_statements(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_finance.get_bank_statements(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
+
+@router.post("/bank-statements/reconcile")
+def reconcile_bank_statements(
+    bank_account_id: Optional[int] = None,
+    window_days: Optional[int] = Query(None, ge=0, le=90),
+    dry_run: bool = False,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Match unreconciled statement lines to posted journal lines on their bank account.
+
+    Matches on amount and a date window, preferring lines with the same
+    reference. With ``dry_run`` the report is returned but nothing is marked.
+    """
+    try:
+        return reconciliation.reconcile(db, bank_account_id=bank_account_id, window_days=window_days, dry_run=dry_run)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Another reconciliation run matched some of these lines first; run again")
@@ -1,7 +1,9 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.crud import pagination
+from app.crud.pagination import PageParams
 from app.schemas.hr import Department, DepartmentCreate, Employee, EmployeeCreate, Payroll, PayrollCreate
 from app.crud import crud_hr
 
@@ -18,12 +20,14 @@ def create_department(
 
 @router.get("/departments", response_model=List[Department])
 def read_departments(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_hr.get_departments(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_hr.get_departments(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 # Employees
 @router.post("/employees", response_model=Employee)
@@ -36,12 +40,14 @@ def create_employee(
 
 @router.get("/employees", response_model=List[Employee])
 def read_employees(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_hr.get_employees(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_hr.get_employees(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 # Payroll
 @router.post("/payroll", response_model=Payroll)
@@ -54,9 +60,11 @@ def create_payroll(
 
 @router.get("/payroll", response_model=List[Payroll])
 def read_payrolls(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_hr.get_payrolls(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_hr.get_payrolls(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
@@ -0,0 +1,58 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.crud import crud_job, pagination
+from app.crud.pagination import PageParams
+from app.models.job import JobStatus
+from app.schemas.job import Job
+
+router = APIRouter()
+
+@router.get("/jobs", response_model=List[Job])
+def read_jobs(
+    response: Response,
+    status: Optional[JobStatus] = None,
+    page: PageParams = Depends(deps.get_page_params),
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    jobs = crud_job.get_jobs(db, skip=page.skip, limit=page.limit, after_id=page.after_id, status=status)
+    return pagination.with_next_cursor(response, jobs, page.limit)
+
+@router.get("/jobs/{job_id}", response_model=Job)
+def read_job(
+    job_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    db_job = crud_job.get_job(db, job_id=job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return db_job
+
+@router.post("/jobs/{job_id}/cancel", response_model=Job)
+def cancel_job(
+    job_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    db_job = crud_job.get_job(db, job_id=job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if db_job.status in crud_job.FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job already {db_job.status}")
+    return crud_job.request_cancel(db, db_job)
+
+@router.post("/jobs/{job_id}/retry", response_model=Job)
+def retry_job(
+    job_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    db_job = crud_job.get_job(db, job_id=job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if db_job.status not in (JobStatus.FAILED, JobStatus.CANCELLED):
+        raise HTTPException(status_code=409, detail="Only failed or cancelled jobs can be retried")
+    return crud_job.retry_job(db, db_job)
@@ -1,7 +1,9 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.crud import pagination
+from app.crud.pagination import PageParams
 from app.schemas.manufacturing import BillOfMaterials, BillOfMaterialsCreate, WorkOrder, WorkOrderCreate
 from app.crud import crud_manufacturing
 
@@ -18,12 +20,14 @@ def create_bom(
 
 @router.get("/boms", response_model=List[BillOfMaterials])
 def read_boms(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_manufacturing.get_boms(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_manufacturing.get_boms(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 # Work Orders
 @router.post("/work-orders", response_model=WorkOrder)
@@ -36,9 +40,11 @@ def create_work_order(
 
 @router.get("/work-orders", response_model=List[WorkOrder])
 def read_work_orders(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_manufacturing.get_work_orders(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_manufacturing.get_work_orders(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
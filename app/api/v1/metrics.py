@@ -0,0 +1,30 @@
+from typing import Any
+from fastapi import APIRouter, Depends
+from app.api import deps
+from app.db.pool import worker_pool_report
+from app.db.session import engine, async_engine
+from app.integrations.response_cache import response_cache
+from app.integrations.transport import transport_report
+
+router = APIRouter()
+
+@router.get("/db")
+def read_db_pool_metrics(
+    current_user = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    Connection pool usage of the worker that served this request:
+    checked-out and overflow connections plus checkout wait times.
+    """
+    return worker_pool_report(engine, async_engine)
+
+@router.get("/integrations")
+def read_integration_metrics(
+    current_user = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    Outbound API health per platform for this worker: circuit state,
+    retries, 429s and per-endpoint latency histograms, plus the hit rate
+    of cached marketplace lookups.
+    """
+    return {**transport_report(), "lookup_cache": response_cache.stats()}
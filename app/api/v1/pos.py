@@ -1,71 +1,121 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
-from app.schemas.pos import POSSession, POSSessionCreate, POSSessionUpdate, POSOrder, POSOrderCreate
-from app.crud import crud_pos
+from app.schemas.pos import POSSession, POSSessionCreate, POSSessionUpdate, POSOrder, POSOrderCreate, POSOrderBatchCreate, POSOrderReceipt, POSSyncRequest, POSSyncResponse
+from app.crud import crud_pos, pagination
+from app.crud.pagination import PageParams
 
 router = APIRouter()
 
+# The POS CRUD layer is synchronous; run_sync executes it on the async
+# connection so terminals never hold a threadpool worker while waiting on MySQL.
+
 # Sessions
 @router.post("/sessions", response_model=POSSession)
-def create_session(
+async def create_session(
     session: POSSessionCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    active_session = crud_pos.get_active_session(db, user_id=current_user.id)
+    active_session = await db.run_sync(crud_pos.get_active_session, user_id=current_user.id)
     if active_session:
         raise HTTPException(status_code=400, detail="User already has an active session")
-    return crud_pos.create_session(db=db, session=session, user_id=current_user.id)
+    return await db.run_sync(crud_pos.create_session, session=session, user_id=current_user.id)
 
 @router.put("/sessions/{session_id}/close", response_model=POSSession)
-def close_session(
+async def close_session(
     session_id: int,
     session_update: POSSessionUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    session = crud_pos.close_session(db=db, session_id=session_id, session_update=session_update)
+    session = await db.run_sync(crud_pos.close_session, session_id=session_id, session_update=session_update)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return session
 
 @router.get("/sessions/active", response_model=POSSession)
-def get_active_session(
-    db: Session = Depends(deps.get_db),
+async def get_active_session(
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    session = crud_pos.get_active_session(db, user_id=current_user.id)
+    session = await db.run_sync(crud_pos.get_active_session, user_id=current_user.id)
     if not session:
         raise HTTPException(status_code=404, detail="No active session found")
     return session
 
 # Orders
-@router.post("/orders", response_model=POSOrder)
-def create_order(
+@router.post("/orders", response_model=POSOrderReceipt)
+async def create_order(
     order: POSOrderCreate,
-    db: Session = Depends(deps.get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=64),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Create an order; retries carrying the same Idempotency-Key return the stored order"""
+    if idempotency_key and not order.idempotency_key:
+        order = order.model_copy(update={"idempotency_key": idempotency_key})
+    try:
+        return await db.run_sync(crud_pos.create_order, order=order)
+    except crud_pos.InsufficientStockError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Order conflicts with a concurrently stored order; retry it")
+
+@router.post("/orders/batch", response_model=List[POSOrderReceipt])
+async def create_orders_batch(
+    batch: POSOrderBatchCreate,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_pos.create_order(db=db, order=order)
+    """Upload queued offline sales in one request and one transaction"""
+    try:
+        return await db.run_sync(crud_pos.create_orders, orders=batch.orders)
+    except crud_pos.InsufficientStockError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Order conflicts with a concurrently stored order; retry it")
+
+@router.post("/sync", response_model=POSSyncResponse)
+async def sync_terminal(
+    payload: POSSyncRequest,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Push queued offline orders and pull product, price and coupon changes in one round trip.
+
+    The catalog changes are paged: while ``next_page`` is set, the terminal
+    repeats the sync with the same ``cursor`` and ``page=next_page``, then
+    keeps the returned ``cursor`` for its next sync.
+    """
+    try:
+        since = crud_pos.decode_sync_cursor(payload.cursor)
+        page = crud_pos.decode_catalog_page(payload.page)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+    orders = await db.run_sync(crud_pos.sync_orders, orders=payload.orders)
+    changes = await db.run_sync(crud_pos.get_catalog_changes, since=since, page=page)
+    return {"orders": orders, **changes}
 
 @router.get("/orders", response_model=List[POSOrder])
-def read_orders(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(deps.get_db),
+async def read_orders(
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_pos.get_orders(db, skip=skip, limit=limit)
+    orders = await db.run_sync(crud_pos.get_orders, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return pagination.with_next_cursor(response, orders, page.limit)
 
 @router.get("/orders/{order_id}", response_model=POSOrder)
-def read_order(
+async def read_order(
     order_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    order = crud_pos.get_order(db, order_id=order_id)
+    order = await db.run_sync(crud_pos.get_order, order_id=order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
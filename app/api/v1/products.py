@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.crud import crud_product, listing_totals, pagination, search as text_search
 from app.models.product import Product
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import uuid
 import os
 
@@ -31,107 +33,173 @@ class ProductUpdate(BaseModel):
     status: Optional[str] = None
 
 
+class BarcodeLookup(BaseModel):
+    barcodes: List[str] = Field(..., min_length=1, max_length=500)
+
+
 @router.get("/products")
-def get_products(
+async def get_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
     category: Optional[str] = None,
-    db: Session = Depends(deps.get_db),
+    include_total: bool = True,
+    estimate_total: bool = False,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    """Get list of products with pagination and search"""
-    query = db.query(Product)
+    """Get list of products with pagination and search.
+
+    ``include_total=false`` skips counting entirely; ``estimate_total=true``
+    accepts a table-statistics estimate for unfiltered listings. Search
+    results come back ranked by relevance and are paged with ``skip``.
+    """
+    after_id = deps.decode_page_cursor(cursor)
+    query = select(Product)
+    ranking = []
     
     if search:
-        query = query.filter(
-            (Product.name.ilike(f"%{search}%")) |
-            (Product.barcode.ilike(f"%{search}%"))
+        query, ranking = text_search.text_search(
+            query, db.bind.dialect.name, search, [Product.name], Product.barcode, Product.id
         )
     
     if category:
-        query = query.filter(Product.category == category)
+        query = query.where(Product.category == category)
     
-    total = query.count()
-    products = query.offset(skip).limit(limit).all()
+    total, estimated = None, False
+    if include_total:
+        total, estimated = await listing_totals.get_total(
+            db, query, table=Product.__tablename__,
+            filters={"search": search, "category": category}, estimate=estimate_total
+        )
+    if ranking:
+        page = query.order_by(*ranking, Product.id).offset(skip).limit(limit)
+    else:
+        page = pagination.paginate(query, Product.id, skip=skip, limit=limit, after_id=after_id)
+    products = (await db.scalars(page)).all()
     
     return {
         "total": total,
-        "products": products
+        "total_estimated": estimated,
+        "products": products,
+        "next_cursor": None if ranking else pagination.next_cursor(products, limit)
+    }
+
+
+@router.get("/products/by-barcode/{code}")
+async def get_product_by_barcode(
+    code: str,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Get a single product by barcode (POS scan)"""
+    product = await crud_product.get_by_barcode(db, code)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product
+
+
+@router.post("/products/by-barcode")
+async def get_products_by_barcode(
+    lookup: BarcodeLookup,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user = Depends(deps.get_current_active_user)
+):
+    """Resolve several barcodes at once; unknown codes are listed under ``missing``"""
+    found = await crud_product.get_by_barcodes(db, lookup.barcodes)
+    return {
+        "products": [found[code] for code in dict.fromkeys(lookup.barcodes) if code in found],
+        "missing": [code for code in dict.fromkeys(lookup.barcodes) if code not in found]
     }
 
 
+@router.get("/products/barcode-cache/stats")
+async def get_barcode_cache_stats(
+    current_user = Depends(deps.get_current_active_superuser)
+):
+    """Hit/miss counters of this worker's barcode cache"""
+    return crud_product.barcode_cache.stats()
+
+
 @router.get("/products/{product_id}")
-def get_product(
+async def get_product(
     product_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Get single product by ID"""
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = await db.get(Product, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 
 @router.post("/products")
-def create_product(
+async def create_product(
     product: ProductCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Create a new product"""
     # Check if barcode already exists
     if product.barcode:
-        existing = db.query(Product).filter(Product.barcode == product.barcode).first()
+        existing = await db.scalar(select(Product).where(Product.barcode == product.barcode))
         if existing:
             raise HTTPException(status_code=400, detail="Barcode already exists")
     
     db_product = Product(**product.dict())
     db.add(db_product)
-    db.commit()
-    db.refresh(db_product)
+    await db.commit()
+    listing_totals.invalidate(Product.__tablename__)
+    crud_product.invalidate_barcodes([db_product.barcode])
+    await db.refresh(db_product)
     return db_product
 
 
 @router.put("/products/{product_id}")
-def update_product(
+async def update_product(
     product_id: int,
     product: ProductUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Update a product"""
-    db_product = db.query(Product).filter(Product.id == product_id).first()
+    db_product = await db.get(Product, product_id)
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
     # Check barcode uniqueness if updating
     if product.barcode and product.barcode != db_product.barcode:
-        existing = db.query(Product).filter(Product.barcode == product.barcode).first()
+        existing = await db.scalar(select(Product).where(Product.barcode == product.barcode))
         if existing:
             raise HTTPException(status_code=400, detail="Barcode already exists")
     
+    old_barcode = db_product.barcode
     update_data = product.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_product, field, value)
     
-    db.commit()
-    db.refresh(db_product)
+    await db.commit()
+    listing_totals.invalidate(Product.__tablename__)
+    crud_product.invalidate_barcodes([old_barcode, db_product.barcode])
+    await db.refresh(db_product)
     return db_product
 
 
 @router.delete("/products/{product_id}")
-def delete_product(
+async def delete_product(
     product_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Delete a product"""
-    db_product = db.query(Product).filter(Product.id == product_id).first()
+    db_product = await db.get(Product, product_id)
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    db.delete(db_product)
-    db.commit()
+    await db.delete(db_product)
+    await db.commit()
+    listing_totals.invalidate(Product.__tablename__)
+    crud_product.invalidate_barcodes([db_product.barcode])
     return {"message": "Product deleted successfully"}
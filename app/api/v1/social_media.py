@@ -1,20 +1,26 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from typing import Optional, List
 from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.crud import crud_social_message
+from app.integrations import client_registry, message_ingest
 from app.integrations.facebook_client import FacebookClient
+from app.integrations.inbox import fetch_inbox
 from app.integrations.whatsapp_client import WhatsAppClient
 from app.api import deps
 from app.core.config import settings
+from app.models.social_message import SocialConversation, SocialMessage
 
 router = APIRouter()
 
 def get_facebook_client():
-    """Dependency to get Facebook API client"""
-    return FacebookClient()
+    """Dependency to get the shared Facebook API client"""
+    return client_registry.facebook_client()
 
 def get_whatsapp_client():
-    """Dependency to get WhatsApp API client"""
-    return WhatsAppClient()
+    """Dependency to get the shared WhatsApp API client"""
+    return client_registry.whatsapp_client()
 
 # Campaign Endpoints
 @router.get("/campaigns")
@@ -43,61 +49,88 @@ def get_campaign_insights(
         raise HTTPException(status_code=500, detail=str(e))
 
 # Unified Inbox - Messages Endpoints
+def _conversation(conversation: SocialConversation) -> dict:
+    """A stored conversation in the Graph API conversation shape the inbox UI expects"""
+    return {
+        "id": conversation.external_id,
+        "platform": conversation.platform,
+        "participants": {"data": [{"id": conversation.external_id, "name": conversation.participant_name}]},
+        "updated_time": conversation.last_message_at.strftime("%Y-%m-%dT%H:%M:%S+0000"),
+        "message_count": conversation.message_count,
+        "snippet": conversation.last_message_text,
+    }
+
+def _message(message: SocialMessage) -> dict:
+    return {
+        "id": message.external_id,
+        "from": {"id": message.sender_id},
+        "direction": message.direction,
+        "type": message.message_type,
+        "message": message.text,
+        "created_time": message.sent_at.strftime("%Y-%m-%dT%H:%M:%S+0000"),
+    }
+
 @router.get("/messages")
-def get_all_messages(
+async def get_all_messages(
     platform: Optional[str] = Query(None, description="Filter by platform: facebook, instagram, whatsapp"),
     limit: int = Query(25, ge=1, le=100),
+    live: bool = Query(False, description="Ask the Graph API instead of the local message store"),
+    db: Session = Depends(deps.get_db),
     fb_client: FacebookClient = Depends(get_facebook_client),
     wa_client: WhatsAppClient = Depends(get_whatsapp_client),
     current_user = Depends(deps.get_current_active_user)
 ):
-    """Get unified inbox messages from all platforms"""
-    try:
-        messages = []
-        
-        if platform is None or platform == "facebook":
-            fb_conversations = fb_client.get_conversations(limit=limit)
-            for conv in fb_conversations.get("data", []):
-                conv["platform"] = "facebook"
-                messages.append(conv)
-        
-        if platform is None or platform == "instagram":
-            ig_conversations = fb_client.get_instagram_messages(limit=limit)
-            for conv in ig_conversations.get("data", []):
-                conv["platform"] = "instagram"
-                messages.append(conv)
-        
-        # WhatsApp messages come via webhook, stored locally
-        # For now, return empty list for WhatsApp
-        if platform is None or platform == "whatsapp":
-            # TODO: Implement local storage for WhatsApp messages
-            pass
-        
-        # Sort by updated_time
-        messages.sort(key=lambda x: x.get("updated_time", ""), reverse=True)
-        
-        return {"data": messages[:limit]}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Get unified inbox messages from all platforms
+
+    Served from the conversations stored by the webhooks, newest first. With
+    ``live=true`` Facebook and Instagram are queried concurrently instead;
+    ``platforms`` then reports per platform whether it answered in time, so
+    a slow or failing one yields a partial inbox instead of an error.
+    """
+    if not live:
+        conversations = await asyncio.to_thread(crud_social_message.get_conversations, db, platform=platform, limit=limit)
+        return {"data": [_conversation(c) for c in conversations], "source": "local"}
+
+    sources = {}
+    if platform is None or platform == "facebook":
+        sources["facebook"] = lambda: fb_client.get_conversations(limit=limit)
+    if platform is None or platform == "instagram":
+        sources["instagram"] = lambda: fb_client.get_instagram_messages(limit=limit)
+    # WhatsApp has no conversation listing API; its messages only exist in the local store
+
+    inbox = await fetch_inbox(sources, limit=limit, timeout=settings.INBOX_PLATFORM_TIMEOUT_SECONDS)
+    if sources and all(status != "ok" for status in inbox["platforms"].values()):
+        raise HTTPException(status_code=500, detail=inbox["platforms"])
+    return {**inbox, "source": "live"}
 
 @router.get("/messages/{conversation_id}")
 def get_conversation_messages(
     conversation_id: str,
     platform: str = Query(..., description="Platform: facebook, instagram, whatsapp"),
     limit: int = Query(25, ge=1, le=100),
+    db: Session = Depends(deps.get_db),
     fb_client: FacebookClient = Depends(get_facebook_client),
     current_user = Depends(deps.get_current_active_user)
 ):
-    """Get messages in a specific conversation"""
+    """Get messages in a specific conversation
+
+    Conversations known to the local store are read from it; other
+    Facebook/Instagram conversation IDs are looked up on the Graph API.
+    """
+    conversation = crud_social_message.get_conversation(db, platform=platform, external_id=conversation_id)
+    if conversation:
+        messages = crud_social_message.get_messages(db, conversation_id=conversation.id, limit=limit)
+        return {"data": [_message(m) for m in messages], "source": "local"}
     try:
         if platform == "facebook":
             return fb_client.get_conversation_messages(conversation_id=conversation_id, limit=limit)
         elif platform == "instagram":
             return fb_client.get_instagram_conversation_messages(conversation_id=conversation_id, limit=limit)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported platform")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if platform == "whatsapp":
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    raise HTTPException(status_code=400, detail="Unsupported platform")
 
 @router.post("/messages/send")
 def send_message(
@@ -166,10 +199,8 @@ async def facebook_webhook_receive(request: Request):
     try:
         body = await request.json()
         
-        # Process webhook payload
-        # Store messages in local database or cache
-        # For now, just log it
-        print("Facebook webhook received:", body)
+        # Acknowledge at once; messages are written to the store in batches
+        await message_ingest.ingest(message_ingest.parse_messenger(body))
         
         return {"status": "ok"}
     except Exception as e:
@@ -194,10 +225,8 @@ async def whatsapp_webhook_receive(request: Request):
     try:
         body = await request.json()
         
-        # Process webhook payload
-        # Extract messages and store them
-        # For now, just log it
-        print("WhatsApp webhook received:", body)
+        # Acknowledge at once; messages are written to the store in batches
+        await message_ingest.ingest(message_ingest.parse_whatsapp(body))
         
         return {"status": "ok"}
     except Exception as e:
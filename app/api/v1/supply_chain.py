@@ -1,7 +1,9 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.crud import pagination
+from app.crud.pagination import PageParams
 from app.schemas.supply_chain import Supplier, SupplierCreate, Product, ProductCreate, PurchaseOrder, PurchaseOrderCreate
 from app.crud import crud_supply_chain
 
@@ -18,12 +20,14 @@ def create_supplier(
 
 @router.get("/suppliers", response_model=List[Supplier])
 def read_suppliers(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_supply_chain.get_suppliers(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_supply_chain.get_suppliers(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 # Products
 @router.post("/products", response_model=Product)
@@ -36,12 +40,14 @@ def create_product(
 
 @router.get("/products", response_model=List[Product])
 def read_products(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_supply_chain.get_products(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_supply_chain.get_products(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
 
 # Purchase Orders
 @router.post("/orders", response_model=PurchaseOrder)
@@ -54,9 +60,11 @@ def create_purchase_order(
 
 @router.get("/orders", response_model=List[PurchaseOrder])
 def read_purchase_orders(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(deps.get_page_params),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    return crud_supply_chain.get_purchase_orders(db, skip=skip, limit=limit)
+    return pagination.with_next_cursor(
+        response, crud_supply_chain.get_purchase_orders(db, skip=page.skip, limit=page.limit, after_id=page.after_id), page.limit
+    )
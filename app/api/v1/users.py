@@ -1,9 +1,10 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.crud import crud_user
+from app.crud import crud_user, pagination
+from app.crud.pagination import PageParams
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
 
@@ -11,16 +12,16 @@ router = APIRouter()
 
 @router.get("/users", response_model=List[UserSchema])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: PageParams = Depends(deps.get_page_params),
     current_user: User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users. Super admin only.
     """
-    users = crud_user.get_multi(db, skip=skip, limit=limit)
-    return users
+    users = crud_user.get_multi(db, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return pagination.with_next_cursor(response, users, page.limit)
 
 @router.post("/users", response_model=UserSchema)
 def create_user(
@@ -56,6 +57,15 @@ def read_user_me(
     """
     return current_user
 
+@router.get("/users/cache-stats")
+def read_principal_cache_stats(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Hit/miss counters of this worker's principal cache. Super admin only.
+    """
+    return crud_user.principal_cache.stats()
+
 @router.get("/users/{user_id}", response_model=UserSchema)
 def read_user_by_id(
     user_id: int,
@@ -1,26 +1,23 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional
 from sqlalchemy.orm import Session
-import json
-from datetime import datetime
+from app.integrations import woocommerce_sync
+from app.integrations import client_registry
 from app.integrations.woocommerce_client import WooCommerceClient
 from app.api import deps
 from app.models.woocommerce_product import WooCommerceProduct
-from app.crud import crud_woocommerce_settings
+from app.crud import crud_job, crud_woocommerce_settings, pagination, search as text_search
+from app.jobs.woocommerce import SYNC_LOCAL_PRODUCTS
 from app.schemas import woocommerce_settings as settings_schemas
 
 router = APIRouter()
 
 def get_woocommerce_client(db: Session = Depends(deps.get_db)):
-    """Dependency to get WooCommerce API client with database credentials"""
-    settings = crud_woocommerce_settings.get_settings(db)
-    if not settings:
+    """Dependency to get the shared WooCommerce API client for the stored credentials"""
+    client = client_registry.woocommerce_client(db)
+    if not client:
         raise HTTPException(status_code=404, detail="WooCommerce settings not configured")
-    return WooCommerceClient(
-        url=settings.store_url,
-        consumer_key=settings.consumer_key,
-        consumer_secret=settings.consumer_secret
-    )
+    return client
 
 # Settings Endpoints
 @router.get("/settings", response_model=settings_schemas.WooCommerceSettings)
@@ -45,11 +42,13 @@ def update_settings(
     if settings:
         # Update existing settings
         updated_settings = crud_woocommerce_settings.update_settings(db, settings.id, settings_data)
-        return updated_settings
     else:
         # Create new settings if none exist
         create_data = settings_schemas.WooCommerceSettingsCreate(**settings_data.dict(exclude_unset=True))
-        return crud_woocommerce_settings.create_settings(db, create_data)
+        updated_settings = crud_woocommerce_settings.create_settings(db, create_data)
+    # Rebuild the shared client with the new credentials on next use
+    client_registry.invalidate("woocommerce")
+    return updated_settings
 
 
 # Product Endpoints
@@ -256,72 +255,37 @@ def get_totals(
 # Sync Endpoint
 @router.post("/sync/products")
 def sync_products(
-    page: int = Query(1, ge=1),
+    page: Optional[int] = Query(None, ge=1),
     per_page: int = Query(100, ge=1, le=100),
+    full: bool = False,
     client: WooCommerceClient = Depends(get_woocommerce_client),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
-    """Sync products from WooCommerce to local database"""
+    """Sync products from WooCommerce to local database.
+
+    Without ``page`` a background job is queued and returned at once (poll
+    ``GET /jobs/{id}``). It fetches only products modified since the last
+    successful sync (``full=true`` fetches everything) and periodically
+    prunes products deleted in the store. With ``page`` just that page is
+    synced inline.
+    """
     try:
-        # Fetch products from WooCommerce
-        products = client.get_products(page=page, per_page=per_page)
-        
-        synced_count = 0
-        updated_count = 0
-        
-        for product_data in products:
-            # Check if product already exists
-            existing_product = db.query(WooCommerceProduct).filter(
-                WooCommerceProduct.woo_id == product_data['id']
-            ).first()
-            
-            # Prepare product data
-            product_dict = {
-                'woo_id': product_data['id'],
-                'name': product_data['name'],
-                'slug': product_data['slug'],
-                'permalink': product_data['permalink'],
-                'type': product_data['type'],
-                'status': product_data['status'],
-                'featured': product_data.get('featured', False),
-                'catalog_visibility': product_data.get('catalog_visibility', 'visible'),
-                'description': product_data.get('description', ''),
-                'short_description': product_data.get('short_description', ''),
-                'sku': product_data.get('sku', ''),
-                'price': float(product_data.get('price', 0) or 0),
-                'regular_price': float(product_data.get('regular_price', 0) or 0),
-                'sale_price': float(product_data.get('sale_price', 0) or 0) if product_data.get('sale_price') else None,
-                'manage_stock': product_data.get('manage_stock', False),
-                'stock_quantity': product_data.get('stock_quantity'),
-                'stock_status': product_data.get('stock_status', 'instock'),
-                'image_url': product_data['images'][0]['src'] if product_data.get('images') else None,
-                'category_ids': ','.join([str(cat['id']) for cat in product_data.get('categories', [])]),
-                'date_created': datetime.fromisoformat(product_data['date_created'].replace('Z', '+00:00')) if product_data.get('date_created') else None,
-                'date_modified': datetime.fromisoformat(product_data['date_modified'].replace('Z', '+00:00')) if product_data.get('date_modified') else None,
-                'raw_data': json.dumps(product_data)
+        if page is not None:
+            counts = woocommerce_sync.sync_local_product_page(db, client.get_products(page=page, per_page=per_page))
+            return {
+                "success": True,
+                **counts,
+                "total": counts["synced"] + counts["updated"],
+                "page": page,
+                "per_page": per_page
             }
-            
-            if existing_product:
-                # Update existing product
-                for key, value in product_dict.items():
-                    setattr(existing_product, key, value)
-                updated_count += 1
-            else:
-                # Create new product
-                new_product = WooCommerceProduct(**product_dict)
-                db.add(new_product)
-                synced_count += 1
-        
-        db.commit()
         
+        job = crud_job.enqueue_once(db, SYNC_LOCAL_PRODUCTS, params={"full": full}, created_by=current_user.id)
         return {
             "success": True,
-            "synced": synced_count,
-            "updated": updated_count,
-            "total": synced_count + updated_count,
-            "page": page,
-            "per_page": per_page
+            "job_id": job.id,
+            "status": job.status
         }
     except Exception as e:
         db.rollback()
@@ -331,26 +295,34 @@ def sync_products(
 def get_local_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ):
     """Get products from local database"""
+    after_id = deps.decode_page_cursor(cursor)
     try:
         query = db.query(WooCommerceProduct)
+        ranking = []
         
         if search:
-            query = query.filter(
-                (WooCommerceProduct.name.ilike(f"%{search}%")) |
-                (WooCommerceProduct.sku.ilike(f"%{search}%"))
+            query, ranking = text_search.text_search(
+                query, db.bind.dialect.name, search, [WooCommerceProduct.name], WooCommerceProduct.sku, WooCommerceProduct.id
             )
         
         total = query.count()
-        products = query.offset(skip).limit(limit).all()
+        if ranking:
+            products = query.order_by(*ranking, WooCommerceProduct.id).offset(skip).limit(limit).all()
+        else:
+            products = pagination.paginate(
+                query, WooCommerceProduct.id, skip=skip, limit=limit, after_id=after_id
+            ).all()
         
         return {
             "total": total,
-            "products": products
+            "products": products,
+            "next_cursor": None if ranking else pagination.next_cursor(products, limit)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -3,6 +3,21 @@ from urllib.parse import quote_plus
 from pydantic_settings import BaseSettings
 from typing import List
 
+# Sync driver prefix -> asyncio driver prefix used by the async engine
+ASYNC_DRIVERS = {
+    "mysql+pymysql://": "mysql+aiomysql://",
+    "mysql://": "mysql+aiomysql://",
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+    "postgresql://": "postgresql+asyncpg://",
+}
+
+def async_database_uri(uri: str) -> str:
+    for sync_prefix, async_prefix in ASYNC_DRIVERS.items():
+        if uri.startswith(sync_prefix):
+            return async_prefix + uri[len(sync_prefix):]
+    return uri
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "ERP System"
     API_V1_STR: str = "/api/v1"
@@ -17,7 +32,63 @@ class Settings(BaseSettings):
     MYSQL_DB: str = os.getenv("MYSQL_DB", "erp_db")
     
     SQLALCHEMY_DATABASE_URI: str | None = ""
-    
+    ASYNC_SQLALCHEMY_DATABASE_URI: str | None = ""
+
+    # Connection pool, per engine and per gunicorn worker
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800")) # keep below MySQL wait_timeout
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true" # false = rely on recycle + invalidate on disconnect
+
+    # Principal cache (users resolved from JWT subjects in get_current_user)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    PRINCIPAL_CACHE_MAX_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "1024"))
+
+    # Cached listing totals (products/coupons), invalidated on writes in this worker
+    LISTING_TOTAL_CACHE_TTL_SECONDS: int = int(os.getenv("LISTING_TOTAL_CACHE_TTL_SECONDS", "30"))
+    LISTING_TOTAL_CACHE_MAX_SIZE: int = int(os.getenv("LISTING_TOTAL_CACHE_MAX_SIZE", "512"))
+
+    # Barcode lookup cache for POS scanning, per worker
+    BARCODE_CACHE_TTL_SECONDS: int = int(os.getenv("BARCODE_CACHE_TTL_SECONDS", "30"))
+    BARCODE_CACHE_MAX_SIZE: int = int(os.getenv("BARCODE_CACHE_MAX_SIZE", "50000"))
+
+    # Offline POS terminal sync
+    POS_SYNC_PAGE_SIZE: int = int(os.getenv("POS_SYNC_PAGE_SIZE", "500")) # products and coupons per catalog pull page
+
+    # Background jobs (DB-backed queue, no broker)
+    JOB_RUNNER_ENABLED: bool = os.getenv("JOB_RUNNER_ENABLED", "true").lower() == "true" # false = run python -m app.jobs.runner separately
+    JOB_CONCURRENCY: int = int(os.getenv("JOB_CONCURRENCY", "2"))
+    JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BACKOFF_SECONDS: int = int(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30")) # doubled after each failed attempt
+    JOB_STALE_AFTER_SECONDS: int = int(os.getenv("JOB_STALE_AFTER_SECONDS", "600")) # running jobs without a heartbeat are requeued
+
+    # Outbound integration calls (shared transport: rate limits, retries, circuit breaker)
+    INTEGRATION_TIMEOUT_SECONDS: float = float(os.getenv("INTEGRATION_TIMEOUT_SECONDS", "30"))
+    INTEGRATION_MAX_RETRIES: int = int(os.getenv("INTEGRATION_MAX_RETRIES", "4"))
+    INTEGRATION_BACKOFF_BASE_SECONDS: float = float(os.getenv("INTEGRATION_BACKOFF_BASE_SECONDS", "0.5"))
+    INTEGRATION_BACKOFF_MAX_SECONDS: float = float(os.getenv("INTEGRATION_BACKOFF_MAX_SECONDS", "30"))
+    WOOCOMMERCE_RATE_LIMIT: float = float(os.getenv("WOOCOMMERCE_RATE_LIMIT", "10")) # requests/second per worker
+    DARAZ_RATE_LIMIT: float = float(os.getenv("DARAZ_RATE_LIMIT", "5"))
+    FACEBOOK_RATE_LIMIT: float = float(os.getenv("FACEBOOK_RATE_LIMIT", "5"))
+    WHATSAPP_RATE_LIMIT: float = float(os.getenv("WHATSAPP_RATE_LIMIT", "20"))
+    INBOX_PLATFORM_TIMEOUT_SECONDS: float = float(os.getenv("INBOX_PLATFORM_TIMEOUT_SECONDS", "5")) # unified inbox returns without platforms slower than this
+    INTEGRATION_CLIENT_TTL_SECONDS: int = int(os.getenv("INTEGRATION_CLIENT_TTL_SECONDS", "60")) # how long workers trust cached store credentials
+
+    # Cached marketplace lookups (categories, attributes, brands, shipment providers)
+    INTEGRATION_CACHE_DIR: str = os.getenv("INTEGRATION_CACHE_DIR", "") # empty = memory only, cold after restarts
+    INTEGRATION_CACHE_STALE_SECONDS: int = int(os.getenv("INTEGRATION_CACHE_STALE_SECONDS", str(7 * 24 * 3600))) # served past TTL while refreshing
+
+    # Webhook message ingestion (buffered per worker, written in batches)
+    MESSAGE_INGEST_BATCH_SIZE: int = int(os.getenv("MESSAGE_INGEST_BATCH_SIZE", "200"))
+    MESSAGE_INGEST_FLUSH_SECONDS: float = float(os.getenv("MESSAGE_INGEST_FLUSH_SECONDS", "0.5"))
+    MESSAGE_INGEST_MAX_PENDING: int = int(os.getenv("MESSAGE_INGEST_MAX_PENDING", "10000")) # beyond this webhooks write inline
+    MESSAGE_INGEST_MAX_ATTEMPTS: int = int(os.getenv("MESSAGE_INGEST_MAX_ATTEMPTS", "3")) # a message failing this often on its own is dropped
+
+    # Bank reconciliation
+    BANK_RECONCILE_WINDOW_DAYS: int = int(os.getenv("BANK_RECONCILE_WINDOW_DAYS", "3")) # max days between a statement line and its journal line
+
     # Daraz API
     DARAZ_APP_KEY: str = os.getenv("DARAZ_APP_KEY", "")
     DARAZ_APP_SECRET: str = os.getenv("DARAZ_APP_SECRET", "")
@@ -43,6 +114,10 @@ class Settings(BaseSettings):
     WOOCOMMERCE_URL: str = os.getenv("WOOCOMMERCE_URL", "")
     WOOCOMMERCE_CONSUMER_KEY: str = os.getenv("WOOCOMMERCE_CONSUMER_KEY", "")
     WOOCOMMERCE_CONSUMER_SECRET: str = os.getenv("WOOCOMMERCE_CONSUMER_SECRET", "")
+    WOOCOMMERCE_MAX_CONCURRENCY: int = int(os.getenv("WOOCOMMERCE_MAX_CONCURRENCY", "4")) # parallel page fetches per full pull
+    WOOCOMMERCE_COMPRESS_RAW_DATA: bool = os.getenv("WOOCOMMERCE_COMPRESS_RAW_DATA", "true").lower() == "true"
+    WOOCOMMERCE_RECONCILE_INTERVAL_HOURS: int = int(os.getenv("WOOCOMMERCE_RECONCILE_INTERVAL_HOURS", "24")) # ID-only deletion check
+    WOOCOMMERCE_WATERMARK_MARGIN_SECONDS: int = int(os.getenv("WOOCOMMERCE_WATERMARK_MARGIN_SECONDS", "300")) # saved watermark stays this far behind run start (clock skew)
 
 
     def __init__(self, *args, **kwargs):
@@ -51,6 +126,8 @@ class Settings(BaseSettings):
             encoded_user = quote_plus(self.MYSQL_USER)
             encoded_password = quote_plus(self.MYSQL_PASSWORD)
             self.SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{encoded_user}:{encoded_password}@{self.MYSQL_SERVER}:{self.MYSQL_PORT}/{self.MYSQL_DB}"
+        if not self.ASYNC_SQLALCHEMY_DATABASE_URI:
+            self.ASYNC_SQLALCHEMY_DATABASE_URI = async_database_uri(self.SQLALCHEMY_DATABASE_URI)
 
     class Config:
         case_sensitive = True
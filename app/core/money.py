@@ -0,0 +1,39 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Annotated, Any, Optional
+
+from pydantic import AfterValidator
+
+# Money is stored with two decimal places; minor units are cents
+SCALE = 2
+MINOR_UNITS = 10 ** SCALE
+CENT = Decimal(1).scaleb(-SCALE)
+ZERO = Decimal(0).quantize(CENT)
+
+
+def money(value: Any) -> Decimal:
+    """``value`` as a Decimal rounded half-up to whole cents.
+
+    Floats go through their shortest repr, so 0.1 becomes 0.10 rather than
+    the binary expansion 0.1000000000000000055...
+    """
+    if isinstance(value, float):
+        value = repr(value)
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def to_minor(value: Optional[Any]) -> int:
+    """Integer cents of ``value`` (None counts as zero); exact to sum and compare."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    return int(money(value).scaleb(SCALE))
+
+
+def from_minor(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-SCALE).quantize(CENT)
+
+
+# Money fields of API schemas: parsed as Decimal and rounded to cents like the
+# Money column, so exact amounts reach clients (serialized as JSON strings)
+Amount = Annotated[Decimal, AfterValidator(money)]
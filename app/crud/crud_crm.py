@@ -1,5 +1,6 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from app.crud.pagination import paginate
 from app.models.crm import Customer, Lead, Interaction
 from app.schemas.crm import CustomerCreate, LeadCreate, InteractionCreate
 
@@ -17,8 +18,8 @@ def create_customer(db: Session, customer: CustomerCreate) -> Customer:
     db.refresh(db_customer)
     return db_customer
 
-def get_customers(db: Session, skip: int = 0, limit: int = 100) -> List[Customer]:
-    return db.query(Customer).offset(skip).limit(limit).all()
+def get_customers(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Customer]:
+    return paginate(db.query(Customer), Customer.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # Lead CRUD
 def create_lead(db: Session, lead: LeadCreate) -> Lead:
@@ -34,8 +35,8 @@ def create_lead(db: Session, lead: LeadCreate) -> Lead:
     db.refresh(db_lead)
     return db_lead
 
-def get_leads(db: Session, skip: int = 0, limit: int = 100) -> List[Lead]:
-    return db.query(Lead).offset(skip).limit(limit).all()
+def get_leads(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Lead]:
+    return paginate(db.query(Lead), Lead.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # Interaction CRUD
 def create_interaction(db: Session, interaction: InteractionCreate) -> Interaction:
@@ -50,5 +51,5 @@ def create_interaction(db: Session, interaction: InteractionCreate) -> Interacti
     db.refresh(db_interaction)
     return db_interaction
 
-def get_interactions(db: Session, skip: int = 0, limit: int = 100) -> List[Interaction]:
-    return db.query(Interaction).offset(skip).limit(limit).all()
+def get_interactions(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Interaction]:
+    return paginate(db.query(Interaction), Interaction.id, skip=skip, limit=limit, after_id=after_id).all()
@@ -1,6 +1,10 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from app.models.finance import Account, JournalEntry, JournalEntryLine, APInvoice, ARInvoice, BankStatement
+from app.core.money import from_minor, to_minor
+from app.crud import ledger
+from app.crud.pagination import paginate
+from app.models.finance import Account, JournalEntry, JournalEntryLine, JournalEntryStatus, APInvoice, ARInvoice, BankStatement
 from app.schemas.finance import AccountCreate, AccountUpdate, JournalEntryCreate, APInvoiceCreate, ARInvoiceCreate, BankStatementCreate
 
 # Account CRUD
@@ -19,8 +23,8 @@ def create_account(db: Session, account: AccountCreate) -> Account:
 def get_account(db: Session, account_id: int) -> Optional[Account]:
     return db.query(Account).filter(Account.id == account_id).first()
 
-def get_accounts(db: Session, skip: int = 0, limit: int = 100) -> List[Account]:
-    return db.query(Account).offset(skip).limit(limit).all()
+def get_accounts(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Account]:
+    return paginate(db.query(Account), Account.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # JournalEntry CRUD
 def create_journal_entry(db: Session, journal_entry: JournalEntryCreate) -> JournalEntry:
@@ -34,31 +38,124 @@ def create_journal_entry(db: Session, journal_entry: JournalEntryCreate) -> Jour
     db.flush()
 
     for line in journal_entry.lines:
-        db_line = JournalEntryLine(
-            journal_entry_id=db_journal_entry.id,
+        db_journal_entry.lines.append(JournalEntryLine(
             account_id=line.account_id,
             debit=line.debit,
             credit=line.credit,
             description=line.description
-        )
-        db.add(db_line)
-        
-        # Update account balance if POSTED
-        if journal_entry.status == "POSTED":
-            account = db.query(Account).filter(Account.id == line.account_id).first()
-            if account:
-                account.balance += (line.debit - line.credit)
+        ))
+    db.flush()
+
+    # Update account balances and period snapshots if POSTED
+    if journal_entry.status == JournalEntryStatus.POSTED:
+        try:
+            ledger.apply_entries(db, [db_journal_entry])
+        except ledger.LedgerError:
+            db.rollback()
+            raise
 
     db.commit()
     db.refresh(db_journal_entry)
     return db_journal_entry
 
-def get_journal_entries(db: Session, skip: int = 0, limit: int = 100) -> List[JournalEntry]:
-    return db.query(JournalEntry).offset(skip).limit(limit).all()
+class JournalBatchError(ledger.LedgerError):
+    """A batch was rejected as a whole; ``errors`` maps entry index to the reason"""
+
+    def __init__(self, errors: Dict[int, str]):
+        super().__init__(f"{len(errors)} journal entries are invalid")
+        self.errors = errors
+
+def validate_journal_entries(db: Session, entries: List[JournalEntryCreate]) -> Dict[int, str]:
+    """Why each invalid entry cannot be stored, by index, checked in a single pass.
+
+    The account ids of the whole batch are resolved with one query, and
+    amounts are totalled in integer cents so balancing is exact.
+    """
+    referenced = {line.account_id for entry in entries for line in entry.lines}
+    known = set(db.scalars(select(Account.id).where(Account.id.in_(referenced)))) if referenced else set()
+    statuses = {status.value for status in JournalEntryStatus}
+
+    errors: Dict[int, str] = {}
+    for index, entry in enumerate(entries):
+        debit = credit = 0
+        negative = False
+        unknown = set()
+        for line in entry.lines:
+            line_debit, line_credit = to_minor(line.debit), to_minor(line.credit)
+            negative = negative or line_debit < 0 or line_credit < 0
+            debit += line_debit
+            credit += line_credit
+            if line.account_id not in known:
+                unknown.add(line.account_id)
+
+        if entry.status not in statuses:
+            errors[index] = f"Unknown status {entry.status!r}"
+        elif not entry.lines:
+            errors[index] = "Journal entry has no lines"
+        elif unknown:
+            errors[index] = f"Unknown account ids: {sorted(unknown)}"
+        elif negative:
+            errors[index] = "Debit and credit amounts must not be negative"
+        elif debit != credit:
+            errors[index] = f"Debits {from_minor(debit)} do not equal credits {from_minor(credit)}"
+    return errors
+
+def create_journal_entries(db: Session, entries: List[JournalEntryCreate], partial: bool = False) -> List[Dict[str, Any]]:
+    """Validate and store many journal entries in one transaction, reporting an outcome per entry.
+
+    Entries and lines are bulk-inserted and the POSTED ones are applied to
+    the ledger together. By default any invalid entry rejects the whole batch
+    with ``JournalBatchError``; with ``partial`` the valid entries are stored
+    and the rest reported as rejected.
+    """
+    errors = validate_journal_entries(db, entries)
+    if errors and not partial:
+        raise JournalBatchError(errors)
+
+    valid = [(index, entry) for index, entry in enumerate(entries) if index not in errors]
+    db_entries = [
+        JournalEntry(date=entry.date, description=entry.description, reference=entry.reference, status=entry.status)
+        for _, entry in valid
+    ]
+    try:
+        db.add_all(db_entries)
+        db.flush()
+        line_rows = [
+            {
+                "journal_entry_id": db_entry.id,
+                "account_id": line.account_id,
+                "debit": line.debit,
+                "credit": line.credit,
+                "description": line.description,
+            }
+            for db_entry, (_, entry) in zip(db_entries, valid)
+            for line in entry.lines
+        ]
+        if line_rows:
+            db.execute(insert(JournalEntryLine), line_rows)
+        ledger.apply_entries(db, [entry for _, entry in valid if entry.status == JournalEntryStatus.POSTED])
+        created = {index: db_entry.id for (index, _), db_entry in zip(valid, db_entries)}
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return [
+        {"index": index, "status": "created", "journal_entry_id": created[index]} if index in created
+        else {"index": index, "status": "rejected", "error": errors[index]}
+        for index in range(len(entries))
+    ]
+
+def get_journal_entries(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[JournalEntry]:
+    return paginate(db.query(JournalEntry), JournalEntry.id, skip=skip, limit=limit, after_id=after_id).all()
 
 def get_journal_entry(db: Session, entry_id: int) -> Optional[JournalEntry]:
     return db.query(JournalEntry).filter(JournalEntry.id == entry_id).first()
 
+def post_journal_entry(db: Session, entry: JournalEntry) -> JournalEntry:
+    """Post a DRAFT entry, updating account balances and period snapshots"""
+    return ledger.post_entry(db, entry)
+
 # AP Invoice CRUD
 def create_ap_invoice(db: Session, invoice: APInvoiceCreate) -> APInvoice:
     db_invoice = APInvoice(
@@ -74,8 +171,8 @@ def create_ap_invoice(db: Session, invoice: APInvoiceCreate) -> APInvoice:
     db.refresh(db_invoice)
     return db_invoice
 
-def get_ap_invoices(db: Session, skip: int = 0, limit: int = 100) -> List[APInvoice]:
-    return db.query(APInvoice).offset(skip).limit(limit).all()
+def get_ap_invoices(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[APInvoice]:
+    return paginate(db.query(APInvoice), APInvoice.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # AR Invoice CRUD
 def create_ar_invoice(db: Session, invoice: ARInvoiceCreate) -> ARInvoice:
@@ -92,8 +189,8 @@ def create_ar_invoice(db: Session, invoice: ARInvoiceCreate) -> ARInvoice:
     db.refresh(db_invoice)
     return db_invoice
 
-def get_ar_invoices(db: Session, skip: int = 0, limit: int = 100) -> List[ARInvoice]:
-    return db.query(ARInvoice).offset(skip).limit(limit).all()
+def get_ar_invoices(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[ARInvoice]:
+    return paginate(db.query(ARInvoice), ARInvoice.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # Bank Statement CRUD
 def create_bank_statement(db: Session, statement: BankStatementCreate) -> BankStatement:
@@ -110,5 +207,5 @@ def create_bank_statement(db: Session, statement: BankStatementCreate) -> BankSt
     db.refresh(db_statement)
     return db_statement
 
-def get_bank_statements(db: Session, skip: int = 0, limit: int = 100) -> List[BankStatement]:
-    return db.query(BankStatement).offset(skip).limit(limit).all()
+def get_bank_statements(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[BankStatement]:
+    return paginate(db.query(BankStatement), BankStatement.id, skip=skip, limit=limit, after_id=after_id).all()
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from app.crud.pagination import paginate
 from app.models.hr import Department, Employee, Payroll
 from app.schemas.hr import DepartmentCreate, EmployeeCreate, PayrollCreate
 
@@ -14,8 +15,8 @@ def create_department(db: Session, department: DepartmentCreate) -> Department:
     db.refresh(db_department)
     return db_department
 
-def get_departments(db: Session, skip: int = 0, limit: int = 100) -> List[Department]:
-    return db.query(Department).offset(skip).limit(limit).all()
+def get_departments(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Department]:
+    return paginate(db.query(Department), Department.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # Employee CRUD
 def create_employee(db: Session, employee: EmployeeCreate) -> Employee:
@@ -34,8 +35,8 @@ def create_employee(db: Session, employee: EmployeeCreate) -> Employee:
     db.refresh(db_employee)
     return db_employee
 
-def get_employees(db: Session, skip: int = 0, limit: int = 100) -> List[Employee]:
-    return db.query(Employee).offset(skip).limit(limit).all()
+def get_employees(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Employee]:
+    return paginate(db.query(Employee), Employee.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # Payroll CRUD
 def create_payroll(db: Session, payroll: PayrollCreate) -> Payroll:
@@ -50,5 +51,5 @@ def create_payroll(db: Session, payroll: PayrollCreate) -> Payroll:
     db.refresh(db_payroll)
     return db_payroll
 
-def get_payrolls(db: Session, skip: int = 0, limit: int = 100) -> List[Payroll]:
-    return db.query(Payroll).offset(skip).limit(limit).all()
+def get_payrolls(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Payroll]:
+    return paginate(db.query(Payroll), Payroll.id, skip=skip, limit=limit, after_id=after_id).all()
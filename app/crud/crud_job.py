@@ -0,0 +1,184 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud.pagination import paginate
+from app.models.job import Job, JobStatus
+
+FINISHED = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+def active_key(type: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Digest identifying a job by type and params, held while the job is queued or running"""
+    return hashlib.sha256(json.dumps([type, params or {}], sort_keys=True).encode()).hexdigest()
+
+def create_job(db: Session, type: str, params: Optional[Dict[str, Any]] = None, created_by: Optional[int] = None, max_attempts: Optional[int] = None, active_key: Optional[str] = None) -> Job:
+    db_job = Job(
+        type=type,
+        params=params or {},
+        status=JobStatus.QUEUED,
+        active_key=active_key,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=datetime.utcnow(),
+        created_by=created_by,
+    )
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def get_job(db: Session, job_id: int) -> Optional[Job]:
+    return db.query(Job).filter(Job.id == job_id).first()
+
+def get_active_job(db: Session, type: str, params: Optional[Dict[str, Any]] = None) -> Optional[Job]:
+    """The queued or running job of ``type``, with exactly ``params`` when given, if any"""
+    query = db.query(Job).filter(Job.type == type, Job.status.in_((JobStatus.QUEUED, JobStatus.RUNNING)))
+    if params is not None:
+        query = query.filter(Job.active_key == active_key(type, params))
+    return query.order_by(Job.id).first()
+
+def enqueue_once(db: Session, type: str, params: Optional[Dict[str, Any]] = None, created_by: Optional[int] = None) -> Job:
+    """Queue a job unless the same one is already pending, in which case that one is returned.
+
+    Jobs match on type and params; without ``params`` any pending job of the
+    type matches. The unique ``active_key`` makes concurrent requests agree
+    on a single job instead of both inserting one.
+    """
+    existing = get_active_job(db, type, params)
+    if existing:
+        return existing
+    try:
+        return create_job(db, type, params=params, created_by=created_by, active_key=active_key(type, params))
+    except IntegrityError:
+        # A concurrent request queued the same job first
+        db.rollback()
+        return get_active_job(db, type, params or {})
+
+def get_jobs(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None, status: Optional[str] = None) -> List[Job]:
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    return paginate(query, Job.id, skip=skip, limit=limit, after_id=after_id).all()
+
+def claim_next(db: Session, worker_id: str) -> Optional[Job]:
+    """Claim the oldest due queued job for ``worker_id``.
+
+    The claim is a conditional UPDATE on the job's status, so when several
+    runners race for the same row exactly one of them wins, on any database.
+    """
+    candidates = db.query(Job.id).filter(
+        Job.status == JobStatus.QUEUED, Job.run_after <= datetime.utcnow()
+    ).order_by(Job.run_after, Job.id).limit(5).all()
+    for (job_id,) in candidates:
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+            .values(status=JobStatus.RUNNING, locked_by=worker_id, attempts=Job.attempts + 1,
+                    started_at=now, heartbeat_at=now, error=None)
+        ).rowcount
+        db.commit()
+        if claimed:
+            return get_job(db, job_id)
+    return None
+
+def report_progress(db: Session, job_id: int, progress: int, message: Optional[str] = None) -> bool:
+    """Store progress and refresh the heartbeat; returns True if cancellation was requested."""
+    db.execute(
+        update(Job).where(Job.id == job_id)
+        .values(progress=progress, progress_message=message, heartbeat_at=datetime.utcnow())
+    )
+    db.commit()
+    return bool(db.query(Job.cancel_requested).filter(Job.id == job_id).scalar())
+
+def heartbeat(db: Session, job_id: int) -> None:
+    """Refresh the heartbeat of a running job without touching its progress"""
+    db.execute(update(Job).where(Job.id == job_id, Job.status == JobStatus.RUNNING).values(heartbeat_at=datetime.utcnow()))
+    db.commit()
+
+def mark_succeeded(db: Session, job: Job, result: Any = None) -> Job:
+    job.status = JobStatus.SUCCEEDED
+    job.active_key = None
+    job.result = result
+    job.finished_at = datetime.utcnow()
+    job.locked_by = None
+    db.commit()
+    return job
+
+def mark_cancelled(db: Session, job: Job) -> Job:
+    job.status = JobStatus.CANCELLED
+    job.active_key = None
+    job.finished_at = datetime.utcnow()
+    job.locked_by = None
+    db.commit()
+    return job
+
+def mark_failed(db: Session, job: Job, error: str) -> Job:
+    """Record a failed attempt; the job is queued again with backoff until it runs out of attempts."""
+    job.error = error
+    job.locked_by = None
+    if job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED
+        job.run_after = datetime.utcnow() + timedelta(seconds=settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1))
+    else:
+        job.status = JobStatus.FAILED
+        job.active_key = None
+        job.finished_at = datetime.utcnow()
+    db.commit()
+    return job
+
+def request_cancel(db: Session, job: Job) -> Job:
+    """Cancel a queued job at once; a running job stops at its next progress report."""
+    if job.status == JobStatus.QUEUED:
+        return mark_cancelled(db, job)
+    if job.status == JobStatus.RUNNING:
+        job.cancel_requested = True
+        db.commit()
+    return job
+
+def retry_job(db: Session, job: Job) -> Job:
+    """Queue a failed or cancelled job again with a fresh set of attempts.
+
+    If the same job was queued again meanwhile, that one is returned instead.
+    """
+    job.status = JobStatus.QUEUED
+    job.active_key = active_key(job.type, job.params)
+    job.attempts = 0
+    job.cancel_requested = False
+    job.error = None
+    job.run_after = datetime.utcnow()
+    job.finished_at = None
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return get_active_job(db, job.type, job.params or {})
+    db.refresh(job)
+    return job
+
+def requeue_stale(db: Session, stale_after: timedelta) -> int:
+    """Put back jobs whose runner stopped heartbeating (crashed or killed worker).
+
+    A stale job that has used all its attempts is marked failed instead, so a
+    job that keeps killing its worker is not reclaimed forever. Returns the
+    number of jobs queued again.
+    """
+    now = datetime.utcnow()
+    stale = (Job.status == JobStatus.RUNNING, Job.heartbeat_at < now - stale_after)
+    db.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.FAILED, locked_by=None, active_key=None, finished_at=now,
+                error="Worker stopped heartbeating on the last attempt")
+    )
+    requeued = db.execute(
+        update(Job)
+        .where(*stale)
+        .values(status=JobStatus.QUEUED, locked_by=None, run_after=now)
+    ).rowcount
+    db.commit()
+    return requeued
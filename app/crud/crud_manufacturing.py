@@ -1,5 +1,6 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from app.crud.pagination import paginate
 from app.models.manufacturing import BillOfMaterials, BOMComponent, WorkOrder
 from app.schemas.manufacturing import BillOfMaterialsCreate, WorkOrderCreate
 
@@ -27,8 +28,8 @@ def create_bom(db: Session, bom: BillOfMaterialsCreate) -> BillOfMaterials:
     db.refresh(db_bom)
     return db_bom
 
-def get_boms(db: Session, skip: int = 0, limit: int = 100) -> List[BillOfMaterials]:
-    return db.query(BillOfMaterials).offset(skip).limit(limit).all()
+def get_boms(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[BillOfMaterials]:
+    return paginate(db.query(BillOfMaterials), BillOfMaterials.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # Work Order CRUD
 def create_work_order(db: Session, work_order: WorkOrderCreate) -> WorkOrder:
@@ -44,5 +45,5 @@ def create_work_order(db: Session, work_order: WorkOrderCreate) -> WorkOrder:
     db.refresh(db_work_order)
     return db_work_order
 
-def get_work_orders(db: Session, skip: int = 0, limit: int = 100) -> List[WorkOrder]:
-    return db.query(WorkOrder).offset(skip).limit(limit).all()
+def get_work_orders(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[WorkOrder]:
+    return paginate(db.query(WorkOrder), WorkOrder.id, skip=skip, limit=limit, after_id=after_id).all()
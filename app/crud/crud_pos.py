@@ -1,7 +1,24 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from app.core.money import money
+from app.crud import crud_product
+from app.core.config import settings
+from app.crud.pagination import decode_token, encode_token, paginate
+from app.models.coupon import Coupon
 from app.models.pos import POSSession, POSOrder, POSOrderItem, Payment, SessionStatus
-from app.schemas.pos import POSSessionCreate, POSSessionUpdate, POSOrderCreate
+from app.models.product import Product
+from app.schemas.pos import POSSessionCreate, POSSessionUpdate, POSOrderCreate, POSSyncOrder
+
+class InsufficientStockError(Exception):
+    """Raised when a sale would take one or more products below zero stock."""
+
+    def __init__(self, product_ids: List[int]):
+        self.product_ids = product_ids
+        super().__init__(f"Insufficient stock for product(s): {', '.join(map(str, product_ids))}")
 
 # Session CRUD
 def create_session(db: Session, session: POSSessionCreate, user_id: int) -> POSSession:
@@ -38,43 +55,257 @@ def close_session(db: Session, session_id: int, session_update: POSSessionUpdate
     return db_session
 
 # Order CRUD
-def create_order(db: Session, order: POSOrderCreate) -> POSOrder:
-    db_order = POSOrder(
-        session_id=order.session_id,
-        customer_id=order.customer_id,
-        total_amount=order.total_amount,
-        status=order.status
-    )
-    db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
-
-    # Add items
-    for item in order.items:
-        db_item = POSOrderItem(
-            order_id=db_order.id,
-            product_id=item.product_id,
-            quantity=item.quantity,
-            unit_price=item.unit_price,
-            subtotal=item.quantity * item.unit_price
-        )
-        db.add(db_item)
-    
-    # Add payments
-    for payment in order.payments:
-        db_payment = Payment(
-            order_id=db_order.id,
-            amount=payment.amount,
-            method=payment.method
+# Orders are serialized after the (async) session call returns, so their
+# lines must be loaded eagerly rather than lazily on attribute access.
+_order_lines = (selectinload(POSOrder.items), selectinload(POSOrder.payments))
+
+def _add_orders(db: Session, orders: List[POSOrderCreate]) -> List[POSOrder]:
+    """Stage orders in the current transaction, bulk-inserting their items and payments."""
+    db_orders = [
+        POSOrder(
+            session_id=order.session_id,
+            customer_id=order.customer_id,
+            total_amount=order.total_amount,
+            status=order.status,
+            idempotency_key=order.idempotency_key
         )
-        db.add(db_payment)
+        for order in orders
+    ]
+    db.add_all(db_orders)
+    db.flush()
+
+    item_rows = [
+        {
+            "order_id": db_order.id,
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "unit_price": item.unit_price,
+            "subtotal": money(item.unit_price) * item.quantity,
+        }
+        for db_order, order in zip(db_orders, orders)
+        for item in order.items
+    ]
+    payment_rows = [
+        {
+            "order_id": db_order.id,
+            "amount": payment.amount,
+            "method": payment.method,
+        }
+        for db_order, order in zip(db_orders, orders)
+        for payment in order.payments
+    ]
+    if item_rows:
+        db.execute(insert(POSOrderItem), item_rows)
+    if payment_rows:
+        db.execute(insert(Payment), payment_rows)
+    return db_orders
+
+def decrement_stock(db: Session, orders: List[POSOrderCreate]) -> Dict[int, int]:
+    """Take sold quantities off Product.stock with one guarded UPDATE.
+
+    The sold products are read with ``FOR UPDATE`` first, so the shortage
+    check sees the stock the UPDATE will act on; the UPDATE itself still
+    only matches rows that hold enough stock. Concurrent terminals serialize
+    on the row locks of the products they sell and never on a global lock.
+    Returns the new stock level per product.
+    """
+    quantities: Dict[int, int] = defaultdict(int)
+    for order in orders:
+        for item in order.items:
+            quantities[item.product_id] += item.quantity
+    if not quantities:
+        return {}
+
+    # Locked in id order so terminals selling overlapping products cannot deadlock
+    before = {
+        product_id: stock or 0
+        for product_id, stock in db.execute(
+            select(Product.id, Product.stock).where(Product.id.in_(quantities)).order_by(Product.id).with_for_update()
+        ).all()
+    }
+    short = sorted(
+        product_id for product_id, quantity in quantities.items()
+        if product_id not in before or before[product_id] < quantity
+    )
+    if short:
+        raise InsufficientStockError(short)
+
+    sold = case(dict(quantities), value=Product.id)
+    current = func.coalesce(Product.stock, 0)
+    result = db.execute(
+        update(Product)
+        .where(Product.id.in_(quantities), current >= sold)
+        .values(stock=current - sold)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(quantities):
+        raise InsufficientStockError(sorted(quantities))
+    return {product_id: before[product_id] - quantity for product_id, quantity in quantities.items()}
+
+def create_order(db: Session, order: POSOrderCreate) -> POSOrder:
+    return create_orders(db, [order])[0]
+
+def create_orders(db: Session, orders: List[POSOrderCreate]) -> List[POSOrder]:
+    """Create several orders in one transaction; either all of them are stored or none.
+
+    Orders whose idempotency key is already stored are not created again and
+    the stored order is returned in their place; an order repeated within
+    the batch is created once and its receipt returned for every copy. Stock
+    is decremented in the same transaction, and each new order carries a
+    ``stock_levels`` list with the new stock of the products it sold.
+    """
+    for attempt in range(2):
+        stored = get_orders_by_idempotency_keys(db, [o.idempotency_key for o in orders if o.idempotency_key])
+        fresh: List[POSOrderCreate] = []
+        seen = set()
+        for order in orders:
+            key = order.idempotency_key
+            if key and (key in stored or key in seen):
+                continue
+            seen.add(key)
+            fresh.append(order)
+        try:
+            db_orders = _add_orders(db, fresh) if fresh else []
+            levels = decrement_stock(db, fresh)
+            db.commit()
+            crud_product.invalidate_products(levels)
+            break
+        except IntegrityError:
+            # A concurrent retry stored the same idempotency key first; look it up again
+            db.rollback()
+            if attempt:
+                raise
+        except Exception:
+            db.rollback()
+            raise
+
+    created: Dict[int, POSOrder] = {}
+    for order, db_order in zip(fresh, get_orders_by_ids(db, [db_order.id for db_order in db_orders])):
+        db_order.stock_levels = [
+            {"product_id": product_id, "stock": levels[product_id]}
+            for product_id in dict.fromkeys(item.product_id for item in order.items)
+        ]
+        created[id(order)] = db_order
+        if order.idempotency_key:
+            stored.setdefault(order.idempotency_key, db_order)
+    return [created.get(id(order)) or stored[order.idempotency_key] for order in orders]
 
+def sync_orders(db: Session, orders: List[POSSyncOrder]) -> List[Dict[str, Any]]:
+    """Store orders pushed by an offline terminal and report an outcome per order.
+
+    The whole push is tried as one unit first. If it trips over stock or a
+    concurrent duplicate, each order is retried in its own savepoint so one
+    bad sale does not block the rest of the queue.
+    """
+    stored = {key: order.id for key, order in get_orders_by_idempotency_keys(
+        db, [order.idempotency_key for order in orders]
+    ).items()}
+    pending: Dict[str, POSSyncOrder] = {}
+    for order in orders:
+        if order.idempotency_key not in stored:
+            pending.setdefault(order.idempotency_key, order)
+    fresh = list(pending.values())
+
+    created: Dict[str, int] = {}
+    rejected: Dict[str, str] = {}
+    try:
+        with db.begin_nested():
+            db_orders = _add_orders(db, fresh) if fresh else []
+            decrement_stock(db, fresh)
+        created = {order.idempotency_key: db_order.id for order, db_order in zip(fresh, db_orders)}
+    except (InsufficientStockError, IntegrityError):
+        for order in fresh:
+            key = order.idempotency_key
+            try:
+                with db.begin_nested():
+                    db_order = _add_orders(db, [order])[0]
+                    decrement_stock(db, [order])
+                created[key] = db_order.id
+            except InsufficientStockError as e:
+                rejected[key] = str(e)
+            except IntegrityError:
+                existing = get_orders_by_idempotency_keys(db, [key]).get(key)
+                if existing:
+                    stored[key] = existing.id
+                else:
+                    rejected[key] = "Order references an unknown session, customer or product"
     db.commit()
-    db.refresh(db_order)
-    return db_order
+    crud_product.invalidate_products({item.product_id for order in fresh for item in order.items})
+
+    results = []
+    reported = set()
+    for order in orders:
+        key = order.idempotency_key
+        if key in created and key not in reported:
+            results.append({"idempotency_key": key, "status": "created", "order_id": created[key]})
+        elif key in rejected:
+            results.append({"idempotency_key": key, "status": "rejected", "error": rejected[key]})
+        else:
+            results.append({"idempotency_key": key, "status": "duplicate", "order_id": created.get(key, stored.get(key))})
+        reported.add(key)
+    return results
+
+def get_catalog_changes(db: Session, since: Optional[datetime] = None, page: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """One page of products and coupons changed at or after ``since``, plus the cursors to continue.
+
+    Each table is paged by id, ``limit`` rows at a time. While ``next_page``
+    is set the terminal repeats the pull with it (see decode_catalog_page);
+    once it is empty, ``cursor`` is the ``since`` for the next pull. The
+    cursor is the database clock at the start of the first page, so the next
+    pull re-reads everything changed while the pages were read, and rows
+    stamped in that same second, and no change is missed at the boundary.
+    """
+    limit = limit or settings.POS_SYNC_PAGE_SIZE
+    if page is None:
+        page = {"started": db.scalar(select(func.now())).isoformat(), "products": 0, "coupons": 0}
+
+    rows: Dict[str, list] = {}
+    next_page = {"started": page["started"]}
+    for key, model in (("products", Product), ("coupons", Coupon)):
+        rows[key] = []
+        if page[key] is not None:
+            query = select(model)
+            if since is not None:
+                query = query.where(model.updated_at >= since)
+            rows[key] = db.scalars(paginate(query, model.id, limit=limit, after_id=page[key])).all()
+        # None once a table is exhausted, so later pages skip it
+        next_page[key] = rows[key][-1].id if len(rows[key]) == limit else None
+
+    more = next_page["products"] is not None or next_page["coupons"] is not None
+    return {
+        "cursor": page["started"],
+        "next_page": encode_token(next_page) if more else None,
+        **rows,
+    }
+
+def decode_catalog_page(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parse a ``next_page`` token returned by get_catalog_changes; raises ValueError if malformed."""
+    if not token:
+        return None
+    page = decode_token(token)
+    if not isinstance(page.get("started"), str):
+        raise ValueError("Invalid catalog page")
+    datetime.fromisoformat(page["started"])
+    if any(page.get(key) is not None and not isinstance(page.get(key), int) for key in ("products", "coupons")):
+        raise ValueError("Invalid catalog page")
+    return {"started": page["started"], "products": page.get("products"), "coupons": page.get("coupons")}
+
+def decode_sync_cursor(cursor: Optional[str]) -> Optional[datetime]:
+    """Parse a cursor returned by get_catalog_changes; raises ValueError if malformed."""
+    return datetime.fromisoformat(cursor) if cursor else None
+
+def get_orders(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[POSOrder]:
+    query = db.query(POSOrder).options(*_order_lines)
+    return paginate(query, POSOrder.id, skip=skip, limit=limit, after_id=after_id).all()
+
+def get_orders_by_ids(db: Session, order_ids: List[int]) -> List[POSOrder]:
+    return db.query(POSOrder).options(*_order_lines).filter(POSOrder.id.in_(order_ids)).order_by(POSOrder.id).all()
 
-def get_orders(db: Session, skip: int = 0, limit: int = 100) -> List[POSOrder]:
-    return db.query(POSOrder).offset(skip).limit(limit).all()
+def get_orders_by_idempotency_keys(db: Session, keys: List[str]) -> Dict[str, POSOrder]:
+    if not keys:
+        return {}
+    orders = db.query(POSOrder).options(*_order_lines).filter(POSOrder.idempotency_key.in_(keys)).all()
+    return {order.idempotency_key: order for order in orders}
 
 def get_order(db: Session, order_id: int) -> Optional[POSOrder]:
-    return db.query(POSOrder).filter(POSOrder.id == order_id).first()
+    return db.query(POSOrder).options(*_order_lines).filter(POSOrder.id == order_id).first()
@@ -0,0 +1,85 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.product import Product
+
+# product id -> cached barcode, so stock writes that only know ids can invalidate;
+# entries leave together with their cache entry, so it never outgrows the cache
+_barcodes_by_id: Dict[int, str] = {}
+_ids_lock = threading.Lock()
+
+
+def _forget(barcode: str, snapshot: Dict[str, Any]) -> None:
+    with _ids_lock:
+        # The id may have been re-cached under a new barcode meanwhile
+        if _barcodes_by_id.get(snapshot["id"]) == barcode:
+            del _barcodes_by_id[snapshot["id"]]
+
+
+# Products keyed by barcode, for POS scanning
+barcode_cache = TTLCache(
+    maxsize=settings.BARCODE_CACHE_MAX_SIZE,
+    ttl=settings.BARCODE_CACHE_TTL_SECONDS,
+    on_discard=_forget,
+)
+
+
+def _snapshot(product: Product) -> Dict[str, Any]:
+    return {column.key: getattr(product, column.key) for column in Product.__table__.columns}
+
+
+def _remember(snapshot: Dict[str, Any]) -> None:
+    # Index first: the set may evict, and _forget must find the entry to prune
+    with _ids_lock:
+        _barcodes_by_id[snapshot["id"]] = snapshot["barcode"]
+    barcode_cache.set(snapshot["barcode"], snapshot)
+
+
+async def get_by_barcode(db: AsyncSession, barcode: str) -> Optional[Dict[str, Any]]:
+    """Column values of the product with ``barcode``, served from this worker's cache when possible."""
+    return (await get_by_barcodes(db, [barcode])).get(barcode)
+
+
+async def get_by_barcodes(db: AsyncSession, barcodes: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Look up many barcodes at once; cache misses are fetched in a single query.
+
+    Unknown barcodes are simply absent from the result.
+    """
+    found: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for barcode in dict.fromkeys(barcodes):
+        snapshot = barcode_cache.get(barcode)
+        if snapshot is None:
+            missing.append(barcode)
+        else:
+            found[barcode] = snapshot
+    if missing:
+        for product in await db.scalars(select(Product).where(Product.barcode.in_(missing))):
+            snapshot = _snapshot(product)
+            _remember(snapshot)
+            found[product.barcode] = snapshot
+    return found
+
+
+def invalidate_barcodes(barcodes: Iterable[Optional[str]]) -> None:
+    for barcode in barcodes:
+        if barcode:
+            barcode_cache.invalidate(barcode)
+
+
+def invalidate_products(product_ids: Iterable[int]) -> None:
+    """Drop cached entries for products changed by id only (e.g. POS stock decrements)."""
+    with _ids_lock:
+        barcodes = [_barcodes_by_id.pop(product_id, None) for product_id in product_ids]
+    invalidate_barcodes(barcodes)
+
+
+def clear() -> None:
+    barcode_cache.clear()
+    with _ids_lock:
+        _barcodes_by_id.clear()
@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.social_message import SocialConversation, SocialMessage
+
+
+def store_messages(db: Session, messages: List[Dict[str, Any]]) -> int:
+    """Store parsed webhook messages in one transaction; returns how many were new.
+
+    Messages already stored (Meta redelivers webhooks) are skipped. If another
+    worker wins a race on the same message or conversation, the batch is
+    rolled back and stored message by message instead.
+    """
+    try:
+        return _store(db, messages)
+    except IntegrityError:
+        db.rollback()
+    if len(messages) > 1:
+        return sum(store_messages(db, [message]) for message in messages)
+    try:
+        # The conversation was created concurrently and is visible now
+        return _store(db, messages)
+    except IntegrityError:
+        db.rollback()
+        return 0
+
+
+def _store(db: Session, messages: List[Dict[str, Any]]) -> int:
+    batch: Dict[tuple, Dict[str, Any]] = {}
+    for message in messages:
+        batch.setdefault((message["platform"], message["external_id"]), message)
+    if not batch:
+        return 0
+
+    stored = set(db.execute(
+        select(SocialMessage.platform, SocialMessage.external_id)
+        .where(SocialMessage.external_id.in_({external_id for _, external_id in batch}))
+    ).all())
+    new = sorted((m for key, m in batch.items() if key not in stored), key=lambda m: m["sent_at"])
+    if not new:
+        return 0
+
+    keys = {(m["platform"], m["conversation"]) for m in new}
+    conversations = {
+        (c.platform, c.external_id): c
+        for c in db.scalars(select(SocialConversation).where(
+            SocialConversation.external_id.in_({external_id for _, external_id in keys})
+        ))
+    }
+    for platform, external_id in keys - conversations.keys():
+        conversation = SocialConversation(platform=platform, external_id=external_id, message_count=0)
+        db.add(conversation)
+        conversations[(platform, external_id)] = conversation
+    db.flush()
+
+    rows = []
+    for message in new:
+        conversation = conversations[(message["platform"], message["conversation"])]
+        rows.append({
+            "conversation_id": conversation.id,
+            "platform": message["platform"],
+            "external_id": message["external_id"],
+            "direction": message.get("direction", "in"),
+            "sender_id": message.get("sender_id"),
+            "message_type": message.get("message_type", "text"),
+            "text": message.get("text"),
+            "sent_at": message["sent_at"],
+            "raw": message.get("raw"),
+        })
+        conversation.message_count += 1
+        if conversation.last_message_at is None or message["sent_at"] >= conversation.last_message_at:
+            conversation.last_message_at = message["sent_at"]
+            conversation.last_message_text = message.get("text")
+        if message.get("participant_name"):
+            conversation.participant_name = message["participant_name"]
+
+    db.execute(insert(SocialMessage), rows)
+    db.commit()
+    return len(rows)
+
+
+def get_conversations(db: Session, platform: Optional[str] = None, limit: int = 25, before: Optional[datetime] = None) -> List[SocialConversation]:
+    """Most recently active conversations first, read off the last_message_at index"""
+    query = db.query(SocialConversation).filter(SocialConversation.last_message_at.isnot(None))
+    if platform:
+        query = query.filter(SocialConversation.platform == platform)
+    if before:
+        query = query.filter(SocialConversation.last_message_at < before)
+    return query.order_by(SocialConversation.last_message_at.desc(), SocialConversation.id.desc()).limit(limit).all()
+
+
+def get_conversation(db: Session, platform: str, external_id: str) -> Optional[SocialConversation]:
+    return db.query(SocialConversation).filter(
+        SocialConversation.platform == platform, SocialConversation.external_id == external_id
+    ).first()
+
+
+def get_messages(db: Session, conversation_id: int, limit: int = 25, before: Optional[datetime] = None) -> List[SocialMessage]:
+    """Newest messages of one conversation, read off the (conversation_id, sent_at) index"""
+    query = db.query(SocialMessage).filter(SocialMessage.conversation_id == conversation_id)
+    if before:
+        query = query.filter(SocialMessage.sent_at < before)
+    return query.order_by(SocialMessage.sent_at.desc(), SocialMessage.id.desc()).limit(limit).all()
@@ -1,5 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from app.core.money import ZERO, money
+from app.crud.pagination import paginate
 from app.models.supply_chain import Supplier, InventoryProduct, PurchaseOrder, PurchaseOrderItem
 from app.schemas.supply_chain import SupplierCreate, ProductCreate, PurchaseOrderCreate
 
@@ -17,8 +19,8 @@ def create_supplier(db: Session, supplier: SupplierCreate) -> Supplier:
     db.refresh(db_supplier)
     return db_supplier
 
-def get_suppliers(db: Session, skip: int = 0, limit: int = 100) -> List[Supplier]:
-    return db.query(Supplier).offset(skip).limit(limit).all()
+def get_suppliers(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Supplier]:
+    return paginate(db.query(Supplier), Supplier.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # Product CRUD
 def create_product(db: Session, product: ProductCreate) -> InventoryProduct:
@@ -36,13 +38,13 @@ def create_product(db: Session, product: ProductCreate) -> InventoryProduct:
     db.refresh(db_product)
     return db_product
 
-def get_products(db: Session, skip: int = 0, limit: int = 100) -> List[InventoryProduct]:
-    return db.query(InventoryProduct).offset(skip).limit(limit).all()
+def get_products(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[InventoryProduct]:
+    return paginate(db.query(InventoryProduct), InventoryProduct.id, skip=skip, limit=limit, after_id=after_id).all()
 
 # Purchase Order CRUD
 def create_purchase_order(db: Session, order: PurchaseOrderCreate) -> PurchaseOrder:
     # Calculate total amount
-    total_amount = sum(item.quantity * item.unit_price for item in order.items)
+    total_amount = sum((money(item.unit_price) * item.quantity for item in order.items), ZERO)
     
     db_order = PurchaseOrder(
         supplier_id=order.supplier_id,
@@ -72,5 +74,5 @@ def create_purchase_order(db: Session, order: PurchaseOrderCreate) -> PurchaseOr
     db.refresh(db_order)
     return db_order
 
-def get_purchase_orders(db: Session, skip: int = 0, limit: int = 100) -> List[PurchaseOrder]:
-    return db.query(PurchaseOrder).offset(skip).limit(limit).all()
+def get_purchase_orders(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[PurchaseOrder]:
+    return paginate(db.query(PurchaseOrder), PurchaseOrder.id, skip=skip, limit=limit, after_id=after_id).all()
@@ -1,22 +1,48 @@
 from typing import Any, Dict, Optional, Union, List
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
+from app.crud.pagination import paginate
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
+# Authenticated principals keyed by JWT subject (username)
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
 def get_by_email(db: Session, *, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 def get_by_username(db: Session, *, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
+def get_principal(db: Session, *, username: str) -> Optional[User]:
+    """Resolve the user behind a token subject, serving repeats from the principal cache.
+
+    Cache hits return a detached copy of the user so no query is issued.
+    """
+    snapshot = principal_cache.get(username)
+    if snapshot is not None:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+    user = get_by_username(db, username=username)
+    if user:
+        principal_cache.set(username, {
+            column.key: getattr(user, column.key) for column in User.__table__.columns
+        })
+    return user
+
 def get(db: Session, *, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
-def get_multi(db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+def get_multi(db: Session, *, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[User]:
+    return paginate(db.query(User), User.id, skip=skip, limit=limit, after_id=after_id).all()
 
 def create(db: Session, *, obj_in: UserCreate) -> User:
     db_obj = User(
@@ -37,6 +63,7 @@ def update(db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any
     else:
         update_data = obj_in.model_dump(exclude_unset=True)
     
+    previous_username = db_obj.username
     if "password" in update_data:
         hashed_password = get_password_hash(update_data["password"])
         del update_data["password"]
@@ -48,13 +75,17 @@ def update(db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    principal_cache.invalidate(previous_username)
+    principal_cache.invalidate(db_obj.username)
     return db_obj
 
 def delete(db: Session, *, user_id: int) -> Optional[User]:
     user = get(db, user_id=user_id)
     if user:
+        username = user.username
         db.delete(user)
         db.commit()
+        principal_cache.invalidate(username)
     return user
 
 def authenticate(db: Session, *, username: str, password: str) -> Optional[User]:
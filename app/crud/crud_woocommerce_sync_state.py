@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.woocommerce_sync_state import WooCommerceSyncState
+
+
+def get_state(db: Session, settings_id: int, target: str) -> WooCommerceSyncState:
+    """Get the sync state of a store for one sync target, creating an empty one on first use"""
+    state = db.query(WooCommerceSyncState).filter(
+        WooCommerceSyncState.settings_id == settings_id,
+        WooCommerceSyncState.target == target
+    ).first()
+    if not state:
+        state = WooCommerceSyncState(settings_id=settings_id, target=target)
+        db.add(state)
+        db.commit()
+        db.refresh(state)
+    return state
+
+
+def record_run(db: Session, state: WooCommerceSyncState, watermark: Optional[datetime], reconciled: bool = False) -> WooCommerceSyncState:
+    """Advance the watermark after a successful run; it never moves backwards"""
+    now = datetime.utcnow()
+    if watermark and (state.modified_after is None or watermark > state.modified_after):
+        state.modified_after = watermark
+    state.last_run_at = now
+    if reconciled:
+        state.last_reconciled_at = now
+    db.commit()
+    db.refresh(state)
+    return state
@@ -0,0 +1,197 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.money import from_minor, to_minor
+from app.crud import ledger
+from app.models.finance import Account, AccountPeriodBalance, AccountType, JournalEntry, JournalEntryLine, JournalEntryStatus
+
+BUCKETS = ("month", "quarter", "year")
+
+# Account types whose natural balance is a credit (shown as credit - debit)
+CREDIT_NORMAL = {AccountType.LIABILITY, AccountType.EQUITY, AccountType.REVENUE}
+
+# Debit and credit in cents per (account, month)
+Movements = Dict[Tuple[int, date], List[int]]
+
+
+def _month_end(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def _months(start: date, end: date) -> List[date]:
+    months, month = [], ledger.period_of(start)
+    while month <= end:
+        months.append(month)
+        month = _month_end(month) + timedelta(days=1)
+    return months
+
+
+def bucket_of(month: date, bucket: Optional[str]) -> str:
+    if bucket == "month":
+        return month.strftime("%Y-%m")
+    if bucket == "quarter":
+        return f"{month.year}-Q{(month.month - 1) // 3 + 1}"
+    if bucket == "year":
+        return str(month.year)
+    return "total"
+
+
+def monthly_movements(db: Session, start: date, end: date) -> Movements:
+    """Posted debit and credit per (account, month) between ``start`` and ``end``, inclusive.
+
+    Whole months come from the ``account_period_balances`` rollups, one row
+    per account and month; only the partial months at either edge of the
+    range are aggregated from journal lines, grouped in the database.
+    """
+    movements: Movements = defaultdict(lambda: [0, 0])
+    full, partial = [], []
+    for month in _months(start, end):
+        first, last = max(start, month), min(end, _month_end(month))
+        (full if (first, last) == (month, _month_end(month)) else partial).append((month, first, last))
+
+    if full:
+        rollups = db.execute(
+            select(AccountPeriodBalance.account_id, AccountPeriodBalance.period, AccountPeriodBalance.debit, AccountPeriodBalance.credit)
+            .where(AccountPeriodBalance.period >= full[0][0], AccountPeriodBalance.period <= full[-1][0])
+        )
+        for account_id, period, debit, credit in rollups:
+            movements[(account_id, period)][0] += to_minor(debit)
+            movements[(account_id, period)][1] += to_minor(credit)
+
+    for month, first, last in partial:
+        lines = db.execute(
+            select(JournalEntryLine.account_id, func.sum(JournalEntryLine.debit), func.sum(JournalEntryLine.credit))
+            .join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id)
+            .where(
+                JournalEntry.status == JournalEntryStatus.POSTED,
+                JournalEntry.date >= datetime.combine(first, time.min),
+                JournalEntry.date < datetime.combine(last + timedelta(days=1), time.min),
+            )
+            .group_by(JournalEntryLine.account_id)
+        )
+        for account_id, debit, credit in lines:
+            movements[(account_id, month)][0] += to_minor(debit)
+            movements[(account_id, month)][1] += to_minor(credit)
+    return movements
+
+
+def _accounts(db: Session, types: Optional[set] = None) -> List[Account]:
+    query = db.query(Account).order_by(Account.code)
+    if types:
+        query = query.filter(Account.type.in_([t.value for t in types]))
+    return query.all()
+
+
+def _natural(account_type: str, balance: int) -> int:
+    """``balance`` (debit - credit, in cents) shown on the account's natural side"""
+    return -balance if account_type in CREDIT_NORMAL else balance
+
+
+def _section(accounts: List[Account], amounts: Dict[int, int]) -> dict:
+    natural = {a.id: _natural(a.type, amounts[a.id]) for a in accounts if amounts.get(a.id)}
+    rows = [
+        {"account_id": a.id, "code": a.code, "name": a.name, "amount": from_minor(natural[a.id])}
+        for a in accounts if a.id in natural
+    ]
+    return {"accounts": rows, "total": from_minor(sum(natural.values()))}
+
+
+def trial_balance(db: Session, start: date, end: date) -> dict:
+    """Opening balance, debit and credit movement and closing balance per account for a date range"""
+    opening = ledger.balances_as_of(db, datetime.combine(start, time.min) - timedelta(microseconds=1))
+    movement: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+    for (account_id, _), (debit, credit) in monthly_movements(db, start, end).items():
+        movement[account_id][0] += debit
+        movement[account_id][1] += credit
+
+    rows = []
+    for account in _accounts(db):
+        debit, credit = movement.get(account.id, (0, 0))
+        opening_balance = opening.get(account.id, 0)
+        rows.append({
+            "account_id": account.id,
+            "code": account.code,
+            "name": account.name,
+            "type": account.type,
+            "opening_balance": from_minor(opening_balance),
+            "debit": from_minor(debit),
+            "credit": from_minor(credit),
+            "closing_balance": from_minor(opening_balance + debit - credit),
+        })
+    return {
+        "start": start,
+        "end": end,
+        "accounts": rows,
+        "total_debit": from_minor(sum(debit for debit, _ in movement.values())),
+        "total_credit": from_minor(sum(credit for _, credit in movement.values())),
+    }
+
+
+def income_statement(db: Session, start: date, end: date, bucket: Optional[str] = None) -> dict:
+    """Revenue, expenses and net income for a date range, optionally per month, quarter or year"""
+    revenue_accounts = _accounts(db, {AccountType.REVENUE})
+    expense_accounts = _accounts(db, {AccountType.EXPENSE})
+
+    per_bucket: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    for (account_id, month), (debit, credit) in monthly_movements(db, start, end).items():
+        per_bucket[bucket_of(month, bucket)][account_id] += debit - credit
+
+    periods = []
+    for key in sorted({bucket_of(month, bucket) for month in _months(start, end)}):
+        revenue = _section(revenue_accounts, per_bucket[key])
+        expenses = _section(expense_accounts, per_bucket[key])
+        periods.append({
+            "period": key,
+            "revenue": revenue,
+            "expenses": expenses,
+            "net_income": revenue["total"] - expenses["total"],
+        })
+    return {
+        "start": start,
+        "end": end,
+        "bucket": bucket,
+        "periods": periods,
+        "net_income": sum((period["net_income"] for period in periods), Decimal(0)),
+    }
+
+
+def _balance_sheet_at(db: Session, accounts: Dict[str, List[Account]], as_of: date) -> dict:
+    balances = ledger.balances_as_of(db, datetime.combine(as_of, time.max))
+    # Revenue and expenses not yet closed to equity show up as current earnings
+    earnings = from_minor(-sum(balances.get(a.id, 0) for a in accounts[AccountType.REVENUE] + accounts[AccountType.EXPENSE]))
+    assets = _section(accounts[AccountType.ASSET], balances)
+    liabilities = _section(accounts[AccountType.LIABILITY], balances)
+    equity = _section(accounts[AccountType.EQUITY], balances)
+    total_equity = equity["total"] + earnings
+    return {
+        "as_of": as_of,
+        "assets": assets,
+        "liabilities": liabilities,
+        "equity": {**equity, "current_earnings": earnings, "total": total_equity},
+        "balanced": assets["total"] - liabilities["total"] - total_equity == 0,
+    }
+
+
+def balance_sheet(db: Session, as_of: date, start: Optional[date] = None, bucket: Optional[str] = None) -> dict:
+    """Assets, liabilities and equity as of a date, or at the end of every bucket from ``start``.
+
+    Each sheet reads one snapshot per account plus at most a month of lines.
+    """
+    accounts = {t: _accounts(db, {t}) for t in AccountType}
+    if not bucket or not start:
+        return _balance_sheet_at(db, accounts, as_of)
+
+    ends: Dict[str, date] = {}
+    for month in _months(start, as_of):
+        ends[bucket_of(month, bucket)] = min(_month_end(month), as_of)
+    return {
+        "start": start,
+        "end": as_of,
+        "bucket": bucket,
+        "periods": [{"period": key, **_balance_sheet_at(db, accounts, end)} for key, end in sorted(ends.items())],
+    }
@@ -0,0 +1,236 @@
+from collections import defaultdict
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.money import ZERO, from_minor, to_minor
+from app.models.finance import Account, AccountPeriodBalance, JournalEntry, JournalEntryLine, JournalEntryStatus
+
+
+class LedgerError(ValueError):
+    pass
+
+
+def period_of(moment: datetime) -> date:
+    """The snapshot period (first day of the month) ``moment`` falls in"""
+    return date(moment.year, moment.month, 1)
+
+
+def apply_entries(db: Session, entries: Iterable[JournalEntry]) -> Dict[int, Decimal]:
+    """Apply the lines of newly posted ``entries`` to account balances and period snapshots.
+
+    Line amounts are summed in integer cents per account (and per account
+    and month) in memory first. The affected accounts are then locked in id order, so
+    concurrent postings cannot deadlock, and each balance gets a single
+    UPDATE. Returns the balance change per account. The caller commits.
+
+    Anything with ``date`` and ``lines`` works as an entry, so batch imports
+    can pass the validated ``JournalEntryCreate`` payloads directly.
+    """
+    deltas: Dict[int, int] = defaultdict(int)
+    movements: Dict[Tuple[int, date], List[int]] = defaultdict(lambda: [0, 0])
+    for entry in entries:
+        period = period_of(entry.date)
+        for line in entry.lines:
+            debit, credit = to_minor(line.debit), to_minor(line.credit)
+            deltas[line.account_id] += debit - credit
+            movement = movements[(line.account_id, period)]
+            movement[0] += debit
+            movement[1] += credit
+    if not deltas:
+        return {}
+
+    account_ids = sorted(deltas)
+    locked = db.scalars(
+        select(Account.id).where(Account.id.in_(account_ids)).order_by(Account.id).with_for_update()
+    ).all()
+    missing = set(account_ids) - set(locked)
+    if missing:
+        raise LedgerError(f"Unknown account ids: {sorted(missing)}")
+
+    for account_id in account_ids:
+        db.execute(update(Account).where(Account.id == account_id).values(balance=Account.balance + from_minor(deltas[account_id])))
+    _apply_movements(db, movements)
+    return {account_id: from_minor(delta) for account_id, delta in deltas.items()}
+
+
+def _apply_movements(db: Session, movements: Dict[Tuple[int, date], List[int]]) -> None:
+    account_ids = {account_id for account_id, _ in movements}
+    existing = set(db.execute(
+        select(AccountPeriodBalance.account_id, AccountPeriodBalance.period).where(
+            AccountPeriodBalance.account_id.in_(account_ids),
+            AccountPeriodBalance.period.in_({period for _, period in movements}),
+        )
+    ).all())
+
+    # A new period starts from the closing balance of the account's latest earlier period
+    for account_id, period in sorted(movements.keys() - existing):
+        opening = db.scalar(
+            select(AccountPeriodBalance.closing_balance)
+            .where(AccountPeriodBalance.account_id == account_id, AccountPeriodBalance.period < period)
+            .order_by(AccountPeriodBalance.period.desc()).limit(1)
+        ) or ZERO
+        db.execute(insert(AccountPeriodBalance).values(
+            account_id=account_id, period=period, debit=ZERO, credit=ZERO, closing_balance=opening
+        ))
+
+    for (account_id, period), (debit, credit) in movements.items():
+        db.execute(
+            update(AccountPeriodBalance)
+            .where(AccountPeriodBalance.account_id == account_id, AccountPeriodBalance.period == period)
+            .values(debit=AccountPeriodBalance.debit + from_minor(debit), credit=AccountPeriodBalance.credit + from_minor(credit))
+        )
+        # Back-dated postings carry forward into every later snapshot of the account
+        db.execute(
+            update(AccountPeriodBalance)
+            .where(AccountPeriodBalance.account_id == account_id, AccountPeriodBalance.period >= period)
+            .values(closing_balance=AccountPeriodBalance.closing_balance + from_minor(debit - credit))
+        )
+
+
+def post_entry(db: Session, entry: JournalEntry) -> JournalEntry:
+    """Post a DRAFT entry and apply it to the ledger in one transaction.
+
+    The status flip is a conditional UPDATE, so an entry posted twice at the
+    same time is applied once.
+    """
+    posted = db.execute(
+        update(JournalEntry)
+        .where(JournalEntry.id == entry.id, JournalEntry.status == JournalEntryStatus.DRAFT)
+        .values(status=JournalEntryStatus.POSTED)
+    ).rowcount
+    if not posted:
+        db.rollback()
+        raise LedgerError("Only DRAFT journal entries can be posted")
+    try:
+        apply_entries(db, [entry])
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+def balances_as_of(db: Session, as_of: Optional[datetime] = None, account_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+    """Balance (debit - credit of posted lines) in cents per account at ``as_of``, inclusive.
+
+    Reads the latest snapshot before ``as_of``'s month for each account plus
+    the posted lines of that month up to ``as_of``; without ``as_of`` the
+    maintained ``Account.balance`` is returned. Accounts without activity
+    are left out.
+    """
+    if as_of is None:
+        query = select(Account.id, Account.balance)
+        if account_ids is not None:
+            query = query.where(Account.id.in_(list(account_ids)))
+        return {account_id: to_minor(balance) for account_id, balance in db.execute(query) if balance}
+
+    if isinstance(as_of, date) and not isinstance(as_of, datetime):
+        as_of = datetime.combine(as_of, time.max)
+    period = period_of(as_of)
+
+    latest = select(
+        AccountPeriodBalance.account_id, func.max(AccountPeriodBalance.period).label("period")
+    ).where(AccountPeriodBalance.period < period)
+    lines = select(
+        JournalEntryLine.account_id, func.sum(JournalEntryLine.debit - JournalEntryLine.credit)
+    ).join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id).where(
+        JournalEntry.status == JournalEntryStatus.POSTED,
+        JournalEntry.date >= datetime.combine(period, time.min),
+        JournalEntry.date <= as_of,
+    )
+    if account_ids is not None:
+        account_ids = list(account_ids)
+        latest = latest.where(AccountPeriodBalance.account_id.in_(account_ids))
+        lines = lines.where(JournalEntryLine.account_id.in_(account_ids))
+    latest = latest.group_by(AccountPeriodBalance.account_id).subquery()
+
+    balances: Dict[int, int] = defaultdict(int)
+    for account_id, closing in db.execute(
+        select(AccountPeriodBalance.account_id, AccountPeriodBalance.closing_balance).join(
+            latest,
+            (AccountPeriodBalance.account_id == latest.c.account_id) & (AccountPeriodBalance.period == latest.c.period),
+        )
+    ):
+        balances[account_id] += to_minor(closing)
+    for account_id, movement in db.execute(lines.group_by(JournalEntryLine.account_id)):
+        balances[account_id] += to_minor(movement)
+    return dict(balances)
+
+
+def account_balance(db: Session, account_id: int, as_of: Optional[datetime] = None) -> Decimal:
+    return from_minor(balances_as_of(db, as_of, account_ids=[account_id]).get(account_id, 0))
+
+
+def unbalanced_entries(db: Session, status: Optional[JournalEntryStatus] = JournalEntryStatus.POSTED) -> List[dict]:
+    """Entries whose debits and credits differ, compared exactly in the database.
+
+    With Numeric columns the sums carry no rounding error, so any non-zero
+    difference is a real imbalance.
+    """
+    debit, credit = func.coalesce(func.sum(JournalEntryLine.debit), 0), func.coalesce(func.sum(JournalEntryLine.credit), 0)
+    query = (
+        select(JournalEntry.id, debit, credit)
+        .join(JournalEntryLine, JournalEntryLine.journal_entry_id == JournalEntry.id)
+        .group_by(JournalEntry.id)
+        .having(debit != credit)
+        .order_by(JournalEntry.id)
+    )
+    if status is not None:
+        query = query.where(JournalEntry.status == status)
+    return [
+        {"journal_entry_id": entry_id, "debit": from_minor(to_minor(d)), "credit": from_minor(to_minor(c))}
+        for entry_id, d, c in db.execute(query)
+    ]
+
+
+def rebuild(db: Session) -> Dict[str, int]:
+    """Recompute every account balance and period snapshot from the posted lines.
+
+    For backfilling the snapshots of existing data or repairing drift; lines
+    are aggregated per account and month in the database.
+
+    Safe to run on a live ledger: all accounts are locked in id order, as
+    ``apply_entries`` locks them, before anything is read, so postings wait
+    for the rebuild instead of being lost between its read and its rewrite.
+    Accounts created meanwhile are left alone. Runs in its own transaction.
+    """
+    # End any open transaction so the aggregate below reads a snapshot taken after the locks
+    db.commit()
+    locked = db.scalars(select(Account.id).order_by(Account.id).with_for_update()).all()
+    if not locked:
+        db.commit()
+        return {"accounts": 0, "periods": 0}
+    last_id = locked[-1]
+
+    year = func.extract("year", JournalEntry.date)
+    month = func.extract("month", JournalEntry.date)
+    rows = db.execute(
+        select(JournalEntryLine.account_id, year, month, func.sum(JournalEntryLine.debit), func.sum(JournalEntryLine.credit))
+        .join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id)
+        .where(JournalEntry.status == JournalEntryStatus.POSTED, JournalEntryLine.account_id <= last_id)
+        .group_by(JournalEntryLine.account_id, year, month)
+    ).all()
+
+    snapshots = []
+    balances: Dict[int, int] = defaultdict(int)
+    for account_id, y, m, debit, credit in sorted(rows, key=lambda row: (row[0], int(row[1]), int(row[2]))):
+        debit, credit = to_minor(debit), to_minor(credit)
+        balances[account_id] += debit - credit
+        snapshots.append({
+            "account_id": account_id, "period": date(int(y), int(m), 1),
+            "debit": from_minor(debit), "credit": from_minor(credit), "closing_balance": from_minor(balances[account_id]),
+        })
+
+    db.execute(delete(AccountPeriodBalance).where(AccountPeriodBalance.account_id <= last_id))
+    if snapshots:
+        db.execute(insert(AccountPeriodBalance), snapshots)
+    db.execute(update(Account).where(Account.id <= last_id).values(balance=ZERO))
+    if balances:
+        db.execute(update(Account), [{"id": account_id, "balance": from_minor(balance)} for account_id, balance in balances.items()])
+    db.commit()
+    return {"accounts": len(balances), "periods": len(snapshots)}
@@ -0,0 +1,70 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Exact listing totals keyed by (table, generation, filter signature)
+total_cache = TTLCache(
+    maxsize=settings.LISTING_TOTAL_CACHE_MAX_SIZE,
+    ttl=settings.LISTING_TOTAL_CACHE_TTL_SECONDS,
+)
+
+_generations: Dict[str, int] = defaultdict(int)
+_generations_lock = threading.Lock()
+
+_ESTIMATE_SQL = {
+    "mysql": "SELECT TABLE_ROWS FROM information_schema.TABLES "
+             "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table",
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE relname = :table",
+}
+
+
+def invalidate(table: str) -> None:
+    """Drop every cached total for ``table``.
+
+    Bumping the generation orphans the old keys in one step; they age out of
+    the LRU instead of being scanned for.
+    """
+    with _generations_lock:
+        _generations[table] += 1
+
+
+def _key(table: str, filters: Dict[str, Any]) -> Tuple:
+    return (table, _generations[table], tuple(sorted(filters.items())))
+
+
+async def estimated_row_count(db: AsyncSession, table: str) -> Optional[int]:
+    """Row count from the planner statistics, or None where the dialect has none."""
+    sql = _ESTIMATE_SQL.get(db.bind.dialect.name)
+    if sql is None:
+        return None
+    estimate = await db.scalar(text(sql), {"table": table})
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+async def get_total(
+    db: AsyncSession, query, *, table: str, filters: Dict[str, Any], estimate: bool = False
+) -> Tuple[int, bool]:
+    """Total rows matching ``query`` as ``(total, is_estimate)``.
+
+    ``estimate`` answers unfiltered listings from table statistics without
+    touching the rows. Everything else is an exact COUNT(*) cached per filter
+    signature until the next write to ``table`` or the TTL.
+    """
+    active = {k: v for k, v in filters.items() if v is not None}
+    if estimate and not active:
+        estimated = await estimated_row_count(db, table)
+        if estimated is not None:
+            return estimated, True
+
+    key = _key(table, active)
+    total = total_cache.get(key)
+    if total is None:
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        total_cache.set(key, total)
+    return total, False
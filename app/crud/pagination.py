@@ -0,0 +1,73 @@
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class PageParams:
+    skip: int = 0
+    limit: int = 100
+    after_id: Optional[int] = None
+
+
+def encode_token(payload: Dict[str, Any]) -> str:
+    """Opaque, URL-safe token carrying ``payload``."""
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Inverse of encode_token; raises ValueError for tampered or malformed tokens."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid pagination cursor")
+    return payload
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque token pointing just past ``last_id``."""
+    return encode_token({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """Inverse of encode_cursor; raises ValueError for tampered or malformed tokens."""
+    last_id = decode_token(cursor).get("id")
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid pagination cursor")
+    return last_id
+
+
+def paginate(query, id_column, *, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """Order ``query`` by ``id_column`` and page it.
+
+    With ``after_id`` the page is a keyset seek (``id > after_id``) that uses
+    the primary key index however deep the client pages; otherwise it falls
+    back to OFFSET ``skip``. Works for both ``Query`` and ``select()``.
+    """
+    query = query.order_by(id_column)
+    if after_id is not None:
+        return query.filter(id_column > after_id).limit(limit)
+    return query.offset(skip).limit(limit)
+
+
+def next_cursor(items: List[Any], limit: int) -> Optional[str]:
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(items[-1].id)
+
+
+def with_next_cursor(response: Response, items: List[Any], limit: int) -> List[Any]:
+    """Advertise the cursor for the following page in a response header and return ``items``."""
+    cursor = next_cursor(items, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return items
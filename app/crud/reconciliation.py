@@ -0,0 +1,157 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.money import from_minor, to_minor
+from app.models.finance import BankStatement, JournalEntry, JournalEntryLine, JournalEntryStatus
+
+EXACT = "exact"  # same account, amount and reference
+FUZZY = "fuzzy"  # same account and amount within the date window
+
+
+def _reference(value: Optional[str]) -> Optional[str]:
+    """Reference normalized so that case, spacing and punctuation do not matter"""
+    value = "".join(char for char in value or "" if char.isalnum()).upper()
+    return value or None
+
+
+def reconcile(
+    db: Session,
+    bank_account_id: Optional[int] = None,
+    window_days: Optional[int] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Match unreconciled bank statement lines to posted journal lines on their bank account.
+
+    A statement line matches a journal line on the same account with the
+    same amount (deposits against debits, withdrawals against credits) dated
+    at most ``window_days`` apart. Each journal line is matched once.
+
+    Both sides are read in one query each. The exact pass indexes journal
+    lines by (account, amount, reference) in a dict and takes the
+    closest-dated candidate for each statement line; the fuzzy pass walks each (account, amount)
+    bucket of the remaining lines in date order alongside the statement
+    lines, pairing each with the earliest line still inside its window. No
+    pair of rows is compared outside its bucket.
+
+    Matched statement lines are marked reconciled and linked to their journal
+    line unless ``dry_run`` is set. Returns a match report.
+    """
+    window = timedelta(days=settings.BANK_RECONCILE_WINDOW_DAYS if window_days is None else window_days)
+    query = (
+        select(BankStatement.id, BankStatement.bank_account_id, BankStatement.date, BankStatement.amount, BankStatement.reference)
+        .where(BankStatement.reconciled.isnot(True), BankStatement.bank_account_id.isnot(None))
+        .order_by(BankStatement.date, BankStatement.id)
+    )
+    if bank_account_id is not None:
+        query = query.where(BankStatement.bank_account_id == bank_account_id)
+    statements = db.execute(query).all()
+
+    matches: List[Dict[str, Any]] = []
+    if statements:
+        already_matched = select(BankStatement.matched_journal_line_id).where(BankStatement.matched_journal_line_id.isnot(None))
+        lines = db.execute(
+            select(
+                JournalEntryLine.id, JournalEntryLine.journal_entry_id, JournalEntryLine.account_id,
+                JournalEntryLine.debit, JournalEntryLine.credit, JournalEntry.date, JournalEntry.reference,
+            )
+            .join(JournalEntry, JournalEntryLine.journal_entry_id == JournalEntry.id)
+            .where(
+                JournalEntry.status == JournalEntryStatus.POSTED,
+                JournalEntryLine.account_id.in_({s.bank_account_id for s in statements}),
+                JournalEntry.date >= statements[0].date - window,
+                JournalEntry.date <= statements[-1].date + window,
+                JournalEntryLine.id.notin_(already_matched),
+            )
+            .order_by(JournalEntry.date, JournalEntryLine.id)
+        ).all()
+        matches = _match(statements, lines, window)
+
+    if matches and not dry_run:
+        try:
+            db.execute(update(BankStatement), [
+                {"id": match["statement_id"], "reconciled": True, "matched_journal_line_id": match["journal_line_id"]}
+                for match in matches
+            ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    matched_ids = {match["statement_id"] for match in matches}
+    return {
+        "dry_run": dry_run,
+        "window_days": window.days,
+        "statements": len(statements),
+        "matched": len(matches),
+        "exact": sum(match["method"] == EXACT for match in matches),
+        "fuzzy": sum(match["method"] == FUZZY for match in matches),
+        "unmatched": len(statements) - len(matches),
+        "matches": matches,
+        "unmatched_statement_ids": [s.id for s in statements if s.id not in matched_ids],
+    }
+
+
+def _match(statements: list, lines: list, window: timedelta) -> List[Dict[str, Any]]:
+    """Pair statement rows with journal line rows; both are sorted by date"""
+    # Amounts in cents from the bank's side: a deposit is a debit to the bank account
+    by_reference: Dict[Tuple[int, int, str], list] = defaultdict(list)
+    for line in lines:
+        reference = _reference(line.reference)
+        if reference:
+            by_reference[(line.account_id, to_minor(line.debit) - to_minor(line.credit), reference)].append(line)
+
+    used = set()
+    paired: Dict[int, Tuple[Any, str]] = {}
+    for statement in statements:
+        reference = _reference(statement.reference)
+        if not reference:
+            continue
+        candidates = [
+            line for line in by_reference.get((statement.bank_account_id, to_minor(statement.amount), reference), ())
+            if line.id not in used and abs(line.date - statement.date) <= window
+        ]
+        if candidates:
+            line = min(candidates, key=lambda line: abs(line.date - statement.date))
+            used.add(line.id)
+            paired[statement.id] = (line, EXACT)
+
+    buckets: Dict[Tuple[int, int], list] = defaultdict(list)
+    for line in lines:
+        if line.id not in used:
+            buckets[(line.account_id, to_minor(line.debit) - to_minor(line.credit))].append(line)
+    # Statements come in date order, so each bucket is consumed front to back;
+    # a line older than the current statement's window can match no later one either
+    cursors: Dict[Tuple[int, int], int] = defaultdict(int)
+    for statement in statements:
+        if statement.id in paired:
+            continue
+        key = (statement.bank_account_id, to_minor(statement.amount))
+        bucket = buckets.get(key)
+        if not bucket:
+            continue
+        cursor = cursors[key]
+        while cursor < len(bucket) and bucket[cursor].date < statement.date - window:
+            cursor += 1
+        if cursor < len(bucket) and bucket[cursor].date <= statement.date + window:
+            paired[statement.id] = (bucket[cursor], FUZZY)
+            cursor += 1
+        cursors[key] = cursor
+
+    matches = []
+    for statement in statements:
+        if statement.id in paired:
+            line, method = paired[statement.id]
+            matches.append({
+                "statement_id": statement.id,
+                "journal_line_id": line.id,
+                "journal_entry_id": line.journal_entry_id,
+                "amount": from_minor(to_minor(statement.amount)),
+                "method": method,
+                "days_apart": abs(line.date - statement.date).days,
+            })
+    return matches
@@ -0,0 +1,62 @@
+import re
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import case, literal, or_, select, union
+from sqlalchemy.dialects.mysql import match
+
+# InnoDB ignores FULLTEXT tokens shorter than innodb_ft_min_token_size
+MIN_FULLTEXT_TOKEN = 3
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(term: str) -> List[str]:
+    return _TOKEN.findall(term.lower())
+
+
+def boolean_prefix_query(tokens: Sequence[str]) -> str:
+    """``tea gre`` -> ``+tea* +gre*``: every word required, each as a prefix."""
+    return " ".join(f"+{token}*" for token in tokens)
+
+
+def text_search(query, dialect: str, term: str, text_columns: Sequence, code_column, id_column) -> Tuple[object, List]:
+    """``query`` narrowed to a cashier/typeahead lookup, and its ORDER BY terms.
+
+    ``code_column`` (barcode/SKU) is matched exactly or by prefix so both can
+    use its B-tree index; an exact code hit always ranks first. On MySQL the
+    words are matched against the FULLTEXT index in boolean prefix mode and
+    ranked by relevance. Terms made only of tokens too short for the FULLTEXT
+    index, and other dialects, fall back to a name prefix match that ranks
+    ahead of the plain substring matches.
+
+    MySQL cannot use two indexes for one ``OR``, so there the code prefix and
+    the text match run as separate indexed SELECTs of ``id_column``; ``query``
+    is joined to their UNION instead of filtered by a WHERE clause.
+    """
+    term = term.strip()
+    tokens = tokenize(term)
+    exact_code = case((code_column == term, 1), else_=0)
+    code_prefix = code_column.like(f"{_escape_like(term)}%", escape="\\")
+
+    if dialect == "mysql" and any(len(t) >= MIN_FULLTEXT_TOKEN for t in tokens):
+        words = [t for t in tokens if len(t) >= MIN_FULLTEXT_TOKEN]
+        relevance = match(*text_columns, against=boolean_prefix_query(words)).in_boolean_mode()
+        return _join_matches(query, id_column, code_prefix, relevance), [exact_code.desc(), relevance.desc()]
+
+    name = text_columns[0]
+    name_prefix = name.like(f"{_escape_like(term)}%", escape="\\")
+    if dialect == "mysql":
+        return _join_matches(query, id_column, code_prefix, name_prefix), [exact_code.desc(), name]
+    contains = [column.ilike(f"%{_escape_like(term)}%", escape="\\") for column in (*text_columns, code_column)]
+    prefix_rank = case((name_prefix, 1), else_=literal(0))
+    return query.where(or_(*contains)), [exact_code.desc(), prefix_rank.desc(), name]
+
+
+def _join_matches(query, id_column, *conditions):
+    """Join ``query`` to the ids matching any of ``conditions``, one SELECT each"""
+    matches = union(*(select(id_column).where(condition) for condition in conditions)).subquery("matches")
+    return query.join(matches, id_column == matches.c[id_column.key])
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+
+class PoolStats:
+    """Checkout wait-time counters for one connection pool in this worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    @contextmanager
+    def timing(self):
+        start = time.perf_counter()
+        try:
+            yield
+        except exc.TimeoutError:
+            self.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.record(time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        attempts = self.checkouts + self.timeouts
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    stats = PoolStats()
+
+    def _do_get(self):
+        with self.stats.timing():
+            return super()._do_get()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    stats = PoolStats()
+
+    def _do_get(self):
+        with self.stats.timing():
+            return super()._do_get()
+
+
+def engine_options(database_uri: str, poolclass) -> Dict[str, Any]:
+    """Keyword arguments for create_engine/create_async_engine from Settings."""
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if database_uri.startswith("sqlite"):
+        # SQLite uses its own single-connection pools; sizing does not apply
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def pool_status(pool) -> Dict[str, Any]:
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
+
+
+def worker_pool_report(engine, async_engine) -> Dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "pools": {
+            "sync": pool_status(engine.pool),
+            "async": pool_status(async_engine.pool),
+        },
+    }
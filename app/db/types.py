@@ -0,0 +1,24 @@
+from sqlalchemy.types import Numeric, TypeDecorator
+
+from app.core.money import money
+
+
+class Money(TypeDecorator):
+    """Fixed-point money column: NUMERIC(18, 2) in the database, Decimal in Python.
+
+    Floats and strings are accepted on the way in and rounded to cents, so
+    existing callers that pass floats keep working while sums and equality
+    checks in SQL become exact.
+    """
+
+    impl = Numeric
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(precision=18, scale=2, asdecimal=True)
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else money(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else money(value)
@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_woocommerce_settings
+from app.integrations.daraz_client import DarazAPIClient
+from app.integrations.facebook_client import FacebookClient
+from app.integrations.whatsapp_client import WhatsAppClient
+from app.integrations.woocommerce_client import WooCommerceClient
+
+# One long-lived client per platform and credential set, per worker. The
+# clients hold no per-request state and share their platform's transport, so
+# handing the same instance to concurrent requests is safe.
+_clients: Dict[str, Tuple[Hashable, Any]] = {}
+_lock = threading.Lock()
+
+# Active WooCommerce credentials as last read from the database, with the
+# monotonic time they were read
+_woocommerce_credentials: Optional[Tuple[Optional[Tuple[str, str, str]], float]] = None
+
+
+def _client(platform: str, credentials: Hashable, factory: Callable[[], Any]) -> Any:
+    """The registered client of ``platform``, rebuilt when ``credentials`` change"""
+    with _lock:
+        entry = _clients.get(platform)
+        if entry is None or entry[0] != credentials:
+            entry = _clients[platform] = (credentials, factory())
+        return entry[1]
+
+
+def woocommerce_client(db: Session) -> Optional[WooCommerceClient]:
+    """Client for the active WooCommerce store, or None when none is configured.
+
+    The settings row is re-read at most every ``INTEGRATION_CLIENT_TTL_SECONDS``;
+    ``invalidate`` makes this worker pick up new credentials at once, the TTL
+    bounds how long other workers keep the old ones.
+    """
+    global _woocommerce_credentials
+    cached = _woocommerce_credentials
+    if cached is None or time.monotonic() - cached[1] >= settings.INTEGRATION_CLIENT_TTL_SECONDS:
+        store = crud_woocommerce_settings.get_settings(db)
+        credentials = (store.store_url, store.consumer_key, store.consumer_secret) if store else None
+        cached = _woocommerce_credentials = (credentials, time.monotonic())
+
+    credentials = cached[0]
+    if credentials is None:
+        return None
+    url, consumer_key, consumer_secret = credentials
+    return _client("woocommerce", credentials, lambda: WooCommerceClient(
+        url=url, consumer_key=consumer_key, consumer_secret=consumer_secret
+    ))
+
+
+def daraz_client() -> DarazAPIClient:
+    credentials = (settings.DARAZ_API_URL, settings.DARAZ_APP_KEY, settings.DARAZ_APP_SECRET)
+    return _client("daraz", credentials, DarazAPIClient)
+
+
+def facebook_client() -> FacebookClient:
+    credentials = (settings.FACEBOOK_PAGE_ACCESS_TOKEN, settings.FACEBOOK_PAGE_ID, settings.INSTAGRAM_ACCOUNT_ID)
+    return _client("facebook", credentials, FacebookClient)
+
+
+def whatsapp_client() -> WhatsAppClient:
+    credentials = (settings.WHATSAPP_ACCESS_TOKEN, settings.WHATSAPP_PHONE_NUMBER_ID, settings.WHATSAPP_BUSINESS_ACCOUNT_ID)
+    return _client("whatsapp", credentials, WhatsAppClient)
+
+
+def invalidate(platform: Optional[str] = None) -> None:
+    """Drop the registered client of ``platform`` (all platforms if None)"""
+    global _woocommerce_credentials
+    with _lock:
+        if platform is None:
+            _clients.clear()
+        else:
+            _clients.pop(platform, None)
+        if platform in (None, "woocommerce"):
+            _woocommerce_credentials = None
@@ -2,8 +2,14 @@ import hashlib
 import hmac
 import time
 from typing import Dict, Any, Optional
-import requests
 from app.core.config import settings
+from app.integrations.response_cache import cached_lookup
+from app.integrations.transport import get_transport
+
+
+def _is_success(payload: Dict[str, Any]) -> bool:
+    # Daraz reports errors in the body with HTTP 200; those must not be cached
+    return str(payload.get("code", "0")) == "0"
 
 
 class DarazAPIClient:
@@ -13,6 +19,9 @@ class DarazAPIClient:
         self.app_key = settings.DARAZ_APP_KEY
         self.app_secret = settings.DARAZ_APP_SECRET
         self.api_url = settings.DARAZ_API_URL
+        self.transport = get_transport("daraz")
+        # Lookups are cached per seller account
+        self.cache_scope = (self.api_url, self.app_key)
         
     def _generate_signature(self, params: Dict[str, Any]) -> str:
         """Generate HMAC-SHA256 signature for API request"""
@@ -53,7 +62,7 @@ class DarazAPIClient:
         
         # Make request
         url = f"{self.api_url}?method={api_name}"
-        response = requests.get(url, params=all_params)
+        response = self.transport.request("GET", url, endpoint=api_name, params=all_params)
         response.raise_for_status()
         
         return response.json()
@@ -113,16 +122,19 @@ class DarazAPIClient:
         })
     
     # Category APIs
+    @cached_lookup("daraz.get_category_tree", _is_success)
     def get_category_tree(self) -> Dict[str, Any]:
         """Get category tree"""
         return self._make_request("/category/tree/get")
     
+    @cached_lookup("daraz.get_category_attributes", _is_success)
     def get_category_attributes(self, primary_category_id: int) -> Dict[str, Any]:
         """Get category attributes"""
         return self._make_request("/category/attributes/get", {
             "primary_category_id": primary_category_id
         })
     
+    @cached_lookup("daraz.get_category_brands", _is_success)
     def get_category_brands(self, primary_category_id: int) -> Dict[str, Any]:
         """Get brands for category"""
         return self._make_request("/category/brands/query", {
@@ -139,6 +151,7 @@ class DarazAPIClient:
         return self._make_request("/seller/performance/get")
     
     # Logistics APIs
+    @cached_lookup("daraz.get_shipment_providers", _is_success)
     def get_shipment_providers(self) -> Dict[str, Any]:
         """Get available shipment providers"""
         return self._make_request("/shipment/providers/get")
@@ -1,6 +1,6 @@
-import requests
 from typing import Dict, Any, List, Optional
 from app.core.config import settings
+from app.integrations.transport import get_transport
 
 
 class FacebookClient:
@@ -11,6 +11,7 @@ class FacebookClient:
         self.page_id = settings.FACEBOOK_PAGE_ID
         self.instagram_account_id = settings.INSTAGRAM_ACCOUNT_ID
         self.base_url = "https://graph.facebook.com/v18.0"
+        self.transport = get_transport("facebook")
     
     def _make_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make authenticated request to Facebook Graph API"""
@@ -22,9 +23,9 @@ class FacebookClient:
         url = f"{self.base_url}/{endpoint}"
         
         if method == "GET":
-            response = requests.get(url, params=params)
+            response = self.transport.request("GET", url, endpoint=endpoint, params=params)
         elif method == "POST":
-            response = requests.post(url, params=params, json=data)
+            response = self.transport.request("POST", url, endpoint=endpoint, params=params, json=data)
         else:
             raise ValueError(f"Unsupported method: {method}")
         
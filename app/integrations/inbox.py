@@ -0,0 +1,42 @@
+import asyncio
+import heapq
+from itertools import islice
+from typing import Any, Callable, Dict, List, Tuple
+
+# A source returns a Graph API style page: {"data": [...]} newest first
+InboxSource = Callable[[], Dict[str, Any]]
+
+
+def _updated_time(conversation: Dict[str, Any]) -> str:
+    # Graph API timestamps share one format and offset, so they sort as strings
+    return conversation.get("updated_time", "")
+
+
+async def _fetch(platform: str, source: InboxSource, timeout: float) -> Tuple[str, List[Dict[str, Any]], str]:
+    try:
+        page = await asyncio.wait_for(asyncio.to_thread(source), timeout)
+    except asyncio.TimeoutError:
+        return platform, [], "timeout"
+    except Exception as e:
+        return platform, [], f"error: {e}"
+    conversations = page.get("data", [])
+    for conversation in conversations:
+        conversation["platform"] = platform
+    return platform, conversations, "ok"
+
+
+async def fetch_inbox(sources: Dict[str, InboxSource], limit: int, timeout: float) -> Dict[str, Any]:
+    """Fetch every platform's conversations at once and merge them newest first.
+
+    Each source runs in its own thread with its own ``timeout``, so the
+    inbox takes as long as the slowest platform rather than the sum of all.
+    A platform that times out or fails is reported in ``platforms`` and the
+    others are still returned. Every source is already sorted, so the
+    streams are combined with a k-way merge cut off at ``limit``.
+    """
+    results = await asyncio.gather(*(_fetch(platform, source, timeout) for platform, source in sources.items()))
+    merged = heapq.merge(*(conversations for _, conversations, _ in results), key=_updated_time, reverse=True)
+    return {
+        "data": list(islice(merged, limit)),
+        "platforms": {platform: status for platform, _, status in results},
+    }
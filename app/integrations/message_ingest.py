@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.crud import crud_social_message
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _from_timestamp(seconds: float) -> datetime:
+    return datetime.utcfromtimestamp(seconds)
+
+
+def parse_messenger(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Messages from a Messenger (``object=page``) or Instagram webhook payload.
+
+    Delivery and read receipts are ignored. Echoes of messages the page sent
+    are kept as outgoing messages of the customer's conversation.
+    """
+    platform = "instagram" if body.get("object") == "instagram" else "facebook"
+    messages = []
+    for entry in body.get("entry", []):
+        for event in entry.get("messaging", []):
+            message = event.get("message")
+            if not message or not message.get("mid"):
+                continue
+            sender = event.get("sender", {}).get("id")
+            recipient = event.get("recipient", {}).get("id")
+            outgoing = bool(message.get("is_echo"))
+            attachments = message.get("attachments") or []
+            messages.append({
+                "platform": platform,
+                "conversation": recipient if outgoing else sender,
+                "external_id": message["mid"],
+                "direction": "out" if outgoing else "in",
+                "sender_id": sender,
+                "message_type": "text" if "text" in message else (attachments[0].get("type", "attachment") if attachments else "unknown"),
+                "text": message.get("text"),
+                "sent_at": _from_timestamp(event.get("timestamp", 0) / 1000),
+                "raw": event,
+            })
+    return messages
+
+
+def parse_whatsapp(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Incoming messages from a WhatsApp Business webhook payload; status updates are ignored"""
+    messages = []
+    for entry in body.get("entry", []):
+        for change in entry.get("changes", []):
+            if change.get("field") != "messages":
+                continue
+            value = change.get("value", {})
+            names = {c.get("wa_id"): c.get("profile", {}).get("name") for c in value.get("contacts", [])}
+            for message in value.get("messages", []):
+                message_type = message.get("type", "text")
+                content = message.get(message_type) or {}
+                messages.append({
+                    "platform": "whatsapp",
+                    "conversation": message["from"],
+                    "participant_name": names.get(message["from"]),
+                    "external_id": message["id"],
+                    "direction": "in",
+                    "sender_id": message["from"],
+                    "message_type": message_type,
+                    "text": (content.get("body") or content.get("caption")) if isinstance(content, dict) else None,
+                    "sent_at": _from_timestamp(int(message.get("timestamp", 0))),
+                    "raw": message,
+                })
+    return messages
+
+
+def store_now(messages: List[Dict[str, Any]]) -> int:
+    db = SessionLocal()
+    try:
+        return crud_social_message.store_messages(db, messages)
+    finally:
+        db.close()
+
+
+class MessageIngestQueue:
+    """Buffers webhook messages in memory and writes them to the store in batches.
+
+    Webhook handlers only append to the buffer, so Meta gets its 200 without
+    waiting for the database. A background task flushes up to ``batch_size``
+    messages at a time, at least every ``flush_interval`` seconds.
+
+    A batch that fails on the connection (``OperationalError``) is put back
+    and retried whole. Any other error is blamed on the data: the batch is
+    stored message by message, and a message that keeps failing is moved to
+    the back of the buffer and dropped after ``max_attempts``, so it cannot
+    hold up the messages behind it. Messages still buffered when a worker
+    is killed (not stopped) are lost, so keep ``flush_interval`` short.
+    """
+
+    def __init__(self, batch_size: int = None, flush_interval: float = None, max_pending: int = None, max_attempts: int = None):
+        self.batch_size = batch_size or settings.MESSAGE_INGEST_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.MESSAGE_INGEST_FLUSH_SECONDS
+        self.max_pending = max_pending or settings.MESSAGE_INGEST_MAX_PENDING
+        self.max_attempts = max_attempts or settings.MESSAGE_INGEST_MAX_ATTEMPTS
+        self._attempts: Dict[Tuple[Any, Any], int] = {}
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.stored = 0
+        self.failed_batches = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, messages: List[Dict[str, Any]]) -> bool:
+        """Queue ``messages``; False when the flusher is not running or the buffer is full."""
+        if not self.running or self._stopping:
+            return False
+        with self._lock:
+            if len(self._pending) + len(messages) > self.max_pending:
+                return False
+            self._pending.extend(messages)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wakeup.set()
+        return True
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop accepting messages and write out whatever is still buffered"""
+        if self._task:
+            # Not cancelled: a batch being written must not be dropped halfway
+            self._stopping = True
+            self._wakeup.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._pending:
+            if not await self._flush_batch():
+                break
+
+    async def _flush_loop(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._pending:
+                if not await self._flush_batch():
+                    await asyncio.sleep(self.flush_interval)
+                    break
+
+    def _take(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+
+    def _put_back(self, messages: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._pending.extendleft(reversed(messages))
+
+    async def _flush_batch(self) -> bool:
+        """Write the next batch; False when the database is unreachable and the batch was put back"""
+        batch = self._take()
+        try:
+            self.stored += await asyncio.to_thread(store_now, batch)
+            if self._attempts:
+                for message in batch:
+                    self._attempts.pop(_key(message), None)
+            return True
+        except OperationalError:
+            logger.warning("Storing %d webhook messages failed; retrying", len(batch), exc_info=True)
+            self.failed_batches += 1
+            self._put_back(batch)
+            return False
+        except Exception:
+            logger.warning("Storing %d webhook messages failed; storing them one by one", len(batch), exc_info=True)
+            self.failed_batches += 1
+
+        for index, message in enumerate(batch):
+            try:
+                self.stored += await asyncio.to_thread(store_now, [message])
+                self._attempts.pop(_key(message), None)
+            except OperationalError:
+                self._put_back(batch[index:])
+                return False
+            except Exception:
+                self._reject(message)
+        return True
+
+    def _reject(self, message: Dict[str, Any]) -> None:
+        """Retry a message that failed on its own later, behind the rest of the buffer, or drop it"""
+        key = _key(message)
+        attempts = self._attempts.pop(key, 0) + 1
+        if attempts >= self.max_attempts:
+            self.dropped += 1
+            logger.error("Dropping webhook message %s/%s after %d failed attempts", *key, attempts, exc_info=True)
+            return
+        self._attempts[key] = attempts
+        with self._lock:
+            self._pending.append(message)
+
+
+def _key(message: Dict[str, Any]) -> Tuple[Any, Any]:
+    return message.get("platform"), message.get("external_id")
+
+
+ingest_queue = MessageIngestQueue()
+
+
+async def ingest(messages: List[Dict[str, Any]]) -> None:
+    """Hand webhook messages to the batch writer, or store them inline when it can't take them"""
+    if messages and not ingest_queue.submit(messages):
+        await asyncio.to_thread(store_now, messages)
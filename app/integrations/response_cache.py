@@ -0,0 +1,179 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+# Seconds a lookup is served without asking the platform again. Past that it
+# is still served for up to INTEGRATION_CACHE_STALE_SECONDS while one
+# background refresh runs.
+METHOD_TTLS = {
+    "daraz.get_category_tree": 24 * 3600,
+    "daraz.get_category_attributes": 12 * 3600,
+    "daraz.get_category_brands": 12 * 3600,
+    "daraz.get_shipment_providers": 6 * 3600,
+    "woocommerce.get_categories": 3600,
+}
+
+
+class ResponseCache:
+    """Two-tier cache of read-only marketplace lookups with stale-while-revalidate.
+
+    Entries live in memory per worker and, when ``directory`` is set, as one
+    JSON file per key so a restarted worker starts warm. Ages are wall-clock
+    so they stay meaningful across restarts.
+    """
+
+    def __init__(self, directory: Optional[str] = None, stale_seconds: float = 0.0):
+        self.directory = directory
+        self.stale_seconds = stale_seconds
+        self._memory: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: Hashable) -> str:
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _load(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None or not self.directory:
+            return entry
+        try:
+            with open(self._path(key)) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry = (stored["value"], stored["fetched_at"])
+        with self._lock:
+            self._memory.setdefault(key, entry)
+        return entry
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        entry = (value, time.time())
+        with self._lock:
+            self._memory[key] = entry
+        if self.directory:
+            path = self._path(key)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "w") as f:
+                    json.dump({"value": value, "fetched_at": entry[1]}, f)
+                os.replace(tmp, path)
+            except (OSError, TypeError, ValueError):
+                # The memory tier still has it; a broken disk tier only costs a cold start
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    def fetch(self, key: Hashable, ttl: float, loader: Callable[[], Any],
+              cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        """Return the cached value for ``key``, calling ``loader`` only when needed.
+
+        Fresh entries are returned as is. Entries less than ``stale_seconds``
+        past their TTL are returned at once while a single background thread
+        reloads them. Older or missing entries are loaded inline; if that load
+        fails and any copy exists, the old copy is served instead. Values
+        rejected by ``cacheable`` (error payloads) are returned but not kept.
+        """
+        entry = self._load(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < ttl:
+                self.hits += 1
+                return value
+            if age < ttl + self.stale_seconds:
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader, cacheable)
+                return value
+
+        self.misses += 1
+        try:
+            value = loader()
+        except Exception:
+            if entry is None:
+                raise
+            self.refresh_errors += 1
+            return entry[0]
+        if cacheable(value):
+            self._store(key, value)
+        return value
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Any], cacheable: Callable[[Any], bool]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                if cacheable(value):
+                    self._store(key, value)
+            except Exception:
+                self.refresh_errors += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="response-cache-refresh", daemon=True).start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._memory),
+            "disk": bool(self.directory),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refresh_errors": self.refresh_errors,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache(
+    directory=settings.INTEGRATION_CACHE_DIR or None,
+    stale_seconds=settings.INTEGRATION_CACHE_STALE_SECONDS,
+)
+
+
+def cached_lookup(name: str, cacheable: Callable[[Any], bool] = lambda value: True) -> Callable:
+    """Cache a client method under ``name`` (a ``METHOD_TTLS`` key).
+
+    The key includes the client's ``cache_scope`` (store or seller account),
+    so clients for different accounts never share entries.
+    """
+    ttl = METHOD_TTLS[name]
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (name, self.cache_scope, args, tuple(sorted(kwargs.items())))
+            return response_cache.fetch(key, ttl, lambda: method(self, *args, **kwargs), cacheable)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,295 @@
+import bisect
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+
+# Statuses worth retrying: throttling and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Methods that may be resent after the server has possibly acted on them
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+# Latency histogram bucket upper bounds, in milliseconds
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a platform that has been failing consistently."""
+
+    def __init__(self, platform: str, retry_in: float):
+        super().__init__(f"{platform} circuit open, retry in {retry_in:.0f}s")
+        self.platform = platform
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second with bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, sleep=time.sleep) -> float:
+        """Block until a token is available; returns the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for ``seconds``, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures, then lets one probe through after ``reset_timeout``."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def before_request(self, platform: str) -> None:
+        with self._lock:
+            if self.opened_at is None:
+                return
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.reset_timeout:
+                raise CircuitOpenError(platform, self.reset_timeout - elapsed)
+            # Half open: this caller is the probe, everyone else waits for its outcome
+            self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            self.total += 1
+            self.sum_ms += ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (None above the last bucket)."""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + (None,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.total,
+            "avg_ms": round(self.sum_ms / self.total, 1) if self.total else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS + ("inf",), self.counts)},
+        }
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapse ids out of endpoint paths so histograms stay per endpoint, not per object."""
+    return re.sub(r"/\d+(?=/|$)", "/{id}", endpoint.split("?")[0])
+
+
+class Transport:
+    """Rate-limited, retrying HTTP transport for one external platform.
+
+    All clients of a platform share one instance per worker process, so the
+    token bucket, circuit breaker and connection pool are per platform and
+    per worker; size ``rate`` with the number of workers in mind.
+    """
+
+    def __init__(self, platform: str, rate: float, burst: int, max_retries: Optional[int] = None,
+                 timeout: Optional[float] = None, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 pool_size: int = 10):
+        self.platform = platform
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = settings.INTEGRATION_MAX_RETRIES if max_retries is None else max_retries
+        self.timeout = timeout or settings.INTEGRATION_TIMEOUT_SECONDS
+        self.backoff_base = settings.INTEGRATION_BACKOFF_BASE_SECONDS
+        self.backoff_max = settings.INTEGRATION_BACKOFF_MAX_SECONDS
+        self.sleep = time.sleep
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.retries = 0
+        self.throttled = 0
+        self._stats_lock = threading.Lock()
+
+    def _histogram(self, endpoint: str) -> LatencyHistogram:
+        with self._stats_lock:
+            return self.histograms.setdefault(endpoint_label(endpoint), LatencyHistogram())
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def request(self, method: str, url: str, endpoint: Optional[str] = None, retries: Optional[int] = None,
+                **kwargs) -> requests.Response:
+        """Send a request, waiting for rate-limit tokens and retrying throttled or transient failures.
+
+        429 responses are always retried, after Retry-After when given, and
+        also pause the whole platform's bucket. 5xx responses and read
+        timeouts are only retried for idempotent methods. The last response
+        is returned as is; callers still call ``raise_for_status``.
+        """
+        method = method.upper()
+        retries = self.max_retries if retries is None else retries
+        histogram = self._histogram(endpoint or url)
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(retries + 1):
+            self.breaker.before_request(self.platform)
+            self.bucket.acquire(self.sleep)
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                histogram.observe(time.monotonic() - started)
+                self.breaker.record_failure()
+                # A connect timeout never reached the server, so any method may go again
+                resend = method in IDEMPOTENT_METHODS or isinstance(e, requests.exceptions.ConnectTimeout)
+                if attempt == retries or not resend:
+                    raise
+                self._wait(self.backoff(attempt))
+                continue
+            histogram.observe(time.monotonic() - started)
+
+            if response.status_code == 429:
+                with self._stats_lock:
+                    self.throttled += 1
+                delay = retry_after_seconds(response)
+                delay = self.backoff(attempt) if delay is None else delay
+                self.bucket.pause(delay)
+                if attempt == retries:
+                    return response
+                self._wait(0)
+                continue
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+                if response.status_code in RETRY_STATUSES and method in IDEMPOTENT_METHODS and attempt < retries:
+                    self._wait(retry_after_seconds(response) or self.backoff(attempt))
+                    continue
+                return response
+
+            self.breaker.record_success()
+            return response
+        return response
+
+    def _wait(self, delay: float) -> None:
+        with self._stats_lock:
+            self.retries += 1
+        if delay:
+            self.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            histograms = dict(self.histograms)
+        return {
+            "rate_per_second": self.bucket.rate,
+            "burst": self.bucket.burst,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "endpoints": {endpoint: histogram.snapshot() for endpoint, histogram in histograms.items()},
+        }
+
+
+# Requests per second and burst size per platform, per worker process
+PLATFORM_LIMITS = {
+    "woocommerce": lambda: (settings.WOOCOMMERCE_RATE_LIMIT, max(settings.WOOCOMMERCE_MAX_CONCURRENCY, 5)),
+    "daraz": lambda: (settings.DARAZ_RATE_LIMIT, 5),
+    "facebook": lambda: (settings.FACEBOOK_RATE_LIMIT, 5),
+    "whatsapp": lambda: (settings.WHATSAPP_RATE_LIMIT, 10),
+}
+
+_transports: Dict[str, Transport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(platform: str) -> Transport:
+    """The shared transport of ``platform`` in this worker, created on first use."""
+    with _transports_lock:
+        transport = _transports.get(platform)
+        if transport is None:
+            rate, burst = PLATFORM_LIMITS[platform]()
+            transport = _transports[platform] = Transport(platform, rate=rate, burst=burst, pool_size=max(burst, 10))
+        return transport
+
+
+def transport_report() -> Dict[str, Any]:
+    with _transports_lock:
+        transports = dict(_transports)
+    return {platform: transport.stats() for platform, transport in transports.items()}
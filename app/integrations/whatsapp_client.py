@@ -1,6 +1,6 @@
-import requests
 from typing import Dict, Any, Optional
 from app.core.config import settings
+from app.integrations.transport import get_transport
 
 
 class WhatsAppClient:
@@ -11,6 +11,7 @@ class WhatsAppClient:
         self.phone_number_id = settings.WHATSAPP_PHONE_NUMBER_ID
         self.business_account_id = settings.WHATSAPP_BUSINESS_ACCOUNT_ID
         self.base_url = "https://graph.facebook.com/v18.0"
+        self.transport = get_transport("whatsapp")
     
     def _make_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make authenticated request to WhatsApp Business API"""
@@ -22,9 +23,9 @@ class WhatsAppClient:
         url = f"{self.base_url}/{endpoint}"
         
         if method == "GET":
-            response = requests.get(url, headers=headers, params=params)
+            response = self.transport.request("GET", url, endpoint=endpoint, headers=headers, params=params)
         elif method == "POST":
-            response = requests.post(url, headers=headers, json=data)
+            response = self.transport.request("POST", url, endpoint=endpoint, headers=headers, json=data)
         else:
             raise ValueError(f"Unsupported method: {method}")
         
@@ -102,8 +103,12 @@ class WhatsAppClient:
             files = {'file': f}
             headers = {"Authorization": f"Bearer {self.access_token}"}
             
-            response = requests.post(
+            # The file stream cannot be replayed, so uploads are sent once
+            response = self.transport.request(
+                "POST",
                 f"{self.base_url}/{self.phone_number_id}/media",
+                endpoint="media",
+                retries=0,
                 headers=headers,
                 files=files,
                 data={"messaging_product": "whatsapp", "type": media_type}
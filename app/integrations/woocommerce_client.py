@@ -1,7 +1,13 @@
 import requests
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from requests.auth import HTTPBasicAuth
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from app.core.config import settings
+from app.integrations.response_cache import cached_lookup
+from app.integrations.transport import get_transport
 
 
 class WooCommerceClient:
@@ -14,9 +20,15 @@ class WooCommerceClient:
         self.consumer_secret = consumer_secret or settings.WOOCOMMERCE_CONSUMER_SECRET
         self.api_base = f"{self.url}/wp-json/wc/v3"
         self.auth = HTTPBasicAuth(self.consumer_key, self.consumer_secret)
+        self.max_concurrency = max(1, settings.WOOCOMMERCE_MAX_CONCURRENCY)
+        
+        # Rate limiting, retries and the keep-alive pool are shared by every WooCommerce client
+        self.transport = get_transport("woocommerce")
+        # Lookups are cached per store
+        self.cache_scope = (self.url, self.consumer_key)
     
-    def _make_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make authenticated request to WooCommerce API"""
+    def _send(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None) -> requests.Response:
+        """Make authenticated request to WooCommerce API through the shared transport"""
         url = f"{self.api_base}/{endpoint}"
         
         headers = {
@@ -30,24 +42,21 @@ class WooCommerceClient:
         params["consumer_key"] = self.consumer_key
         params["consumer_secret"] = self.consumer_secret
         
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+        
         try:
-            if method == "GET":
-                response = requests.get(url, params=params, headers=headers, timeout=30)
-            elif method == "POST":
-                response = requests.post(url, params=params, json=data, headers=headers, timeout=30)
-            elif method == "PUT":
-                response = requests.put(url, params=params, json=data, headers=headers, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, params=params, headers=headers, timeout=30)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
+            response = self.transport.request(
+                method, url, endpoint=endpoint, params=params,
+                json=data if method in ("POST", "PUT") else None, headers=headers
+            )
             
             # Log the request for debugging
             print(f"WooCommerce API Request: {method} {url}")
             print(f"Response Status: {response.status_code}")
             
             response.raise_for_status()
-            return response.json()
+            return response
         except requests.exceptions.HTTPError as e:
             print(f"HTTP Error: {e}")
             print(f"Response Text: {response.text}")
@@ -56,6 +65,84 @@ class WooCommerceClient:
             print(f"Request Error: {e}")
             raise
     
+    def _make_request(self, endpoint: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make authenticated request to WooCommerce API"""
+        return self._send(endpoint, method=method, params=params, data=data).json()
+    
+    def close(self) -> None:
+        # The connection pool belongs to the shared transport and outlives this client
+        pass
+    
+    def __enter__(self) -> "WooCommerceClient":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    # Paged collections
+    def iter_pages(self, endpoint: str, per_page: int = 100, params: Optional[Dict] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Yield every page of a collection endpoint, in page order.
+
+        The first page's ``X-WP-TotalPages`` header tells how many pages
+        follow; those are fetched concurrently, at most ``max_concurrency``
+        in flight, so memory stays bounded. Stores that omit the header are
+        walked sequentially until a short page.
+        """
+        def fetch(page: int) -> requests.Response:
+            return self._send(endpoint, params={**(params or {}), "page": page, "per_page": per_page})
+        
+        first = fetch(1)
+        items = first.json()
+        if not items:
+            return
+        yield items
+        total_pages = first.headers.get("X-WP-TotalPages")
+        if total_pages is None:
+            page = 1
+            while len(items) >= per_page:
+                page += 1
+                items = fetch(page).json()
+                if not items:
+                    return
+                yield items
+            return
+        
+        remaining = iter(range(2, int(total_pages) + 1))
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            in_flight = deque(executor.submit(fetch, page) for page in islice(remaining, self.max_concurrency))
+            while in_flight:
+                items = in_flight.popleft().result().json()
+                for page in islice(remaining, 1):
+                    in_flight.append(executor.submit(fetch, page))
+                if items:
+                    yield items
+    
+    def iter_product_pages(self, per_page: int = 100, status: Optional[str] = None, modified_after: Optional[datetime] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Product pages, optionally only products modified after a GMT timestamp"""
+        params = {}
+        if status:
+            params["status"] = status
+        if modified_after:
+            params["modified_after"] = modified_after.replace(tzinfo=None).isoformat(timespec="seconds")
+            params["dates_are_gmt"] = "true"
+        return self.iter_pages("products", per_page=per_page, params=params)
+    
+    def iter_product_ids(self, per_page: int = 100) -> Iterator[int]:
+        """IDs of every product in the store; ``_fields=id`` keeps the payload tiny"""
+        for page in self.iter_pages("products", per_page=per_page, params={"_fields": "id", "status": "any"}):
+            for product in page:
+                yield product["id"]
+    
+    def iter_all_products(self, per_page: int = 100, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Every product in the store, fetched with concurrent page requests"""
+        for page in self.iter_product_pages(per_page=per_page, status=status):
+            yield from page
+    
+    def iter_all_orders(self, per_page: int = 100, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Every order in the store, fetched with concurrent page requests"""
+        for page in self.iter_pages("orders", per_page=per_page, params={"status": status} if status else None):
+            yield from page
+    
     # Product APIs
     def get_products(self, page: int = 1, per_page: int = 10, search: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get list of products"""
@@ -152,6 +239,7 @@ class WooCommerceClient:
         return self._make_request(f"coupons/{coupon_id}", method="DELETE", params=params)
     
     # Category APIs
+    @cached_lookup("woocommerce.get_categories")
     def get_categories(self, page: int = 1, per_page: int = 10) -> List[Dict[str, Any]]:
         """Get list of product categories"""
         params = {"page": page, "per_page": per_page}
@@ -0,0 +1,291 @@
+import hashlib
+import json
+import logging
+import random
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_product, crud_woocommerce_sync_state, listing_totals
+from app.integrations.woocommerce_client import WooCommerceClient
+from app.models.product import Product
+from app.models.woocommerce_product import WooCommerceProduct
+
+# Sync targets, each with its own watermark per store
+LOCAL_PRODUCTS = "local_products"
+INVENTORY = "inventory"
+
+PageCallback = Callable[[Dict[str, Any]], None]
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+
+def latest_modified(woo_products: Iterable[Dict[str, Any]], current: Optional[datetime] = None) -> Optional[datetime]:
+    """Highest ``date_modified_gmt`` in ``woo_products`` (naive UTC), or ``current`` if none is newer."""
+    for woo_product in woo_products:
+        modified = _parse_date(woo_product.get('date_modified_gmt'))
+        if modified and (current is None or modified > current):
+            current = modified
+    return current
+
+
+def product_row(woo_product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a WooCommerce product onto inventory columns; None for products without a name."""
+    if not woo_product.get('name'):
+        return None
+    categories = woo_product.get('categories')
+    images = woo_product.get('images')
+    return {
+        'name': woo_product['name'],
+        'category': categories[0].get('name', 'Uncategorized') if categories else 'Uncategorized',
+        'price': float(woo_product.get('price') or woo_product.get('regular_price') or 0),
+        'stock': woo_product.get('stock_quantity') or 0,
+        'barcode': woo_product.get('sku') or None,
+        'image': images[0].get('src', '') if images else '',
+        'status': 'In Stock' if woo_product.get('stock_status') == 'instock' else 'Out of Stock'
+    }
+
+
+def sync_product_page(db: Session, woo_products: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Upsert one page of WooCommerce products into inventory and commit it.
+
+    Existing products are matched by SKU (barcode) first, then by name, with
+    a single ``IN`` lookup for the whole page. Updates and inserts are each
+    sent as one executemany. Products without a name are counted as skipped,
+    products whose fields cannot be mapped as failed.
+    """
+    rows = []
+    skipped = failed = 0
+    for woo_product in woo_products:
+        try:
+            row = product_row(woo_product)
+        except (TypeError, ValueError, AttributeError, IndexError):
+            logger.warning("Cannot sync WooCommerce product %s (%s)", woo_product.get('id'), woo_product.get('name', 'Unknown'), exc_info=True)
+            failed += 1
+            continue
+        if row is None:
+            skipped += 1
+            continue
+        rows.append((woo_product, row))
+
+    barcodes = {row['barcode'] for _, row in rows if row['barcode']}
+    names = {row['name'] for _, row in rows}
+    by_barcode: Dict[str, Product] = {}
+    by_name: Dict[str, Product] = {}
+    if rows:
+        for product in db.scalars(select(Product).where(or_(Product.barcode.in_(barcodes), Product.name.in_(names)))):
+            if product.barcode:
+                by_barcode[product.barcode] = product
+            by_name.setdefault(product.name, product)
+
+    updates: Dict[int, Dict[str, Any]] = {}
+    inserts: Dict[str, Dict[str, Any]] = {}
+    stale_barcodes = []
+    for woo_product, row in rows:
+        existing = by_barcode.get(row['barcode']) if row['barcode'] else None
+        existing = existing or by_name.get(row['name'])
+        if existing:
+            # Keep the barcode of name-matched products that have no SKU upstream
+            row['barcode'] = row['barcode'] or existing.barcode
+            updates[existing.id] = {'id': existing.id, **row}
+            stale_barcodes.append(existing.barcode)
+        else:
+            # Generate random barcode: REON-{product_id}-{random_4_digits}
+            row['barcode'] = row['barcode'] or f"REON-{woo_product['id']}-{random.randint(1000, 9999)}"
+            inserts[row['barcode']] = row
+
+    if updates:
+        db.execute(update(Product), list(updates.values()))
+    if inserts:
+        db.execute(insert(Product), list(inserts.values()))
+    db.commit()
+
+    listing_totals.invalidate(Product.__tablename__)
+    crud_product.invalidate_barcodes(stale_barcodes + [row['barcode'] for row in updates.values()])
+    crud_product.invalidate_products(updates)
+    return {"synced": len(inserts), "updated": len(updates), "skipped": skipped, "failed": failed}
+
+
+def sync_products(db: Session, client: WooCommerceClient, per_page: int = 100, modified_after: Optional[datetime] = None, on_page: Optional[PageCallback] = None) -> Dict[str, Any]:
+    """Stream the WooCommerce catalog into inventory, committing page by page.
+
+    Memory is bounded by the pages the client has in flight, not the catalog
+    size. If a page fails, the pages before it stay committed and the error
+    propagates. ``watermark`` in the result is the newest modification seen.
+    ``on_page`` receives the running totals after each committed page.
+    """
+    pages = client.iter_product_pages(per_page=per_page, modified_after=modified_after)
+    return _stream(db, pages, sync_product_page, ("synced", "updated", "skipped", "failed"), on_page)
+
+
+def content_hash(product_data: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(product_data, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+
+def local_product_row(product_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a WooCommerce product onto the local ``woocommerce_products`` mirror"""
+    raw = json.dumps(product_data, separators=(',', ':'))
+    compress = settings.WOOCOMMERCE_COMPRESS_RAW_DATA
+    return {
+        'woo_id': product_data['id'],
+        'name': product_data['name'],
+        'slug': product_data['slug'],
+        'permalink': product_data['permalink'],
+        'type': product_data['type'],
+        'status': product_data['status'],
+        'featured': product_data.get('featured', False),
+        'catalog_visibility': product_data.get('catalog_visibility', 'visible'),
+        'description': product_data.get('description', ''),
+        'short_description': product_data.get('short_description', ''),
+        'sku': product_data.get('sku', ''),
+        'price': float(product_data.get('price', 0) or 0),
+        'regular_price': float(product_data.get('regular_price', 0) or 0),
+        'sale_price': float(product_data.get('sale_price', 0) or 0) if product_data.get('sale_price') else None,
+        'manage_stock': product_data.get('manage_stock', False),
+        'stock_quantity': product_data.get('stock_quantity'),
+        'stock_status': product_data.get('stock_status', 'instock'),
+        'image_url': product_data['images'][0]['src'] if product_data.get('images') else None,
+        'category_ids': ','.join([str(cat['id']) for cat in product_data.get('categories', [])]),
+        'date_created': _parse_date(product_data.get('date_created')),
+        'date_modified': _parse_date(product_data.get('date_modified')),
+        'raw_data': None if compress else raw,
+        'raw_data_compressed': zlib.compress(raw.encode()) if compress else None,
+        'content_hash': content_hash(product_data),
+        'synced_at': datetime.utcnow(),
+    }
+
+
+def sync_local_product_page(db: Session, woo_products: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Upsert one page into the local WooCommerce mirror, keyed by ``woo_id``, and commit it.
+
+    Products whose content hash matches the stored one are skipped without
+    any write. The rest go out as a single multi-row upsert (ON DUPLICATE
+    KEY UPDATE on MySQL, ON CONFLICT on SQLite/PostgreSQL); other databases
+    get one executemany of updates by primary key and one of inserts.
+    """
+    rows = {product_data['id']: local_product_row(product_data) for product_data in woo_products}
+    stored = {woo_id: (product_id, stored_hash) for woo_id, product_id, stored_hash in db.execute(
+        select(WooCommerceProduct.woo_id, WooCommerceProduct.id, WooCommerceProduct.content_hash)
+        .where(WooCommerceProduct.woo_id.in_(rows))
+    )} if rows else {}
+
+    changed = [row for woo_id, row in rows.items() if woo_id not in stored or stored[woo_id][1] != row['content_hash']]
+    if changed:
+        upsert = _upsert(db.bind.dialect.name, changed)
+        if upsert is not None:
+            db.execute(upsert)
+        else:
+            updates = [{'id': stored[row['woo_id']][0], **row} for row in changed if row['woo_id'] in stored]
+            inserts = [row for row in changed if row['woo_id'] not in stored]
+            if updates:
+                db.execute(update(WooCommerceProduct), updates)
+            if inserts:
+                db.execute(insert(WooCommerceProduct), inserts)
+    db.commit()
+    updated = sum(1 for row in changed if row['woo_id'] in stored)
+    return {"synced": len(changed) - updated, "updated": updated, "unchanged": len(rows) - len(changed)}
+
+
+def _upsert(dialect: str, rows: List[Dict[str, Any]]):
+    """Native multi-row upsert of ``rows`` for ``dialect``, or None if it has none"""
+    table = WooCommerceProduct.__table__
+    columns = [key for key in rows[0] if key != 'woo_id']
+    if dialect == 'mysql':
+        stmt = mysql_insert(table).values(rows)
+        return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in columns})
+    if dialect in ('sqlite', 'postgresql'):
+        dialect_insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        stmt = dialect_insert(table).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=['woo_id'], set_={column: stmt.excluded[column] for column in columns}
+        )
+    return None
+
+
+def sync_local_products(db: Session, client: WooCommerceClient, per_page: int = 100, modified_after: Optional[datetime] = None, on_page: Optional[PageCallback] = None) -> Dict[str, Any]:
+    """Stream WooCommerce products into the local mirror, committing page by page"""
+    pages = client.iter_product_pages(per_page=per_page, modified_after=modified_after)
+    return _stream(db, pages, sync_local_product_page, ("synced", "updated", "unchanged"), on_page)
+
+
+def _stream(db: Session, pages: Iterable[List[Dict[str, Any]]], sync_page, counters, on_page: Optional[PageCallback] = None) -> Dict[str, Any]:
+    totals: Dict[str, Any] = {"total_woocommerce_products": 0, "pages": 0, **dict.fromkeys(counters, 0)}
+    watermark = None
+    for woo_products in pages:
+        counts = sync_page(db, woo_products)
+        watermark = latest_modified(woo_products, watermark)
+        totals["total_woocommerce_products"] += len(woo_products)
+        totals["pages"] += 1
+        for key, value in counts.items():
+            totals[key] += value
+        if on_page:
+            on_page(totals)
+    totals["watermark"] = watermark
+    return totals
+
+
+def reconcile_local_products(db: Session, client: WooCommerceClient, per_page: int = 100, on_page: Optional[Callable[[int], None]] = None) -> int:
+    """Delete mirrored products that no longer exist in the store.
+
+    Only product IDs are downloaded. ``on_page`` receives the number of IDs
+    read so far after every full page, so a job can heartbeat through a long
+    listing. Returns the number of rows removed.
+    """
+    remote_ids = set()
+    for read, woo_id in enumerate(client.iter_product_ids(per_page=per_page), 1):
+        remote_ids.add(woo_id)
+        if on_page and read % per_page == 0:
+            on_page(read)
+    if not remote_ids:
+        # An empty listing is more likely a misconfigured store than a wiped catalog
+        return 0
+    local_ids = db.scalars(select(WooCommerceProduct.woo_id)).all()
+    gone = [woo_id for woo_id in local_ids if woo_id not in remote_ids]
+    for start in range(0, len(gone), 1000):
+        db.execute(delete(WooCommerceProduct).where(WooCommerceProduct.woo_id.in_(gone[start:start + 1000])))
+    db.commit()
+    return len(gone)
+
+
+def run_incremental_sync(db: Session, client: WooCommerceClient, settings_id: int, target: str, full: bool = False, on_page: Optional[PageCallback] = None, per_page: int = 100) -> Dict[str, Any]:
+    """Sync only products changed since this store's last successful run of ``target``.
+
+    ``full`` ignores the watermark. The saved watermark is capped at the run's
+    start minus ``WOOCOMMERCE_WATERMARK_MARGIN_SECONDS``: pages are fetched
+    concurrently, so a product edited mid-run on a page already fetched can be
+    older than the newest timestamp seen, and must still be picked up next run. The local mirror is also reconciled
+    against the store's product IDs on full runs and whenever the last
+    reconciliation is older than ``WOOCOMMERCE_RECONCILE_INTERVAL_HOURS``;
+    inventory rows are never deleted, since they may exist only locally.
+    """
+    state = crud_woocommerce_sync_state.get_state(db, settings_id=settings_id, target=target)
+    since = None if full or state.modified_after is None else state.modified_after - timedelta(seconds=1)
+    sync = sync_local_products if target == LOCAL_PRODUCTS else sync_products
+    ceiling = datetime.utcnow() - timedelta(seconds=settings.WOOCOMMERCE_WATERMARK_MARGIN_SECONDS)
+    totals = sync(db, client, per_page=per_page, modified_after=since, on_page=on_page)
+
+    reconciled = False
+    if target == LOCAL_PRODUCTS:
+        due = datetime.utcnow() - timedelta(hours=settings.WOOCOMMERCE_RECONCILE_INTERVAL_HOURS)
+        if full or state.last_reconciled_at is None or state.last_reconciled_at < due:
+            totals["deleted"] = reconcile_local_products(db, client, on_page=(lambda _: on_page(totals)) if on_page else None)
+            reconciled = True
+
+    watermark = totals.pop("watermark")
+    if watermark and watermark > ceiling:
+        watermark = ceiling
+    state = crud_woocommerce_sync_state.record_run(db, state, watermark=watermark, reconciled=reconciled)
+    totals["incremental"] = since is not None
+    totals["modified_after"] = state.modified_after
+    return totals
@@ -0,0 +1,10 @@
+from typing import Any, Dict
+from app.crud import ledger
+from app.jobs.registry import JobContext, register
+
+REBUILD_LEDGER = "finance.rebuild_ledger"
+
+
+@register(REBUILD_LEDGER)
+def rebuild_ledger(ctx: JobContext) -> Dict[str, Any]:
+    return ledger.rebuild(ctx.db)
@@ -0,0 +1,32 @@
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from app.crud import crud_job
+from app.models.job import Job
+
+# Job type -> handler(ctx) returning a JSON-serialisable result
+HANDLERS: Dict[str, Callable[["JobContext"], Any]] = {}
+
+
+def register(job_type: str):
+    def decorator(handler: Callable[["JobContext"], Any]):
+        HANDLERS[job_type] = handler
+        return handler
+    return decorator
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """What a handler gets to see of its job: the session, the params and a progress hook."""
+
+    def __init__(self, db: Session, job: Job):
+        self.db = db
+        self.job = job
+        self.params: Dict[str, Any] = job.params or {}
+
+    def progress(self, done: int, message: Optional[str] = None) -> None:
+        """Report progress; raises JobCancelled when a cancel was requested meanwhile."""
+        if crud_job.report_progress(self.db, self.job.id, done, message):
+            raise JobCancelled()
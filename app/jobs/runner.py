@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+from typing import List, Optional
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import settings
+from app.crud import crud_job
+from app.db.session import SessionLocal
+from app.jobs.registry import HANDLERS, JobCancelled, JobContext
+from app.models.job import Job
+
+# Importing the handler modules registers their job types
+import app.jobs.finance  # noqa
+import app.jobs.woocommerce  # noqa
+
+logger = logging.getLogger(__name__)
+
+
+class Heartbeat:
+    """Keeps a running job's heartbeat fresh from a side thread and its own session.
+
+    Handlers that spend minutes in one statement or one transaction (a ledger
+    rebuild, a long listing pass) cannot report progress, and committing the
+    handler's session to heartbeat would end their transaction early. Without
+    this, ``requeue_stale`` on a starting worker would requeue them mid-run.
+    """
+
+    def __init__(self, db: Session, job_id: int, interval: float = None):
+        self.job_id = job_id
+        self.interval = interval or settings.JOB_STALE_AFTER_SECONDS / 4
+        self._session = sessionmaker(bind=db.get_bind())
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"job-{job_id}-heartbeat", daemon=True)
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            db = self._session()
+            try:
+                crud_job.heartbeat(db, self.job_id)
+            except Exception:
+                logger.warning("Heartbeat for job %s failed", self.job_id, exc_info=True)
+            finally:
+                db.close()
+
+
+def run_job(db: Session, job: Job) -> Job:
+    """Execute a claimed job and record its outcome (success, retry/failure or cancellation)."""
+    handler = HANDLERS.get(job.type)
+    if handler is None:
+        job.attempts = job.max_attempts
+        return crud_job.mark_failed(db, job, f"Unknown job type: {job.type}")
+    try:
+        with Heartbeat(db, job.id):
+            result = handler(JobContext(db, job))
+    except JobCancelled:
+        db.rollback()
+        return crud_job.mark_cancelled(db, job)
+    except Exception as e:
+        db.rollback()
+        logger.exception("Job %s (%s) failed", job.id, job.type)
+        return crud_job.mark_failed(db, job, f"{type(e).__name__}: {e}")
+    return crud_job.mark_succeeded(db, job, result)
+
+
+def run_next(worker_id: str) -> bool:
+    """Claim and run one due job; returns False when the queue was empty."""
+    db = SessionLocal()
+    try:
+        job = crud_job.claim_next(db, worker_id)
+        if job is None:
+            return False
+        run_job(db, job)
+        return True
+    finally:
+        db.close()
+
+
+class JobRunner:
+    """Polls the jobs table from inside the event loop; handlers run on worker threads.
+
+    Every gunicorn worker may run one of these. Claims are atomic, so a job is
+    executed by exactly one of them, and no broker is involved.
+    """
+
+    def __init__(self, concurrency: int = None, poll_interval: float = None):
+        self.concurrency = concurrency or settings.JOB_CONCURRENCY
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    async def start(self) -> None:
+        stale_after = timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+        await asyncio.to_thread(self._requeue_stale, stale_after)
+        self._tasks = [asyncio.create_task(self._work(slot)) for slot in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, slot: int) -> None:
+        worker_id = f"{self.worker_id}/{slot}"
+        while not self._stopping:
+            try:
+                worked = await asyncio.to_thread(run_next, worker_id)
+            except Exception:
+                logger.exception("Job worker %s could not claim or run a job", worker_id)
+                worked = False
+            if not worked:
+                await asyncio.sleep(self.poll_interval)
+
+    @staticmethod
+    def _requeue_stale(stale_after: timedelta) -> None:
+        db = SessionLocal()
+        try:
+            crud_job.requeue_stale(db, stale_after)
+        finally:
+            db.close()
+
+
+async def main() -> None:
+    runner = JobRunner()
+    await runner.start()
+    try:
+        await asyncio.gather(*runner._tasks)
+    finally:
+        await runner.stop()
+
+
+if __name__ == "__main__":
+    # Dedicated worker process: python -m app.jobs.runner (set JOB_RUNNER_ENABLED=false on the API)
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+from typing import Any, Dict
+from fastapi.encoders import jsonable_encoder
+from app.crud import crud_woocommerce_settings
+from app.integrations import woocommerce_sync
+from app.integrations.woocommerce_client import WooCommerceClient
+from app.jobs.registry import JobContext, register
+
+SYNC_INVENTORY = "woocommerce.sync_inventory"
+SYNC_LOCAL_PRODUCTS = "woocommerce.sync_local_products"
+
+
+def _sync(ctx: JobContext, target: str) -> Dict[str, Any]:
+    store = crud_woocommerce_settings.get_settings(ctx.db)
+    if not store:
+        raise RuntimeError("WooCommerce settings not configured")
+
+    def on_page(totals: Dict[str, Any]) -> None:
+        ctx.progress(totals["pages"], f"{totals['total_woocommerce_products']} products processed")
+
+    with WooCommerceClient(url=store.store_url, consumer_key=store.consumer_key, consumer_secret=store.consumer_secret) as client:
+        totals = woocommerce_sync.run_incremental_sync(
+            ctx.db, client, settings_id=store.id, target=target, full=ctx.params.get("full", False), on_page=on_page
+        )
+    return jsonable_encoder(totals)
+
+
+@register(SYNC_INVENTORY)
+def sync_inventory(ctx: JobContext) -> Dict[str, Any]:
+    return _sync(ctx, woocommerce_sync.INVENTORY)
+
+
+@register(SYNC_LOCAL_PRODUCTS)
+def sync_local_products(ctx: JobContext) -> Dict[str, Any]:
+    return _sync(ctx, woocommerce_sync.LOCAL_PRODUCTS)
@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 from app.core.config import settings
+from app.integrations.message_ingest import ingest_queue
+from app.jobs.runner import JobRunner
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    runner = JobRunner() if settings.JOB_RUNNER_ENABLED else None
+    if runner:
+        await runner.start()
+    await ingest_queue.start()
+    yield
+    await ingest_queue.stop()
+    if runner:
+        await runner.stop()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Configure CORS - Allow all origins for development
@@ -15,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
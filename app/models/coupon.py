@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime
+from sqlalchemy.sql import func
 from app.db.base import Base
 
 
@@ -12,3 +13,4 @@ class Coupon(Base):
     min_purchase = Column(Float, default=0)
     expiry_date = Column(Date, nullable=True)
     is_active = Column(Boolean, default=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Enum, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 from app.db.base import Base
+from app.db.types import Money
 
 class AccountType(str, enum.Enum):
     ASSET = "ASSET"
@@ -17,7 +18,7 @@ class Account(Base):
     name = Column(String, nullable=False)
     type = Column(String, nullable=False) # Storing Enum as String for simplicity in SQLite/Postgres compatibility if needed, but here we use String
     description = Column(String, nullable=True)
-    balance = Column(Float, default=0.0)
+    balance = Column(Money(), default=0)
     
     transaction_lines = relationship("JournalEntryLine", back_populates="account")
 
@@ -27,6 +28,9 @@ class JournalEntryStatus(str, enum.Enum):
 
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
+    __table_args__ = (
+        Index("ix_journal_entries_status_date", "status", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(DateTime, default=datetime.utcnow)
@@ -38,17 +42,40 @@ class JournalEntry(Base):
 
 class JournalEntryLine(Base):
     __tablename__ = "journal_entry_lines"
+    __table_args__ = (
+        Index("ix_journal_entry_lines_journal_entry_id", "journal_entry_id"),
+        Index("ix_journal_entry_lines_account_id", "account_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     journal_entry_id = Column(Integer, ForeignKey("journal_entries.id"))
     account_id = Column(Integer, ForeignKey("account.id"))
-    debit = Column(Float, default=0.0)
-    credit = Column(Float, default=0.0)
+    debit = Column(Money(), default=0)
+    credit = Column(Money(), default=0)
     description = Column(String, nullable=True)
     
     journal_entry = relationship("JournalEntry", back_populates="lines")
     account = relationship("Account", back_populates="transaction_lines")
 
+class AccountPeriodBalance(Base):
+    """Posted movement of one account in one month, plus its balance at month end.
+
+    Maintained by ``app.crud.ledger`` whenever entries are posted, so balances
+    as of any date need one snapshot per account and at most a month of lines.
+    """
+    __tablename__ = "account_period_balances"
+    __table_args__ = (
+        UniqueConstraint("account_id", "period", name="uq_account_period_balances_account_period"),
+        Index("ix_account_period_balances_period", "period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("account.id"), nullable=False)
+    period = Column(Date, nullable=False) # first day of the month
+    debit = Column(Money(), default=0, nullable=False)
+    credit = Column(Money(), default=0, nullable=False)
+    closing_balance = Column(Money(), default=0, nullable=False) # debit - credit of all posted lines up to the end of the period
+
 class APInvoice(Base):
     __tablename__ = "ap_invoices"
 
@@ -57,7 +84,7 @@ class APInvoice(Base):
     supplier_id = Column(Integer, ForeignKey("supplier.id"))
     date = Column(DateTime, default=datetime.utcnow)
     due_date = Column(DateTime, nullable=True)
-    total_amount = Column(Float, nullable=False)
+    total_amount = Column(Money(), nullable=False)
     status = Column(String, default="DRAFT") # DRAFT, POSTED, PAID
     
     # supplier = relationship("Supplier") # Assuming Supplier is in another module, might need import or string reference if not in same Base
@@ -73,16 +100,21 @@ class ARInvoice(Base):
     customer_id = Column(Integer, ForeignKey("customer.id"))
     date = Column(DateTime, default=datetime.utcnow)
     due_date = Column(DateTime, nullable=True)
-    total_amount = Column(Float, nullable=False)
+    total_amount = Column(Money(), nullable=False)
     status = Column(String, default="DRAFT") # DRAFT, POSTED, PAID
 
 class BankStatement(Base):
     __tablename__ = "bank_statements"
+    __table_args__ = (
+        Index("ix_bank_statements_account_reconciled_date", "bank_account_id", "reconciled", "date"),
+        UniqueConstraint("matched_journal_line_id", name="uq_bank_statements_matched_journal_line_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     bank_account_id = Column(Integer, ForeignKey("account.id")) # Link to GL Account for Bank
     date = Column(DateTime, default=datetime.utcnow)
     reference = Column(String, nullable=True)
     description = Column(String, nullable=True)
-    amount = Column(Float, nullable=False) # Positive for deposit, Negative for withdrawal
+    amount = Column(Money(), nullable=False) # Positive for deposit, Negative for withdrawal
     reconciled = Column(Boolean, default=False)
+    matched_journal_line_id = Column(Integer, ForeignKey("journal_entry_lines.id"), nullable=True) # set by the reconciliation matcher
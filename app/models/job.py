@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Index, UniqueConstraint
+from datetime import datetime
+import enum
+from app.db.base import Base
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        UniqueConstraint("active_key", name="uq_jobs_active_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    type = Column(String(100), nullable=False)
+    params = Column(JSON)
+    status = Column(String(20), default=JobStatus.QUEUED, nullable=False)
+    active_key = Column(String(64), nullable=True) # digest of type and params while queued or running; NULL once finished
+
+    progress = Column(Integer, default=0) # units of work done, e.g. pages synced
+    progress_message = Column(String(255))
+    result = Column(JSON)
+    error = Column(Text)
+
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow) # retries are pushed back with exponential backoff
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    locked_by = Column(String(100)) # runner that claimed the job
+
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
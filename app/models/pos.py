@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Boolean
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 from app.db.base import Base
+from app.db.types import Money
 
 class SessionStatus(str, enum.Enum):
     OPEN = "OPEN"
@@ -19,8 +20,8 @@ class POSSession(Base):
     start_time = Column(DateTime, default=datetime.utcnow)
     end_time = Column(DateTime, nullable=True)
     status = Column(String, default=SessionStatus.OPEN)
-    opening_cash = Column(Float, default=0.0)
-    closing_cash = Column(Float, nullable=True)
+    opening_cash = Column(Money(), default=0)
+    closing_cash = Column(Money(), nullable=True)
     
     user = relationship("User")
     orders = relationship("POSOrder", back_populates="session")
@@ -29,9 +30,10 @@ class POSOrder(Base):
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("possession.id"), nullable=False)
     customer_id = Column(Integer, ForeignKey("customer.id"), nullable=True)
-    total_amount = Column(Float, default=0.0)
+    total_amount = Column(Money(), default=0)
     status = Column(String, default="COMPLETED")
     created_at = Column(DateTime, default=datetime.utcnow)
+    idempotency_key = Column(String(64), unique=True, index=True, nullable=True) # Client-generated, makes terminal retries safe
     
     session = relationship("POSSession", back_populates="orders")
     customer = relationship("Customer")
@@ -43,8 +45,8 @@ class POSOrderItem(Base):
     order_id = Column(Integer, ForeignKey("posorder.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, default=1)
-    unit_price = Column(Float, nullable=False)
-    subtotal = Column(Float, nullable=False)
+    unit_price = Column(Money(), nullable=False)
+    subtotal = Column(Money(), nullable=False)
     
     order = relationship("POSOrder", back_populates="items")
     product = relationship("Product")
@@ -52,7 +54,7 @@ class POSOrderItem(Base):
 class Payment(Base):
     id = Column(Integer, primary_key=True, index=True)
     order_id = Column(Integer, ForeignKey("posorder.id"), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money(), nullable=False)
     method = Column(String, default=PaymentMethod.CASH)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.base import Base
+
+class SocialConversation(Base):
+    __tablename__ = "social_conversations"
+    __table_args__ = (
+        UniqueConstraint("platform", "external_id", name="uq_social_conversations_platform_external_id"),
+        Index("ix_social_conversations_platform_last_message_at", "platform", "last_message_at"),
+        Index("ix_social_conversations_last_message_at", "last_message_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    platform = Column(String(20), nullable=False) # facebook, instagram, whatsapp
+    external_id = Column(String(100), nullable=False) # customer's PSID / IGSID / WhatsApp number
+    participant_name = Column(String(255))
+    last_message_text = Column(Text)
+    last_message_at = Column(DateTime)
+    message_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    messages = relationship("SocialMessage", back_populates="conversation")
+
+class SocialMessage(Base):
+    __tablename__ = "social_messages"
+    __table_args__ = (
+        # Meta redelivers webhooks; the platform message id makes ingestion idempotent
+        UniqueConstraint("platform", "external_id", name="uq_social_messages_platform_external_id"),
+        Index("ix_social_messages_conversation_sent_at", "conversation_id", "sent_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    conversation_id = Column(Integer, ForeignKey("social_conversations.id"), nullable=False)
+    platform = Column(String(20), nullable=False)
+    external_id = Column(String(255), nullable=False) # mid / wamid
+    direction = Column(String(10), nullable=False, default="in") # in, out
+    sender_id = Column(String(100))
+    message_type = Column(String(30), default="text")
+    text = Column(Text)
+    sent_at = Column(DateTime, nullable=False)
+    raw = Column(JSON)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    conversation = relationship("SocialConversation", back_populates="messages")
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
+from app.db.types import Money
 
 class Supplier(Base):
     id = Column(Integer, primary_key=True, index=True)
@@ -34,7 +35,7 @@ class PurchaseOrder(Base):
     date = Column(DateTime, default=datetime.utcnow)
     status = Column(String, default="PENDING") # PENDING, RECEIVED, CANCELLED
     supplier_id = Column(Integer, ForeignKey("supplier.id"))
-    total_amount = Column(Float, default=0.0)
+    total_amount = Column(Money(), default=0)
     
     supplier = relationship("Supplier", back_populates="purchase_orders")
     items = relationship("PurchaseOrderItem", back_populates="order")
@@ -44,7 +45,7 @@ class PurchaseOrderItem(Base):
     purchase_order_id = Column(Integer, ForeignKey("purchaseorder.id"))
     product_id = Column(Integer, ForeignKey("inventory_products.id"))
     quantity = Column(Integer, nullable=False)
-    unit_price = Column(Float, nullable=False)
+    unit_price = Column(Money(), nullable=False)
     
     order = relationship("PurchaseOrder", back_populates="items")
     product = relationship("InventoryProduct", back_populates="order_items")
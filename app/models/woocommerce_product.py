@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean
+import json
+import zlib
+from typing import Any, Dict, Optional
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, Index, LargeBinary
+from sqlalchemy.dialects.mysql import MEDIUMBLOB
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.db.base import Base
 
 
 class WooCommerceProduct(Base):
     __tablename__ = "woocommerce_products"
+    __table_args__ = (
+        Index("ft_woocommerce_products_name", "name", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     woo_id = Column(Integer, unique=True, index=True, nullable=False)  # WooCommerce product ID
@@ -43,4 +51,12 @@ class WooCommerceProduct(Base):
     synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Additional data stored as JSON string if needed
-    raw_data = Column(Text)  # Store full JSON response for reference
+    raw_data = Column(Text)  # Store full JSON response for reference (legacy rows; new rows use raw_data_compressed)
+    raw_data_compressed = deferred(Column(LargeBinary().with_variant(MEDIUMBLOB(), "mysql")))  # zlib-compressed JSON, loaded only on access
+    content_hash = Column(String(64))  # sha256 of the canonical payload; unchanged products are not rewritten
+
+    def payload(self) -> Optional[Dict[str, Any]]:
+        """The full WooCommerce response this row was synced from"""
+        if self.raw_data_compressed is not None:
+            return json.loads(zlib.decompress(self.raw_data_compressed))
+        return json.loads(self.raw_data) if self.raw_data else None
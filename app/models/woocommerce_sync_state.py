@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from app.db.base import Base
+
+
+class WooCommerceSyncState(Base):
+    __tablename__ = "woocommerce_sync_state"
+    __table_args__ = (
+        UniqueConstraint("settings_id", "target", name="uq_woocommerce_sync_state_target"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    settings_id = Column(Integer, ForeignKey("woocommerce_settings.id"), nullable=False)
+    target = Column(String(50), nullable=False)  # local_products, inventory
+
+    # Highest date_modified_gmt stored by a successful run; the next run asks for newer products
+    modified_after = Column(DateTime)
+    last_run_at = Column(DateTime)
+    last_reconciled_at = Column(DateTime)
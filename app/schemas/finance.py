@@ -1,7 +1,8 @@
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
+from app.core.money import ZERO, Amount
 
 class AccountType(str, Enum):
     ASSET = "ASSET"
@@ -27,7 +28,7 @@ class AccountUpdate(AccountBase):
 
 class Account(AccountBase):
     id: int
-    balance: float
+    balance: Amount
 
     class Config:
         from_attributes = True
@@ -35,8 +36,8 @@ class Account(AccountBase):
 # Journal Entry Schemas
 class JournalEntryLineBase(BaseModel):
     account_id: int
-    debit: float = 0.0
-    credit: float = 0.0
+    debit: Amount = ZERO
+    credit: Amount = ZERO
     description: Optional[str] = None
 
 class JournalEntryLineCreate(JournalEntryLineBase):
@@ -65,13 +66,28 @@ class JournalEntry(JournalEntryBase):
     class Config:
         from_attributes = True
 
+class JournalEntryBatchCreate(BaseModel):
+    entries: List[JournalEntryCreate] = Field(..., min_length=1, max_length=5000)
+    partial: bool = False  # Store the valid entries and report the rest instead of rejecting the whole batch
+
+class JournalEntryBatchResult(BaseModel):
+    index: int  # Position of the entry in the request
+    status: str  # created or rejected
+    journal_entry_id: Optional[int] = None
+    error: Optional[str] = None
+
+class JournalEntryBatchResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[JournalEntryBatchResult]
+
 # AP Invoice Schemas
 class APInvoiceBase(BaseModel):
     invoice_number: str
     supplier_id: int
     date: datetime
     due_date: Optional[datetime] = None
-    total_amount: float
+    total_amount: Amount
     status: Optional[str] = "DRAFT"
 
 class APInvoiceCreate(APInvoiceBase):
@@ -89,7 +105,7 @@ class ARInvoiceBase(BaseModel):
     customer_id: int
     date: datetime
     due_date: Optional[datetime] = None
-    total_amount: float
+    total_amount: Amount
     status: Optional[str] = "DRAFT"
 
 class ARInvoiceCreate(ARInvoiceBase):
@@ -107,7 +123,7 @@ class BankStatementBase(BaseModel):
     date: datetime
     reference: Optional[str] = None
     description: Optional[str] = None
-    amount: float
+    amount: Amount
     reconciled: bool = False
 
 class BankStatementCreate(BankStatementBase):
@@ -115,6 +131,7 @@ class BankStatementCreate(BankStatementBase):
 
 class BankStatement(BankStatementBase):
     id: int
+    matched_journal_line_id: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,32 @@
+from typing import Any, Optional
+from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+class Job(BaseModel):
+    id: int
+    type: str
+    params: Optional[Any] = None
+    status: JobStatus
+    progress: int = 0
+    progress_message: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    run_after: Optional[datetime] = None
+    cancel_requested: bool = False
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
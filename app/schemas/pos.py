@@ -1,7 +1,8 @@
 from typing import List, Optional
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field
+from datetime import datetime, date
 from enum import Enum
+from app.core.money import ZERO, Amount
 
 class SessionStatus(str, Enum):
     OPEN = "OPEN"
@@ -14,7 +15,7 @@ class PaymentMethod(str, Enum):
 
 # Payment Schemas
 class PaymentBase(BaseModel):
-    amount: float
+    amount: Amount
     method: PaymentMethod
 
 class PaymentCreate(PaymentBase):
@@ -30,15 +31,15 @@ class Payment(PaymentBase):
 # Order Item Schemas
 class POSOrderItemBase(BaseModel):
     product_id: int
-    quantity: int
-    unit_price: float
+    quantity: int = Field(..., gt=0)
+    unit_price: Amount
 
 class POSOrderItemCreate(POSOrderItemBase):
     pass
 
 class POSOrderItem(POSOrderItemBase):
     id: int
-    subtotal: float
+    subtotal: Amount
 
     class Config:
         from_attributes = True
@@ -46,14 +47,18 @@ class POSOrderItem(POSOrderItemBase):
 # Order Schemas
 class POSOrderBase(BaseModel):
     customer_id: Optional[int] = None
-    total_amount: float
+    total_amount: Amount
     status: str = "COMPLETED"
+    idempotency_key: Optional[str] = Field(None, max_length=64)
 
 class POSOrderCreate(POSOrderBase):
     session_id: int
     items: List[POSOrderItemCreate]
     payments: List[PaymentCreate]
 
+class POSOrderBatchCreate(BaseModel):
+    orders: List[POSOrderCreate] = Field(..., min_length=1, max_length=500)
+
 class POSOrder(POSOrderBase):
     id: int
     created_at: datetime
@@ -63,15 +68,71 @@ class POSOrder(POSOrderBase):
     class Config:
         from_attributes = True
 
+class StockLevel(BaseModel):
+    product_id: int
+    stock: int
+
+class POSOrderReceipt(POSOrder):
+    stock_levels: List[StockLevel] = []
+
+# Offline Sync Schemas
+class POSSyncOrder(POSOrderCreate):
+    idempotency_key: str = Field(..., min_length=1, max_length=64)
+
+class POSSyncRequest(BaseModel):
+    cursor: Optional[str] = None  # Returned by the previous sync; omit for a full catalog pull
+    page: Optional[str] = None  # next_page of the previous response while a pull is being paged
+    orders: List[POSSyncOrder] = Field([], max_length=500)
+
+class POSSyncOrderResult(BaseModel):
+    idempotency_key: str
+    status: str  # created, duplicate or rejected
+    order_id: Optional[int] = None
+    error: Optional[str] = None
+
+class POSSyncProduct(BaseModel):
+    id: int
+    name: str
+    category: Optional[str] = None
+    price: float
+    stock: Optional[int] = None
+    barcode: Optional[str] = None
+    image: Optional[str] = None
+    status: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class POSSyncCoupon(BaseModel):
+    id: int
+    code: str
+    type: str
+    value: float
+    min_purchase: Optional[float] = None
+    expiry_date: Optional[date] = None
+    is_active: Optional[bool] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class POSSyncResponse(BaseModel):
+    cursor: str  # Send as the next sync's cursor once next_page is empty
+    next_page: Optional[str] = None  # Set while the catalog pull has more pages
+    orders: List[POSSyncOrderResult] = []
+    products: List[POSSyncProduct] = []
+    coupons: List[POSSyncCoupon] = []
+
 # Session Schemas
 class POSSessionBase(BaseModel):
-    opening_cash: float = 0.0
+    opening_cash: Amount = ZERO
 
 class POSSessionCreate(POSSessionBase):
     pass
 
 class POSSessionUpdate(BaseModel):
-    closing_cash: float
+    closing_cash: Amount
     status: SessionStatus = SessionStatus.CLOSED
     end_time: datetime = datetime.utcnow()
 
@@ -81,7 +142,7 @@ class POSSession(POSSessionBase):
     start_time: datetime
     end_time: Optional[datetime] = None
     status: SessionStatus
-    closing_cash: Optional[float] = None
+    closing_cash: Optional[Amount] = None
 
     class Config:
         from_attributes = True
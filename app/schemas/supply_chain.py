@@ -1,6 +1,7 @@
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
+from app.core.money import Amount
 
 # Supplier Schemas
 class SupplierBase(BaseModel):
@@ -42,7 +43,7 @@ class Product(ProductBase):
 class PurchaseOrderItemBase(BaseModel):
     product_id: int
     quantity: int
-    unit_price: float
+    unit_price: Amount
 
 class PurchaseOrderItemCreate(PurchaseOrderItemBase):
     pass
@@ -64,7 +65,7 @@ class PurchaseOrderCreate(PurchaseOrderBase):
 class PurchaseOrder(PurchaseOrderBase):
     id: int
     date: datetime
-    total_amount: float
+    total_amount: Amount
     items: List[PurchaseOrderItem]
 
     class Config:
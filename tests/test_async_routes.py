@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.user import User
+from app.models.crm import Customer
+from app.models.product import Product
+from app.models.coupon import Coupon
+from app.models.pos import POSSession, POSOrder, POSOrderItem, Payment
+from app.api import deps
+from app.api.v1 import pos, products
+from app.db import session as db_session
+from app.crud import crud_product
+
+def test_ported_routers_run_on_the_async_session(tmp_path):
+    # A file database: the async engine opens its connections on the TestClient's event loop
+    url = f"sqlite:///{tmp_path / 'erp.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine, tables=[
+        User.__table__, Customer.__table__, Product.__table__, Coupon.__table__,
+        POSSession.__table__, POSOrder.__table__, POSOrderItem.__table__, Payment.__table__,
+    ])
+    db = sessionmaker(bind=sync_engine)()
+    cashier = User(username="async-till", email="async-till@erp.com", hashed_password="x", is_active=True)
+    db.add(cashier)
+    db.commit()
+    db.refresh(cashier)
+    db.expunge(cashier)
+    db.close()
+
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    original = db_session.AsyncSessionLocal
+    # get_async_db itself is not overridden, only the sessionmaker it opens sessions from
+    db_session.AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    app = FastAPI()
+    app.include_router(products.router)
+    app.include_router(pos.router, prefix="/pos")
+    app.dependency_overrides[deps.get_current_active_user] = lambda: cashier
+    crud_product.clear()
+    try:
+        with TestClient(app) as client:
+            created = client.post("/products", json={"name": "Oolong", "price": 4.5, "stock": 5, "barcode": "ASYNC-1"})
+            assert created.status_code == 200
+            product_id = created.json()["id"]
+            listing = client.get("/products", params={"search": "oolong", "include_total": "false"}).json()
+            assert [p["id"] for p in listing["products"]] == [product_id]
+
+            session_id = client.post("/pos/sessions", json={"opening_cash": 20}).json()["id"]
+            order = {
+                "session_id": session_id, "total_amount": 9.0,
+                "items": [{"product_id": product_id, "quantity": 2, "unit_price": 4.5}],
+                "payments": [{"amount": 9.0, "method": "CASH"}],
+            }
+            receipt = client.post("/pos/orders", json=order, headers={"Idempotency-Key": "async-1"})
+            assert receipt.status_code == 200
+            assert receipt.json()["items"][0]["subtotal"] == "9.00"
+            assert receipt.json()["stock_levels"] == [{"product_id": product_id, "stock": 3}]
+            assert client.post("/pos/orders", json=order, headers={"Idempotency-Key": "async-1"}).json()["id"] == receipt.json()["id"]
+
+            oversell = dict(order, items=[dict(order["items"][0], quantity=4)])
+            assert client.post("/pos/orders", json=oversell).status_code == 409
+            assert client.get(f"/products/{product_id}").json()["stock"] == 3
+    finally:
+        db_session.AsyncSessionLocal = original
+        crud_product.clear()
+    sync_engine.dispose()
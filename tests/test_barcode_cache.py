@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.db.base import Base
+from app.crud import crud_product
+from app.models.product import Product
+
+def test_barcode_cache_hits_and_invalidation_by_id():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Product.__table__])
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        crud_product.clear()
+
+        async with Session() as db:
+            product = Product(name="Soap", price=1.0, stock=5, barcode="555")
+            db.add(product)
+            await db.commit()
+
+            assert (await crud_product.get_by_barcode(db, "555"))["stock"] == 5
+            hits = crud_product.barcode_cache.hits
+            found = await crud_product.get_by_barcodes(db, ["555", "missing"])
+            assert list(found) == ["555"]
+            assert crud_product.barcode_cache.hits == hits + 1
+
+            product.stock = 4
+            await db.commit()
+            crud_product.invalidate_products([product.id])
+            assert (await crud_product.get_by_barcode(db, "555"))["stock"] == 4
+        await engine.dispose()
+
+    asyncio.run(run())
+
+def test_barcode_id_index_follows_cache_eviction():
+    crud_product.clear()
+    maxsize = crud_product.barcode_cache.maxsize
+    try:
+        crud_product.barcode_cache.maxsize = 2
+        for product_id in range(1, 6):
+            crud_product._remember({"id": product_id, "barcode": f"B{product_id}"})
+        assert crud_product._barcodes_by_id == {4: "B4", 5: "B5"}
+
+        crud_product.invalidate_barcodes(["B4"])
+        assert crud_product._barcodes_by_id == {5: "B5"}
+    finally:
+        crud_product.barcode_cache.maxsize = maxsize
+        crud_product.clear()
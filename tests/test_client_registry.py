@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.woocommerce_settings import WooCommerceSettings
+from app.schemas.woocommerce_settings import WooCommerceSettingsCreate, WooCommerceSettingsUpdate
+from app.crud import crud_woocommerce_settings
+from app.integrations import client_registry
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(bind=engine, tables=[WooCommerceSettings.__table__])
+
+def test_woocommerce_client_is_reused_until_invalidated():
+    db = TestingSessionLocal()
+    client_registry.invalidate()
+    assert client_registry.woocommerce_client(db) is None
+
+    client_registry.invalidate("woocommerce")
+    store = crud_woocommerce_settings.create_settings(db, WooCommerceSettingsCreate(
+        store_url="https://shop.test", consumer_key="ck_1", consumer_secret="cs_1"
+    ))
+    client = client_registry.woocommerce_client(db)
+    assert client.consumer_key == "ck_1"
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert client_registry.woocommerce_client(db) is client
+    assert statements == []
+
+    crud_woocommerce_settings.update_settings(db, store.id, WooCommerceSettingsUpdate(consumer_key="ck_2"))
+    client_registry.invalidate("woocommerce")
+    rotated = client_registry.woocommerce_client(db)
+    assert rotated is not client and rotated.consumer_key == "ck_2"
+    db.close()
+
+def test_env_configured_clients_are_singletons():
+    client_registry.invalidate()
+    assert client_registry.daraz_client() is client_registry.daraz_client()
+    assert client_registry.facebook_client() is client_registry.facebook_client()
+    assert client_registry.whatsapp_client() is not client_registry.facebook_client()
@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from app.api import deps
+from app.api.v1 import metrics
+from app.db.pool import InstrumentedQueuePool, PoolStats
+
+def test_instrumented_pool_counts_checkouts_overflow_and_timeouts():
+    stats = InstrumentedQueuePool.stats
+    InstrumentedQueuePool.stats = PoolStats()
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.05)
+    engine_before = metrics.engine
+    try:
+        first = engine.connect()
+        second = engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        app = FastAPI()
+        app.include_router(metrics.router, prefix="/metrics")
+        app.dependency_overrides[deps.get_current_active_superuser] = lambda: None
+        metrics.engine = engine
+        payload = TestClient(app).get("/metrics/db").json()
+        sync = payload["pools"]["sync"]
+        assert payload["pid"] == os.getpid()
+        assert sync["class"] == "InstrumentedQueuePool"
+        assert (sync["size"], sync["checked_out"], sync["overflow"], sync["max_overflow"]) == (1, 2, 1, 1)
+        assert (sync["checkouts"], sync["timeouts"]) == (2, 1)
+        assert sync["max_wait_ms"] >= 50
+
+        first.close()
+        second.close()
+        with engine.connect():
+            pass
+        sync = metrics.worker_pool_report(engine, metrics.async_engine)["pools"]["sync"]
+        assert (sync["checked_out"], sync["checked_in"], sync["checkouts"]) == (0, 1, 3)
+    finally:
+        metrics.engine = engine_before
+        InstrumentedQueuePool.stats = stats
+        engine.dispose()
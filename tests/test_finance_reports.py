@@ -0,0 +1,84 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.finance import Account, AccountPeriodBalance, JournalEntry, JournalEntryLine, AccountType
+from app.schemas.finance import AccountCreate, JournalEntryCreate, JournalEntryLineCreate
+from app.crud import crud_finance, finance_reports
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(bind=engine, tables=[
+    Account.__table__, JournalEntry.__table__, JournalEntryLine.__table__, AccountPeriodBalance.__table__,
+])
+
+_accounts = {}
+
+def _setup(db):
+    """Post the sample ledger once; both tests read the same books"""
+    if _accounts:
+        return _accounts
+    accounts = _accounts
+    for code, name, account_type in [
+        ("1000", "Cash", AccountType.ASSET), ("2000", "Payables", AccountType.LIABILITY),
+        ("3000", "Capital", AccountType.EQUITY), ("4000", "Sales", AccountType.REVENUE), ("5000", "Rent", AccountType.EXPENSE),
+    ]:
+        accounts[name] = crud_finance.create_account(db, AccountCreate(code=code, name=name, type=account_type))
+
+    def post(when, debit, credit, amount):
+        crud_finance.create_journal_entry(db, JournalEntryCreate(date=when, description="x", status="POSTED", lines=[
+            JournalEntryLineCreate(account_id=accounts[debit].id, debit=amount),
+            JournalEntryLineCreate(account_id=accounts[credit].id, credit=amount),
+        ]))
+
+    post(datetime(2025, 12, 31, 9), "Cash", "Capital", 1000.0)
+    post(datetime(2026, 1, 15), "Cash", "Sales", 300.0)
+    post(datetime(2026, 2, 1), "Rent", "Cash", 100.0)
+    post(datetime(2026, 2, 20), "Cash", "Sales", 200.0)
+    post(datetime(2026, 4, 10), "Rent", "Payables", 50.0)
+    return accounts
+
+def test_reports_use_rollups_for_whole_months_and_lines_for_edges():
+    db = TestingSessionLocal()
+    accounts = _setup(db)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    year = finance_reports.income_statement(db, date(2026, 1, 1), date(2026, 12, 31), bucket="quarter")
+    event.remove(engine, "before_cursor_execute", listener)
+    assert not any("journal_entry_lines" in statement for statement in statements)
+    assert [(p["period"], p["revenue"]["total"], p["expenses"]["total"]) for p in year["periods"]] == [
+        ("2026-Q1", 500.0, 100.0), ("2026-Q2", 0.0, 50.0), ("2026-Q3", 0.0, 0.0), ("2026-Q4", 0.0, 0.0),
+    ]
+    assert year["net_income"] == 350.0
+
+    # A range cutting through months mixes rollups with line aggregation
+    partial = finance_reports.income_statement(db, date(2026, 1, 16), date(2026, 2, 28))
+    assert partial["periods"][0]["revenue"]["total"] == 200.0 and partial["net_income"] == 100.0
+
+    tb = finance_reports.trial_balance(db, date(2026, 1, 1), date(2026, 2, 28))
+    cash = next(row for row in tb["accounts"] if row["account_id"] == accounts["Cash"].id)
+    assert (cash["opening_balance"], cash["debit"], cash["credit"], cash["closing_balance"]) == (1000.0, 500.0, 100.0, 1400.0)
+    assert tb["total_debit"] == tb["total_credit"] == 600.0
+    db.close()
+
+def test_balance_sheet_balances_with_current_earnings():
+    db = TestingSessionLocal()
+    _setup(db)
+    sheet = finance_reports.balance_sheet(db, as_of=date(2026, 4, 30))
+    assert sheet["balanced"]
+    assert sheet["assets"]["total"] == 1400.0
+    assert sheet["liabilities"]["total"] == 50.0
+    assert sheet["equity"]["current_earnings"] == 350.0 and sheet["equity"]["total"] == 1350.0
+
+    series = finance_reports.balance_sheet(db, as_of=date(2026, 3, 15), start=date(2026, 1, 1), bucket="month")
+    assert [(p["period"], p["as_of"], p["assets"]["total"]) for p in series["periods"]] == [
+        ("2026-01", date(2026, 1, 31), 1300.0), ("2026-02", date(2026, 2, 28), 1400.0), ("2026-03", date(2026, 3, 15), 1400.0),
+    ]
+    db.close()
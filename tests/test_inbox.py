@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+
+from app.integrations.inbox import fetch_inbox
+
+def _page(*times):
+    return lambda: {"data": [{"id": t, "updated_time": t} for t in times]}
+
+def _slow(seconds, page):
+    def source():
+        time.sleep(seconds)
+        return page()
+    return source
+
+def test_inbox_merges_sources_newest_first():
+    inbox = asyncio.run(fetch_inbox({
+        "facebook": _page("2026-01-05", "2026-01-03", "2026-01-01"),
+        "instagram": _page("2026-01-04", "2026-01-02"),
+    }, limit=4, timeout=1))
+    assert [c["id"] for c in inbox["data"]] == ["2026-01-05", "2026-01-04", "2026-01-03", "2026-01-02"]
+    assert [c["platform"] for c in inbox["data"]] == ["facebook", "instagram", "facebook", "instagram"]
+    assert inbox["platforms"] == {"facebook": "ok", "instagram": "ok"}
+
+def test_inbox_runs_sources_concurrently_and_returns_partial_results():
+    def failing():
+        raise RuntimeError("token expired")
+
+    async def run():
+        started = time.monotonic()
+        inbox = await fetch_inbox({
+            "facebook": _slow(0.2, _page("2026-01-02")),
+            "instagram": _slow(0.2, _page("2026-01-01")),
+            "slow": _slow(1, _page("2026-01-03")),
+            "broken": failing,
+        }, limit=10, timeout=0.5)
+        return inbox, time.monotonic() - started
+
+    inbox, elapsed = asyncio.run(run())
+    assert elapsed < 0.9
+    assert [c["id"] for c in inbox["data"]] == ["2026-01-02", "2026-01-01"]
+    assert inbox["platforms"]["slow"] == "timeout"
+    assert inbox["platforms"]["broken"] == "error: token expired"
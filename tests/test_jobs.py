@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.user import User
+from app.models.job import Job, JobStatus
+from app.crud import crud_job
+from app.jobs.registry import register
+from app.jobs.runner import Heartbeat, run_job
+
+# Setup in-memory SQLite db for testing
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine, tables=[User.__table__, Job.__table__])
+
+calls = []
+
+@register("test.flaky")
+def flaky(ctx):
+    calls.append(ctx.job.attempts)
+    ctx.progress(len(calls), "working")
+    if len(calls) == 1:
+        raise ConnectionError("store unreachable")
+    return {"attempts": ctx.job.attempts}
+
+@register("test.cancellable")
+def cancellable(ctx):
+    ctx.job.cancel_requested = True
+    ctx.db.commit()
+    ctx.progress(1)
+    return {"finished": True}
+
+def test_job_retries_then_succeeds():
+    db = TestingSessionLocal()
+    job = crud_job.create_job(db, "test.flaky", params={"full": True})
+    assert crud_job.enqueue_once(db, "test.flaky").id == job.id
+
+    claimed = crud_job.claim_next(db, "runner-a")
+    assert claimed.id == job.id and claimed.status == JobStatus.RUNNING
+    assert crud_job.claim_next(db, "runner-b") is None
+
+    run_job(db, claimed)
+    assert job.status == JobStatus.QUEUED and "store unreachable" in job.error
+    assert crud_job.claim_next(db, "runner-a") is None  # backing off
+
+    job.run_after = job.created_at
+    db.commit()
+    run_job(db, crud_job.claim_next(db, "runner-a"))
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result == {"attempts": 2} and job.progress == 2
+    db.close()
+
+def test_running_job_stops_at_progress_after_cancel():
+    db = TestingSessionLocal()
+    job = crud_job.create_job(db, "test.cancellable")
+    run_job(db, crud_job.claim_next(db, "runner-a"))
+    assert job.status == JobStatus.CANCELLED and job.result is None
+
+    retried = crud_job.retry_job(db, job)
+    assert retried.status == JobStatus.QUEUED and retried.attempts == 0
+    assert crud_job.request_cancel(db, retried).status == JobStatus.CANCELLED
+    db.close()
+
+def test_heartbeat_keeps_a_long_job_from_being_requeued():
+    # StaticPool: the heartbeat thread writes through its own session and must see the same in-memory database
+    shared = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=shared, tables=[User.__table__, Job.__table__])
+    db = sessionmaker(autocommit=False, autoflush=False, bind=shared)()
+    crud_job.create_job(db, "test.long")
+    job = crud_job.claim_next(db, "runner-a")
+    job.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+
+    with Heartbeat(db, job.id, interval=0.05):
+        time.sleep(0.3)
+    assert crud_job.requeue_stale(db, timedelta(minutes=1)) == 0
+    db.refresh(job)
+    assert job.status == JobStatus.RUNNING
+    db.close()
+
+def test_stale_job_out_of_attempts_is_failed_not_requeued():
+    isolated = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=isolated, tables=[User.__table__, Job.__table__])
+    db = sessionmaker(autocommit=False, autoflush=False, bind=isolated)()
+    created = crud_job.create_job(db, "test.crashing", max_attempts=2, active_key=crud_job.active_key("test.crashing", {}))
+
+    def crash():
+        job = crud_job.claim_next(db, "runner-a")
+        job.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+        db.commit()
+        return crud_job.requeue_stale(db, timedelta(minutes=1))
+
+    assert crash() == 1
+    assert crash() == 0
+    job = crud_job.get_job(db, created.id)
+    assert (job.status, job.attempts, job.active_key) == (JobStatus.FAILED, 2, None)
+    assert crud_job.claim_next(db, "runner-a") is None
+    db.close()
+
+def test_enqueue_once_matches_params_and_survives_a_race():
+    db = TestingSessionLocal()
+    incremental = crud_job.enqueue_once(db, "test.sync", params={"full": False})
+    full = crud_job.enqueue_once(db, "test.sync", params={"full": True})
+    assert full.id != incremental.id and full.params == {"full": True}
+    assert crud_job.enqueue_once(db, "test.sync", params={"full": True}).id == full.id
+
+    # A request that checked before the other committed hits the unique key and gets the winner's job
+    original, lookups = crud_job.get_active_job, []
+    def stale_first_lookup(db, type, params=None):
+        lookups.append(params)
+        return None if len(lookups) == 1 else original(db, type, params)
+    crud_job.get_active_job = stale_first_lookup
+    try:
+        assert crud_job.enqueue_once(db, "test.sync", params={"full": True}).id == full.id
+        assert len(lookups) == 2
+    finally:
+        crud_job.get_active_job = original
+    assert db.query(Job).filter(Job.type == "test.sync").count() == 2
+
+    crud_job.mark_succeeded(db, full)
+    assert crud_job.enqueue_once(db, "test.sync", params={"full": True}).id not in (full.id, incremental.id)
+    db.close()
@@ -0,0 +1,134 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.finance import Account, AccountPeriodBalance, JournalEntry, JournalEntryLine, AccountType
+from app.schemas.finance import AccountCreate, JournalEntryCreate, JournalEntryLineCreate
+from app.crud import crud_finance, finance_reports, ledger
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(bind=engine, tables=[
+    Account.__table__, JournalEntry.__table__, JournalEntryLine.__table__, AccountPeriodBalance.__table__,
+])
+
+def _accounts(db, prefix):
+    cash = crud_finance.create_account(db, AccountCreate(code=f"{prefix}-1000", name="Cash", type=AccountType.ASSET))
+    sales = crud_finance.create_account(db, AccountCreate(code=f"{prefix}-4000", name="Sales", type=AccountType.REVENUE))
+    return cash, sales
+
+def _entry(cash, sales, amount, when, status="POSTED"):
+    return JournalEntryCreate(date=when, description="Sale", status=status, lines=[
+        JournalEntryLineCreate(account_id=cash.id, debit=amount),
+        JournalEntryLineCreate(account_id=cash.id, debit=amount / 2),
+        JournalEntryLineCreate(account_id=sales.id, credit=amount * 1.5),
+    ])
+
+def test_posting_aggregates_per_account_and_maintains_snapshots():
+    db = TestingSessionLocal()
+    cash, sales = _accounts(db, "A")
+
+    updates = []
+    listener = lambda conn, cursor, statement, *args: updates.append(statement) if statement.startswith("UPDATE account ") else None
+    event.listen(engine, "before_cursor_execute", listener)
+    crud_finance.create_journal_entry(db, _entry(cash, sales, 100.0, datetime(2026, 1, 10)))
+    event.remove(engine, "before_cursor_execute", listener)
+    # Two lines hit cash, but each account is updated once
+    assert len(updates) == 2
+
+    crud_finance.create_journal_entry(db, _entry(cash, sales, 20.0, datetime(2026, 3, 5)))
+    db.refresh(cash)
+    assert cash.balance == 180.0
+
+    # Back-dated posting flows into the later snapshot
+    draft = crud_finance.create_journal_entry(db, _entry(cash, sales, 10.0, datetime(2026, 2, 1), status="DRAFT"))
+    assert ledger.account_balance(db, cash.id) == 180.0
+    crud_finance.post_journal_entry(db, draft)
+    try:
+        crud_finance.post_journal_entry(db, draft)
+        assert False, "posting twice should be rejected"
+    except ledger.LedgerError:
+        pass
+
+    snapshots = db.query(AccountPeriodBalance).filter(AccountPeriodBalance.account_id == cash.id).order_by(AccountPeriodBalance.period).all()
+    assert [(s.period, s.debit, s.closing_balance) for s in snapshots] == [
+        (date(2026, 1, 1), 150.0, 150.0), (date(2026, 2, 1), 15.0, 165.0), (date(2026, 3, 1), 30.0, 195.0),
+    ]
+    assert ledger.account_balance(db, cash.id, as_of=datetime(2025, 12, 31)) == 0.0
+    assert ledger.account_balance(db, cash.id, as_of=datetime(2026, 2, 28)) == 165.0
+    assert ledger.account_balance(db, cash.id, as_of=datetime(2026, 3, 4)) == 165.0
+    assert ledger.account_balance(db, cash.id, as_of=date(2026, 3, 5)) == 195.0
+    assert ledger.account_balance(db, sales.id) == -195.0
+
+    report = finance_reports.trial_balance(db, start=date(2026, 2, 1), end=date(2026, 2, 28))
+    rows = {row["account_id"]: row for row in report["accounts"]}
+    assert (rows[cash.id]["opening_balance"], rows[cash.id]["debit"], rows[cash.id]["closing_balance"]) == (150.0, 15.0, 165.0)
+    assert rows[sales.id]["closing_balance"] == -165.0
+    db.close()
+
+def test_rebuild_matches_incremental_maintenance():
+    db = TestingSessionLocal()
+    cash, sales = _accounts(db, "B")
+    crud_finance.create_journal_entry(db, _entry(cash, sales, 40.0, datetime(2026, 5, 3)))
+    crud_finance.create_journal_entry(db, _entry(cash, sales, 8.0, datetime(2026, 4, 30)))
+
+    def state():
+        db.expire_all()
+        rows = db.query(AccountPeriodBalance).filter(AccountPeriodBalance.account_id.in_([cash.id, sales.id]))
+        return sorted((s.account_id, s.period, s.debit, s.credit, s.closing_balance) for s in rows), db.get(Account, cash.id).balance
+
+    incremental = state()
+    ledger.rebuild(db)
+    assert state() == incremental
+
+    try:
+        crud_finance.create_journal_entry(db, JournalEntryCreate(
+            date=datetime(2026, 5, 4), description="Bad", status="POSTED",
+            lines=[JournalEntryLineCreate(account_id=999999, debit=1.0)],
+        ))
+        assert False, "unknown accounts should be rejected"
+    except ledger.LedgerError:
+        pass
+    assert state() == incremental
+    db.close()
+
+def test_batch_validates_every_entry_and_optionally_keeps_the_good_ones():
+    db = TestingSessionLocal()
+    cash, sales = _accounts(db, "C")
+    good = _entry(cash, sales, 30.0, datetime(2026, 6, 1))
+    unbalanced = JournalEntryCreate(date=datetime(2026, 6, 2), description="Off", status="POSTED", lines=[
+        JournalEntryLineCreate(account_id=cash.id, debit=10.01),
+        JournalEntryLineCreate(account_id=sales.id, credit=10.0),
+    ])
+    unknown = JournalEntryCreate(date=datetime(2026, 6, 2), description="Bad", status="DRAFT", lines=[
+        JournalEntryLineCreate(account_id=cash.id, debit=1.0),
+        JournalEntryLineCreate(account_id=999999, credit=1.0),
+    ])
+
+    try:
+        crud_finance.create_journal_entries(db, [good, unbalanced, unknown])
+        assert False, "an invalid entry should reject the batch"
+    except crud_finance.JournalBatchError as e:
+        assert sorted(e.errors) == [1, 2]
+        assert "10.01" in e.errors[1] and "999999" in e.errors[2]
+    assert ledger.account_balance(db, cash.id) == 0
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    results = crud_finance.create_journal_entries(db, [good, unbalanced, good, unknown], partial=True)
+    event.remove(engine, "before_cursor_execute", listener)
+    assert [r["status"] for r in results] == ["created", "rejected", "created", "rejected"]
+    # All referenced accounts are resolved at once and the lines go in as one executemany
+    assert sum(s.startswith("SELECT account.id") for s in statements) == 2  # validation plus the ledger lock
+    assert sum(s.startswith("INSERT INTO journal_entry_lines") for s in statements) == 1
+
+    db.refresh(cash)
+    assert cash.balance == 90
+    assert ledger.unbalanced_entries(db) == []
+    db.close()
@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.db.base import Base
+from app.crud import listing_totals
+from app.models.product import Product
+
+def test_cached_total_until_invalidated():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Product.__table__])
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        listing_totals.total_cache.clear()
+
+        async with Session() as db:
+            db.add(Product(name="Tea", price=1.0, stock=1))
+            await db.commit()
+
+            query = select(Product)
+            assert await listing_totals.get_total(db, query, table="products", filters={"search": None}) == (1, False)
+
+            db.add(Product(name="Rice", price=1.0, stock=1))
+            await db.commit()
+            # Served from the cache until a write invalidates it
+            assert await listing_totals.get_total(db, query, table="products", filters={}) == (1, False)
+            listing_totals.invalidate("products")
+            # No planner statistics on SQLite, so an estimate falls back to the exact count
+            assert await listing_totals.get_total(db, query, table="products", filters={}, estimate=True) == (2, False)
+        await engine.dispose()
+
+    asyncio.run(run())
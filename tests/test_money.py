@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.finance import Account, AccountPeriodBalance, JournalEntry, JournalEntryLine, AccountType
+from app.schemas.finance import Account as AccountSchema, AccountCreate, JournalEntryCreate, JournalEntryLineCreate
+from app.core.money import from_minor, money, to_minor
+from app.crud import crud_finance, ledger
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(bind=engine, tables=[
+    Account.__table__, JournalEntry.__table__, JournalEntryLine.__table__, AccountPeriodBalance.__table__,
+])
+
+def test_money_helpers_round_half_up_to_cents():
+    assert money(0.1) == Decimal("0.10")
+    assert money("2.675") == Decimal("2.68") and to_minor(2.675) == 268
+    assert to_minor(None) == 0 and to_minor(3) == 300
+    assert from_minor(-12345) == Decimal("-123.45")
+
+def test_schemas_carry_exact_amounts():
+    line = JournalEntryLineCreate(account_id=1, debit=0.1, credit="2.675")
+    assert (line.debit, line.credit) == (Decimal("0.10"), Decimal("2.68"))
+    assert JournalEntryLineCreate(account_id=1).debit == Decimal("0.00")
+    account = AccountSchema(id=1, code="1000", name="Cash", type=AccountType.ASSET, balance=Decimal("1.00"))
+    assert account.model_dump(mode="json")["balance"] == "1.00"
+
+def test_ledger_sums_are_exact():
+    db = TestingSessionLocal()
+    cash = crud_finance.create_account(db, AccountCreate(code="1000", name="Cash", type=AccountType.ASSET))
+    sales = crud_finance.create_account(db, AccountCreate(code="4000", name="Sales", type=AccountType.REVENUE))
+
+    # Ten float dimes sum to 0.9999999999999999; as Numeric they are exactly 1.00
+    for _ in range(10):
+        crud_finance.create_journal_entry(db, JournalEntryCreate(date=datetime(2026, 1, 5), description="Dime", status="POSTED", lines=[
+            JournalEntryLineCreate(account_id=cash.id, debit=0.1),
+            JournalEntryLineCreate(account_id=sales.id, credit=0.1),
+        ]))
+    db.refresh(cash)
+    assert isinstance(cash.balance, Decimal) and cash.balance == Decimal("1.00")
+    assert ledger.account_balance(db, sales.id, as_of=datetime(2026, 1, 31)) == Decimal("-1.00")
+    assert ledger.unbalanced_entries(db) == []
+
+    crud_finance.create_journal_entry(db, JournalEntryCreate(date=datetime(2026, 1, 6), description="Typo", status="POSTED", lines=[
+        JournalEntryLineCreate(account_id=cash.id, debit=10.01),
+        JournalEntryLineCreate(account_id=sales.id, credit=10.0),
+    ]))
+    unbalanced = ledger.unbalanced_entries(db)
+    assert [(row["debit"], row["credit"]) for row in unbalanced] == [(Decimal("10.01"), Decimal("10.00"))]
+    db.close()
@@ -0,0 +1,180 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.user import User
+from app.models.crm import Customer
+from app.models.product import Product
+from app.models.coupon import Coupon
+from app.models.pos import POSSession, POSOrder, POSOrderItem, Payment
+from app.schemas.pos import POSSessionCreate, POSOrderCreate, POSOrderItemCreate, PaymentCreate, POSSyncOrder
+from app.crud import crud_pos, pagination
+
+# Setup in-memory SQLite db for testing
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine, tables=[
+    User.__table__, Customer.__table__, Product.__table__, Coupon.__table__,
+    POSSession.__table__, POSOrder.__table__, POSOrderItem.__table__, Payment.__table__,
+])
+
+def _setup(db, barcode="TEA-1", stock=10):
+    user = db.query(User).filter(User.username == "till").first()
+    if not user:
+        user = User(username="till", email="till@erp.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+    session = crud_pos.get_active_session(db, user_id=user.id)
+    if not session:
+        session = crud_pos.create_session(db, POSSessionCreate(opening_cash=50.0), user_id=user.id)
+    product = Product(name=barcode, price=2.0, stock=stock, barcode=barcode)
+    db.add(product)
+    db.commit()
+    return session, product
+
+def _order(session_id, product_id, quantity=1):
+    return POSOrderCreate(
+        session_id=session_id,
+        total_amount=2.0 * quantity,
+        items=[POSOrderItemCreate(product_id=product_id, quantity=quantity, unit_price=2.0)],
+        payments=[PaymentCreate(amount=2.0 * quantity, method="CASH")],
+    )
+
+def test_create_order_single_transaction():
+    db = TestingSessionLocal()
+    session, product = _setup(db)
+
+    order = crud_pos.create_order(db, _order(session.id, product.id, quantity=3))
+    assert order.id is not None
+    assert len(order.items) == 1 and order.items[0].subtotal == 6.0
+    assert len(order.payments) == 1 and order.payments[0].amount == 6.0
+
+    batch = crud_pos.create_orders(db, [_order(session.id, product.id), _order(session.id, product.id, quantity=2)])
+    assert [len(o.items) for o in batch] == [1, 1]
+    assert db.query(POSOrderItem).count() == 3
+    db.close()
+
+def test_create_order_decrements_stock_and_rejects_oversell():
+    db = TestingSessionLocal()
+    session, product = _setup(db, barcode="COFFEE-1", stock=5)
+
+    order = crud_pos.create_order(db, _order(session.id, product.id, quantity=4))
+    assert order.stock_levels == [{"product_id": product.id, "stock": 1}]
+
+    orders_before = db.query(POSOrder).count()
+    try:
+        crud_pos.create_order(db, _order(session.id, product.id, quantity=2))
+        assert False, "oversell should be rejected"
+    except crud_pos.InsufficientStockError as e:
+        assert e.product_ids == [product.id]
+
+    db.refresh(product)
+    assert product.stock == 1
+    assert db.query(POSOrder).count() == orders_before
+    db.close()
+
+def test_oversell_reports_only_the_short_products():
+    db = TestingSessionLocal()
+    session, plenty = _setup(db, barcode="SUGAR-1", stock=5)
+    _, scarce = _setup(db, barcode="HONEY-1", stock=1)
+
+    order = _order(session.id, plenty.id, quantity=3)
+    order.items.append(POSOrderItemCreate(product_id=scarce.id, quantity=2, unit_price=2.0))
+    try:
+        crud_pos.create_order(db, order)
+        assert False, "oversell should be rejected"
+    except crud_pos.InsufficientStockError as e:
+        assert e.product_ids == [scarce.id]
+
+    try:
+        POSOrderItemCreate(product_id=plenty.id, quantity=-1, unit_price=2.0)
+        assert False, "negative quantities would restock the product"
+    except ValidationError:
+        pass
+    db.close()
+
+def test_batch_repeating_an_idempotency_key_creates_the_order_once():
+    db = TestingSessionLocal()
+    session, product = _setup(db, barcode="SODA-1", stock=10)
+
+    def keyed(key, quantity=1):
+        return _order(session.id, product.id, quantity).model_copy(update={"idempotency_key": key})
+
+    batch = crud_pos.create_orders(db, [keyed("b1-1", 2), keyed("b1-2"), keyed("b1-1", 2)])
+    assert batch[0].id == batch[2].id != batch[1].id
+    assert db.query(POSOrder).filter(POSOrder.idempotency_key == "b1-1").count() == 1
+    db.refresh(product)
+    assert product.stock == 7
+
+    resent = crud_pos.create_orders(db, [keyed("b1-1", 2), keyed("b1-1", 2)])
+    assert [o.id for o in resent] == [batch[0].id, batch[0].id]
+    db.close()
+
+def test_sync_orders_is_idempotent_and_reports_per_order():
+    db = TestingSessionLocal()
+    session, product = _setup(db, barcode="JUICE-1", stock=3)
+
+    def queued(key, quantity):
+        return POSSyncOrder(idempotency_key=key, **_order(session.id, product.id, quantity).model_dump(exclude={"idempotency_key"}))
+
+    results = crud_pos.sync_orders(db, [queued("t1-1", 2), queued("t1-2", 5), queued("t1-1", 2)])
+    assert [r["status"] for r in results] == ["created", "rejected", "duplicate"]
+    assert results[0]["order_id"] == results[2]["order_id"]
+
+    retried = crud_pos.sync_orders(db, [queued("t1-1", 2)])
+    assert retried[0]["status"] == "duplicate"
+    db.refresh(product)
+    assert product.stock == 1
+
+    changes = crud_pos.get_catalog_changes(db)
+    assert product.id in [p.id for p in changes["products"]]
+    assert crud_pos.decode_sync_cursor(changes["cursor"]) is not None
+    db.close()
+
+def test_catalog_pull_is_paged_until_next_page_is_empty():
+    db = TestingSessionLocal()
+    db.add_all([Coupon(code=f"PAGE{i}", type="fixed", value=1.0) for i in range(3)])
+    db.commit()
+    for i in range(4):
+        _setup(db, barcode=f"PAGE-{i}")
+
+    pulled, cursors, page = {"products": [], "coupons": []}, set(), None
+    for _ in range(10):
+        changes = crud_pos.get_catalog_changes(db, page=crud_pos.decode_catalog_page(page), limit=2)
+        for key in pulled:
+            assert len(changes[key]) <= 2
+            pulled[key] += [row.id for row in changes[key]]
+        cursors.add(changes["cursor"])
+        page = changes["next_page"]
+        if page is None:
+            break
+    assert pulled["products"] == [p.id for p in db.query(Product).order_by(Product.id)]
+    assert pulled["coupons"] == [c.id for c in db.query(Coupon).order_by(Coupon.id)]
+    # Every page reports the clock of the first, so nothing changed mid-pull is skipped next time
+    assert len(cursors) == 1
+
+    try:
+        crud_pos.decode_catalog_page("bm90LWEtcGFnZQ")
+        assert False, "tampered page tokens should be rejected"
+    except ValueError:
+        pass
+    db.close()
+
+def test_get_orders_keyset_pagination():
+    db = TestingSessionLocal()
+    session, product = _setup(db, barcode="WATER-1", stock=20)
+    crud_pos.create_orders(db, [_order(session.id, product.id) for _ in range(3)])
+
+    all_ids = [o.id for o in crud_pos.get_orders(db, limit=1000)]
+    first = crud_pos.get_orders(db, limit=2)
+    cursor = pagination.next_cursor(first, 2)
+    rest = crud_pos.get_orders(db, limit=1000, after_id=pagination.decode_cursor(cursor))
+    assert [o.id for o in first + rest] == all_ids
+    assert pagination.next_cursor(rest, 1000) is None
+    db.close()
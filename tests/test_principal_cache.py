@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.cache import TTLCache
+from app.crud import crud_user
+from app.models.user import User
+
+# Setup in-memory SQLite db for testing
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+User.__table__.create(bind=engine, checkfirst=True)
+
+def test_ttl_cache_eviction_and_expiry():
+    cache = TTLCache(maxsize=2, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used entry
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+def test_principal_cache_hit_and_invalidation():
+    db = TestingSessionLocal()
+    crud_user.principal_cache.clear()
+
+    user = User(username="cashier", email="cashier@erp.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+
+    first = crud_user.get_principal(db, username="cashier")
+    assert first.id == user.id
+    hits = crud_user.principal_cache.hits
+
+    cached = crud_user.get_principal(db, username="cashier")
+    assert crud_user.principal_cache.hits == hits + 1
+    assert cached.id == user.id and cached.is_active
+
+    crud_user.update(db, db_obj=user, obj_in={"is_active": False})
+    refreshed = crud_user.get_principal(db, username="cashier")
+    assert refreshed.is_active is False
+
+    crud_user.delete(db, user_id=user.id)
+    assert crud_user.get_principal(db, username="cashier") is None
+    db.close()
@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.crud import search
+from app.models.product import Product
+
+# Setup in-memory SQLite db for testing
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine, tables=[Product.__table__])
+
+def test_boolean_prefix_query():
+    assert search.boolean_prefix_query(search.tokenize("Green  TEA+")) == "+green* +tea*"
+
+def test_search_ranks_exact_barcode_then_name_prefix():
+    db = TestingSessionLocal()
+    db.add_all([
+        Product(name="Iced tea", price=1.0, barcode="900"),
+        Product(name="Tea bags", price=1.0, barcode="901"),
+        Product(name="Coffee", price=1.0, barcode="tea"),
+    ])
+    db.commit()
+
+    query, ranking = search.text_search(select(Product.name), "sqlite", "tea", [Product.name], Product.barcode, Product.id)
+    names = db.scalars(query.order_by(*ranking)).all()
+    assert names == ["Coffee", "Tea bags", "Iced tea"]
+    db.close()
+
+def test_mysql_search_runs_code_and_fulltext_lookups_separately():
+    query, ranking = search.text_search(select(Product), "mysql", "green tea", [Product.name], Product.barcode, Product.id)
+    sql = str(query.order_by(*ranking).compile(dialect=mysql.dialect()))
+    # One indexed SELECT per lookup: no OR for the optimizer to turn into a scan
+    assert " OR " not in sql and sql.count("UNION") == 1
+    assert "products.barcode LIKE" in sql and "MATCH (products.name) AGAINST" in sql
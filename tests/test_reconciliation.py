@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.finance import Account, AccountPeriodBalance, BankStatement, JournalEntry, JournalEntryLine, AccountType
+from app.schemas.finance import AccountCreate, BankStatementCreate, JournalEntryCreate, JournalEntryLineCreate
+from app.crud import crud_finance, reconciliation
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(bind=engine, tables=[
+    Account.__table__, JournalEntry.__table__, JournalEntryLine.__table__, AccountPeriodBalance.__table__, BankStatement.__table__,
+])
+
+def test_reconcile_prefers_reference_then_pairs_by_amount_within_window():
+    db = TestingSessionLocal()
+    bank = crud_finance.create_account(db, AccountCreate(code="1100", name="Bank", type=AccountType.ASSET))
+    sales = crud_finance.create_account(db, AccountCreate(code="4000", name="Sales", type=AccountType.REVENUE))
+
+    def post(when, amount, reference=None, status="POSTED"):
+        debit, credit = (amount, 0.0) if amount > 0 else (0.0, -amount)
+        entry = crud_finance.create_journal_entry(db, JournalEntryCreate(
+            date=when, description="x", reference=reference, status=status, lines=[
+                JournalEntryLineCreate(account_id=bank.id, debit=debit, credit=credit),
+                JournalEntryLineCreate(account_id=sales.id, debit=credit, credit=debit),
+            ]))
+        return next(line.id for line in entry.lines if line.account_id == bank.id)
+
+    def statement(when, amount, reference=None):
+        return crud_finance.create_bank_statement(db, BankStatementCreate(
+            bank_account_id=bank.id, date=when, amount=amount, reference=reference,
+        )).id
+
+    closer = post(datetime(2026, 3, 10), 250.0)
+    invoice = post(datetime(2026, 3, 8), 250.0, reference="INV-7")
+    fee = post(datetime(2026, 3, 12), -12.5)
+    post(datetime(2026, 3, 20), 99.0, status="DRAFT")
+    late = post(datetime(2026, 4, 1), 40.0)
+
+    by_reference = statement(datetime(2026, 3, 10), 250.0, reference="inv 7")
+    by_amount = statement(datetime(2026, 3, 11), 250.0)
+    withdrawal = statement(datetime(2026, 3, 13), -12.5)
+    draft_only = statement(datetime(2026, 3, 20), 99.0)
+    too_early = statement(datetime(2026, 3, 20), 40.0)
+
+    preview = reconciliation.reconcile(db, window_days=3, dry_run=True)
+    assert preview["matched"] == 3 and not db.query(BankStatement).filter(BankStatement.reconciled.is_(True)).count()
+
+    report = reconciliation.reconcile(db, window_days=3)
+    assert (report["statements"], report["exact"], report["fuzzy"], report["unmatched"]) == (5, 1, 2, 2)
+    assert {m["statement_id"]: (m["journal_line_id"], m["method"]) for m in report["matches"]} == {
+        by_reference: (invoice, "exact"), by_amount: (closer, "fuzzy"), withdrawal: (fee, "fuzzy"),
+    }
+    assert report["unmatched_statement_ids"] == [draft_only, too_early]
+    assert next(m for m in report["matches"] if m["statement_id"] == withdrawal)["amount"] == Decimal("-12.50")
+    assert db.get(BankStatement, by_amount).matched_journal_line_id == closer
+
+    # Matched lines are not offered again; a wider window picks up the late deposit
+    again = reconciliation.reconcile(db, window_days=15)
+    assert again["statements"] == 2
+    assert [(m["statement_id"], m["journal_line_id"]) for m in again["matches"]] == [(too_early, late)]
+    db.close()
@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+from app.integrations.response_cache import ResponseCache
+
+class Loader:
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+def test_fresh_entries_are_served_without_loading():
+    cache = ResponseCache()
+    loader = Loader({"tree": 1})
+    assert cache.fetch("tree", 60, loader) == {"tree": 1}
+    assert cache.fetch("tree", 60, loader) == {"tree": 1}
+    assert loader.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_stale_entries_are_served_while_refreshing_in_background():
+    cache = ResponseCache(stale_seconds=3600)
+    assert cache.fetch("brands", 0, Loader(["old"])) == ["old"]
+
+    loader = Loader(["new"])
+    assert cache.fetch("brands", 0, loader) == ["old"]
+    assert _wait_for(lambda: cache._memory["brands"][0] == ["new"])
+    assert loader.calls == 1 and cache.stale_hits == 1
+
+def test_failed_reload_serves_old_copy_and_errors_are_not_cached():
+    cache = ResponseCache()
+    cache.fetch("providers", 0, Loader(["dhl"]))
+    assert cache.fetch("providers", 0, Loader(RuntimeError("down"))) == ["dhl"]
+    assert cache.refresh_errors == 1
+
+    error = {"code": "IllegalAccessToken"}
+    ok = lambda value: value.get("code", "0") == "0"
+    loader = Loader(error, {"code": "0", "data": []})
+    assert cache.fetch("attributes", 60, loader, ok) == error
+    assert cache.fetch("attributes", 60, loader, ok) == {"code": "0", "data": []}
+    assert loader.calls == 2
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    ResponseCache(directory=str(tmp_path)).fetch(("tree", "store"), 60, Loader({"id": 7}))
+
+    restarted = ResponseCache(directory=str(tmp_path))
+    loader = Loader({"id": 8})
+    assert restarted.fetch(("tree", "store"), 60, loader) == {"id": 7}
+    assert loader.calls == 0
+
+    restarted.clear()
+    assert restarted.fetch(("tree", "store"), 60, loader) == {"id": 8}
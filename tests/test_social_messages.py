@@ -0,0 +1,116 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.social_message import SocialConversation, SocialMessage
+from app.crud import crud_social_message
+from app.integrations import message_ingest
+
+# StaticPool: the ingest queue writes from worker threads and must see the same in-memory database
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(bind=engine, tables=[SocialConversation.__table__, SocialMessage.__table__])
+
+def _whatsapp(message_id, sender, text, timestamp):
+    return {"object": "whatsapp_business_account", "entry": [{"changes": [{"field": "messages", "value": {
+        "contacts": [{"wa_id": sender, "profile": {"name": "Asha"}}],
+        "messages": [{"from": sender, "id": message_id, "timestamp": str(timestamp), "type": "text", "text": {"body": text}}],
+    }}]}]}
+
+def _messenger(mid, sender, text, timestamp, echo=False):
+    message = {"mid": mid, "text": text, **({"is_echo": True} if echo else {})}
+    sender_id, recipient_id = ("PAGE", sender) if echo else (sender, "PAGE")
+    return {"object": "page", "entry": [{"messaging": [
+        {"sender": {"id": sender_id}, "recipient": {"id": recipient_id}, "timestamp": timestamp * 1000, "message": message},
+        {"sender": {"id": sender}, "recipient": {"id": "PAGE"}, "timestamp": timestamp * 1000, "read": {"watermark": 1}},
+    ]}]}
+
+def test_webhook_messages_are_stored_once_and_read_newest_first():
+    db = TestingSessionLocal()
+    messages = (
+        message_ingest.parse_whatsapp(_whatsapp("wamid.1", "94770000001", "Is the tea in stock?", 1_760_000_000))
+        + message_ingest.parse_messenger(_messenger("m_1", "PSID1", "Hello", 1_760_000_100))
+        + message_ingest.parse_messenger(_messenger("m_2", "PSID1", "Hi, how can we help?", 1_760_000_200, echo=True))
+    )
+    assert [m["platform"] for m in messages] == ["whatsapp", "facebook", "facebook"]
+
+    assert crud_social_message.store_messages(db, messages) == 3
+    # Meta redelivers webhooks it did not see acknowledged
+    assert crud_social_message.store_messages(db, messages[:2]) == 0
+
+    conversations = crud_social_message.get_conversations(db)
+    assert [(c.platform, c.external_id) for c in conversations] == [("facebook", "PSID1"), ("whatsapp", "94770000001")]
+    assert conversations[0].message_count == 2 and conversations[0].last_message_text == "Hi, how can we help?"
+    assert conversations[1].participant_name == "Asha"
+    assert [c.platform for c in crud_social_message.get_conversations(db, platform="whatsapp")] == ["whatsapp"]
+
+    thread = crud_social_message.get_messages(db, conversation_id=conversations[0].id)
+    assert [(m.external_id, m.direction) for m in thread] == [("m_2", "out"), ("m_1", "in")]
+    db.close()
+
+def test_ingest_queue_batches_writes_and_drains_on_stop():
+    batches = []
+
+    def store_now(messages):
+        batches.append(len(messages))
+        db = TestingSessionLocal()
+        try:
+            return crud_social_message.store_messages(db, messages)
+        finally:
+            db.close()
+
+    async def run():
+        queue = message_ingest.MessageIngestQueue(batch_size=2, flush_interval=60, max_pending=10)
+        assert not queue.submit([{}])
+        await queue.start()
+        for n in range(5):
+            assert queue.submit(message_ingest.parse_whatsapp(_whatsapp(f"wamid.q{n}", "94770000002", f"#{n}", 1_760_001_000 + n)))
+        assert not queue.submit([{}] * 10)
+        await queue.stop()
+        return queue
+
+    original = message_ingest.store_now
+    message_ingest.store_now = store_now
+    try:
+        queue = asyncio.run(run())
+    finally:
+        message_ingest.store_now = original
+    assert queue.stored == 5 and len(queue) == 0
+    assert max(batches) == 2 and sum(batches) == 5
+
+def test_ingest_queue_drops_a_poison_message_without_blocking_the_rest():
+    stored, outage = [], [True]
+
+    def store_now(messages):
+        if outage[0]:
+            outage[0] = False
+            raise OperationalError("INSERT", {}, Exception("server has gone away"))
+        if any(m["text"] == "poison" for m in messages):
+            raise ValueError("text rejected by the column")
+        stored.extend(m["external_id"] for m in messages)
+        return len(messages)
+
+    async def run():
+        queue = message_ingest.MessageIngestQueue(batch_size=10, flush_interval=0.01, max_pending=10, max_attempts=2)
+        await queue.start()
+        assert queue.submit([{"platform": "whatsapp", "external_id": f"wamid.p{n}", "text": "poison" if n == 0 else "ok"} for n in range(4)])
+        await asyncio.sleep(0.2)
+        await queue.stop()
+        return queue
+
+    original = message_ingest.store_now
+    message_ingest.store_now = store_now
+    try:
+        queue = asyncio.run(run())
+    finally:
+        message_ingest.store_now = original
+    # The outage is retried whole; the bad message is retried once on its own, then dropped
+    assert stored == ["wamid.p1", "wamid.p2", "wamid.p3"]
+    assert queue.stored == 3 and queue.dropped == 1 and len(queue) == 0
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+import requests
+
+from app.integrations.transport import CircuitOpenError, TokenBucket, Transport, endpoint_label
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+def _transport(outcomes, **kwargs):
+    transport = Transport("test", rate=1000, burst=1000, max_retries=3, **kwargs)
+    transport.session = FakeSession(outcomes)
+    transport.sleeps = []
+    def sleep(seconds):
+        transport.sleeps.append(seconds)
+        time.sleep(seconds)
+    transport.sleep = sleep
+    return transport
+
+def test_retry_after_is_honoured_on_429():
+    transport = _transport([FakeResponse(429, {"Retry-After": "0.2"}), FakeResponse(200)])
+    started = time.monotonic()
+    assert transport.request("POST", "https://shop.test/orders").status_code == 200
+    assert time.monotonic() - started >= 0.2
+    assert len(transport.session.calls) == 2
+    assert transport.throttled == 1 and transport.retries == 1
+
+def test_5xx_retried_only_for_idempotent_methods():
+    transport = _transport([FakeResponse(503), FakeResponse(200)])
+    assert transport.request("GET", "https://shop.test/products/12").status_code == 200
+    assert endpoint_label("products/12/variations/7") == "products/{id}/variations/{id}"
+
+    transport = _transport([FakeResponse(503)])
+    assert transport.request("POST", "https://shop.test/orders").status_code == 503
+    assert len(transport.session.calls) == 1
+
+def test_circuit_opens_after_consecutive_failures():
+    transport = _transport([requests.exceptions.ConnectionError()] * 4, failure_threshold=3, reset_timeout=60)
+    try:
+        transport.request("GET", "https://shop.test/products")
+        assert False, "the breaker should have opened"
+    except CircuitOpenError as e:
+        assert e.platform == "test"
+    assert len(transport.session.calls) == 3
+    assert transport.stats()["circuit"] == "open"
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate=10, burst=2)
+    waits = []
+    assert bucket.acquire(waits.append) == 0 and bucket.acquire(waits.append) == 0
+    bucket.acquire(waits.append)
+    assert waits and 0 < waits[0] <= 0.1
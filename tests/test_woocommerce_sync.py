@@ -0,0 +1,178 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.integrations import woocommerce_sync
+from app.integrations.woocommerce_client import WooCommerceClient
+from app.models.product import Product
+from app.models.woocommerce_product import WooCommerceProduct
+from app.models.woocommerce_settings import WooCommerceSettings
+from app.models.woocommerce_sync_state import WooCommerceSyncState
+
+# Setup in-memory SQLite db for testing
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine, tables=[
+    Product.__table__, WooCommerceProduct.__table__, WooCommerceSettings.__table__, WooCommerceSyncState.__table__,
+])
+
+class PagedResponse:
+    def __init__(self, items, total_pages):
+        self.items = items
+        self.headers = {"X-WP-TotalPages": str(total_pages)}
+
+    def json(self):
+        return self.items
+
+class PagedCatalog(WooCommerceClient):
+    """Client whose HTTP layer serves ``products`` as WooCommerce would."""
+
+    def __init__(self, products):
+        super().__init__(url="https://shop.test", consumer_key="ck", consumer_secret="cs")
+        self.products = products
+
+    def _send(self, endpoint, method="GET", params=None, data=None):
+        page, per_page = params["page"], params["per_page"]
+        products = self.products
+        if "modified_after" in params:
+            products = [p for p in products if p.get("date_modified_gmt", "") > params["modified_after"]]
+        if params.get("_fields") == "id":
+            products = [{"id": p["id"]} for p in products]
+        total_pages = -(-len(products) // per_page)
+        return PagedResponse(products[(page - 1) * per_page:page * per_page], total_pages)
+
+def _woo(woo_id, name, sku="", price="1.50", modified="2026-01-01T00:00:00"):
+    return {
+        "id": woo_id, "name": name, "sku": sku, "price": price, "stock_quantity": 3, "stock_status": "instock",
+        "slug": name.lower(), "permalink": "", "type": "simple", "status": "publish", "date_modified_gmt": modified,
+    }
+
+def test_sync_streams_pages_with_bulk_statements():
+    db = TestingSessionLocal()
+    db.add_all([
+        Product(name="Old name", price=1.0, barcode="SKU-1"),
+        Product(name="Kettle", price=9.0, barcode="LOCAL-7"),
+    ])
+    db.commit()
+
+    catalog = PagedCatalog([
+        _woo(1, "Teapot", sku="SKU-1"),
+        _woo(2, "Kettle"),
+        _woo(3, ""),
+        _woo(4, "Mug", sku="SKU-4", price="bad"),
+        _woo(5, "Cup", sku="SKU-5"),
+    ])
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    counts = woocommerce_sync.sync_products(db, catalog, per_page=2)
+    event.remove(engine, "before_cursor_execute", record)
+
+    assert counts == {"total_woocommerce_products": 5, "pages": 3, "synced": 1, "updated": 2, "skipped": 1, "failed": 1, "watermark": datetime(2026, 1, 1)}
+    # One matching SELECT per page with syncable rows, never one per product
+    assert sum(s.lstrip().startswith("SELECT") for s in statements) == 2
+    products = {p.name: p for p in db.query(Product).all()}
+    assert products["Teapot"].barcode == "SKU-1"
+    assert products["Kettle"].barcode == "LOCAL-7" and products["Kettle"].price == 1.5
+    assert products["Cup"].stock == 3
+    db.close()
+
+def test_iter_all_products_keeps_page_order():
+    catalog = PagedCatalog([_woo(i, f"P{i}") for i in range(1, 24)])
+    catalog.max_concurrency = 3
+    assert [p["id"] for p in catalog.iter_all_products(per_page=5)] == list(range(1, 24))
+
+def test_incremental_sync_uses_watermark_and_prunes_deleted():
+    db = TestingSessionLocal()
+    store = WooCommerceSettings(store_url="https://shop.test", consumer_key="ck", consumer_secret="cs")
+    db.add(store)
+    db.commit()
+    catalog = PagedCatalog([_woo(1, "A", modified="2026-01-01T00:00:00"), _woo(2, "B", modified="2026-01-02T00:00:00")])
+
+    first = woocommerce_sync.run_incremental_sync(db, catalog, settings_id=store.id, target=woocommerce_sync.LOCAL_PRODUCTS)
+    assert (first["synced"], first["incremental"], first["deleted"]) == (2, False, 0)
+
+    catalog.products = [_woo(2, "B2", modified="2026-01-03T00:00:00")]
+    second = woocommerce_sync.run_incremental_sync(db, catalog, settings_id=store.id, target=woocommerce_sync.LOCAL_PRODUCTS)
+    assert (second["total_woocommerce_products"], second["updated"], second["incremental"]) == (1, 1, True)
+    assert "deleted" not in second  # reconciled on the first run, not due yet
+
+    full = woocommerce_sync.run_incremental_sync(db, catalog, settings_id=store.id, target=woocommerce_sync.LOCAL_PRODUCTS, full=True)
+    assert full["deleted"] == 1
+    assert [p.name for p in db.query(WooCommerceProduct).all()] == ["B2"]
+    db.close()
+
+def test_product_edited_mid_run_is_picked_up_next_run():
+    db = TestingSessionLocal()
+    store = WooCommerceSettings(store_url="https://edits.test", consumer_key="ck", consumer_secret="cs")
+    db.add(store)
+    db.commit()
+    stamp = lambda seconds: (datetime.utcnow() + timedelta(seconds=seconds)).isoformat(timespec="seconds")
+
+    class EditedDuringRun(PagedCatalog):
+        edited = False
+
+        def _send(self, endpoint, method="GET", params=None, data=None):
+            if params["page"] == 2 and not self.edited:
+                # Page 1 is already fetched; both products change before page 2 is
+                self.edited = True
+                self.products[0] = _woo(401, "Vase v2", modified=stamp(1))
+                self.products[1] = _woo(402, "Bowl v2", modified=stamp(2))
+            return super()._send(endpoint, method, params, data)
+
+    catalog = EditedDuringRun([_woo(401, "Vase", modified=stamp(-3600)), _woo(402, "Bowl", modified=stamp(-3600))])
+    first = woocommerce_sync.run_incremental_sync(db, catalog, settings_id=store.id, target=woocommerce_sync.LOCAL_PRODUCTS, per_page=1)
+    assert first["modified_after"] < datetime.utcnow()
+
+    second = woocommerce_sync.run_incremental_sync(db, catalog, settings_id=store.id, target=woocommerce_sync.LOCAL_PRODUCTS, per_page=1)
+    assert (second["incremental"], second["updated"]) == (True, 1)
+    names = db.scalars(select(WooCommerceProduct.name).where(WooCommerceProduct.woo_id.in_([401, 402])).order_by(WooCommerceProduct.woo_id)).all()
+    assert names == ["Vase v2", "Bowl v2"]
+    db.close()
+
+def test_local_page_upsert_skips_unchanged_products():
+    db = TestingSessionLocal()
+    page = [_woo(101, "Lamp", modified="2026-02-01T00:00:00"), _woo(102, "Desk", modified="2026-02-01T00:00:00")]
+    assert woocommerce_sync.sync_local_product_page(db, page) == {"synced": 2, "updated": 0, "unchanged": 0}
+
+    page[1] = dict(page[1], price="20.00")
+    assert woocommerce_sync.sync_local_product_page(db, page) == {"synced": 0, "updated": 1, "unchanged": 1}
+
+    desk = db.query(WooCommerceProduct).filter(WooCommerceProduct.woo_id == 102).one()
+    assert desk.price == 20.0 and desk.raw_data is None
+    assert desk.payload()["price"] == "20.00"
+    db.close()
+
+def test_local_page_falls_back_to_update_and_insert_without_native_upsert():
+    db = TestingSessionLocal()
+    page = [_woo(201, "Chair", modified="2026-02-01T00:00:00")]
+    woocommerce_sync.sync_local_product_page(db, page)
+
+    original = woocommerce_sync._upsert
+    woocommerce_sync._upsert = lambda dialect, rows: None
+    try:
+        page = [dict(page[0], price="9.00"), _woo(202, "Stool", modified="2026-02-01T00:00:00")]
+        assert woocommerce_sync.sync_local_product_page(db, page) == {"synced": 1, "updated": 1, "unchanged": 0}
+    finally:
+        woocommerce_sync._upsert = original
+    rows = db.query(WooCommerceProduct).filter(WooCommerceProduct.woo_id.in_([201, 202])).order_by(WooCommerceProduct.woo_id).all()
+    assert [(p.name, p.price) for p in rows] == [("Chair", 9.0), ("Stool", 1.5)]
+    db.close()
+
+def test_reconcile_reports_every_page_of_ids():
+    db = TestingSessionLocal()
+    catalog = PagedCatalog([_woo(301, "Mat"), _woo(302, "Rug"), _woo(303, "Bin")])
+    pages = []
+    woocommerce_sync.reconcile_local_products(db, catalog, per_page=2, on_page=pages.append)
+    assert pages == [2]
+    woocommerce_sync.reconcile_local_products(db, catalog, per_page=1, on_page=pages.append)
+    assert pages == [2, 1, 2, 3]
+    db.close()